@@ -0,0 +1,232 @@
+"""
+Live auction events for the `/ws` WebSocket clients.
+
+The simulation runs in its own thread and hands events to `LiveEventSink`,
+which only appends to a buffer; the fan-out to the clients happens on the
+event loop. Every message is encoded once (compact JSON arrays, see
+`MESSAGE_FIELDS`) and the same string is queued for every client.
+
+Each client has a bounded queue of settlement / auction messages. A client
+that can't keep up loses its oldest queued messages and is told how many
+with a "d" message; ticker updates (last price per resource) are coalesced,
+so a slow client only gets the latest price of each resource. Nothing a
+client does can block the simulation.
+
+The feed runs inside one API process: start the API with a single worker
+when `LIVE_AUCTIONS` is enabled.
+"""
+import asyncio
+import json
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from auction.auction_events import AuctionCompleted, AuctionRejected, AuctionStarted, Settlement
+
+from app import metrics
+from app.config import Config
+
+
+# Message type -> fields of the array following the type code
+MESSAGE_FIELDS = {
+    "s": ["auction_id", "timestamp", "cluster", "batch", "resource", "seller", "winner",
+          "quantity", "price", "total_cost"],                            # settlement
+    "t": ["resource", "price", "quantity", "timestamp"],                  # ticker (coalesced)
+    "a": ["auction_id", "resource", "seller", "quantity", "quantity_sold"],  # auction completed
+    "d": ["dropped"],                                                     # messages lost by this client
+}
+
+HELLO = json.dumps(["h", MESSAGE_FIELDS], separators=(",", ":"))
+
+CLIENTS = metrics.registry.register(metrics.Gauge(
+    "websocket_clients", "Connected /ws clients."))
+DROPPED = metrics.registry.register(metrics.Counter(
+    "websocket_messages_dropped_total", "Messages dropped for /ws clients that fell behind."))
+
+
+def _encode(message: Tuple) -> str:
+    return json.dumps(message, separators=(",", ":"))
+
+
+class ClientChannel:
+    """Outgoing messages of one client: a bounded queue plus coalesced tickers."""
+
+    def __init__(self, max_queue: int = 256):
+        self.queue: Deque[str] = deque(maxlen=max_queue)
+        self.tickers: Dict[str, str] = {}
+        self.dropped = 0
+        self._ready = asyncio.Event()
+
+    def push(self, message: str, coalesce_key: Optional[str] = None) -> None:
+        if coalesce_key is not None:
+            self.tickers[coalesce_key] = message
+        else:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+                DROPPED.inc()
+            self.queue.append(message)
+        self._ready.set()
+
+    async def next_messages(self) -> List[str]:
+        """Wait for messages and take everything queued so far."""
+        await self._ready.wait()
+        self._ready.clear()
+
+        messages = []
+        if self.dropped:
+            messages.append(_encode(("d", self.dropped)))
+            self.dropped = 0
+        messages.extend(self.queue)
+        self.queue.clear()
+        messages.extend(self.tickers.values())
+        self.tickers.clear()
+        return messages
+
+
+class Broadcaster:
+    """
+    Fans messages out to the connected clients.
+
+    `publish()` may be called from any thread. Messages are buffered and
+    flushed by one callback on the event loop, however many arrive in between.
+    """
+
+    def __init__(self, max_queue: int = 256):
+        self.max_queue = max_queue
+        self.clients: Set[ClientChannel] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Deque[Tuple[Tuple, Optional[str]]] = deque()
+        self._lock = threading.Lock()
+        self._flush_scheduled = False
+
+        CLIENTS.collect = lambda: {(): float(len(self.clients))}
+
+    def connect(self) -> ClientChannel:
+        """Register a client; must be called on the event loop."""
+        self._loop = asyncio.get_running_loop()
+        channel = ClientChannel(self.max_queue)
+        self.clients.add(channel)
+        return channel
+
+    def disconnect(self, channel: ClientChannel) -> None:
+        self.clients.discard(channel)
+
+    def publish(self, message: Tuple, coalesce_key: Optional[str] = None) -> None:
+        """Queue `message` for every client; messages with the same `coalesce_key` replace each other."""
+        if not self.clients or self._loop is None:
+            return
+        with self._lock:
+            self._pending.append((message, coalesce_key))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._flush)
+        except RuntimeError:
+            # The loop is closed: the API is shutting down
+            with self._lock:
+                self._pending.clear()
+                self._flush_scheduled = False
+
+    def _flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, deque()
+            self._flush_scheduled = False
+
+        # Only the latest message of each coalesce key is encoded
+        latest: Dict[str, Tuple] = {}
+        encoded: List[Tuple[str, Optional[str]]] = []
+        for message, key in pending:
+            if key is None:
+                encoded.append((_encode(message), None))
+            else:
+                latest[key] = message
+        encoded.extend((_encode(message), key) for key, message in latest.items())
+
+        for channel in self.clients:
+            for message, key in encoded:
+                channel.push(message, key)
+
+
+class LiveEventSink:
+    """
+    Event sink (see `auction/auction_events.py`) publishing settlements,
+    tickers and completed auctions to a `Broadcaster`.
+    """
+
+    bid_events = False
+
+    def __init__(self, broadcaster: Broadcaster):
+        self.broadcaster = broadcaster
+        self._started: Dict[Optional[int], Tuple[str, str]] = {}
+
+    def __call__(self, event) -> None:
+        if isinstance(event, Settlement):
+            timestamp = round(event.timestamp.timestamp(), 3)
+            price = round(event.price_per_unit, 6)
+            self.broadcaster.publish((
+                "s", event.auction_id, timestamp, event.cluster_name, event.batch_num,
+                event.resource_name, event.seller_name, event.winner_name,
+                round(event.quantity, 6), price, round(event.total_cost, 6)
+            ))
+            self.broadcaster.publish(
+                ("t", event.resource_name, price, round(event.quantity, 6), timestamp),
+                coalesce_key=event.resource_name
+            )
+        elif isinstance(event, AuctionStarted):
+            self._started[event.auction_id] = (event.resource_name, event.seller_name)
+        elif isinstance(event, AuctionRejected):
+            self._started.pop(event.auction_id, None)
+        elif isinstance(event, AuctionCompleted):
+            resource_name, seller_name = self._started.pop(event.auction_id, ("", ""))
+            self.broadcaster.publish((
+                "a", event.auction_id, resource_name, seller_name,
+                round(event.total_quantity, 6), round(event.quantity_sold, 6)
+            ))
+
+
+class LiveAuctionFeed:
+    """The random live auction loop, running in a background thread and feeding a `Broadcaster`."""
+
+    def __init__(self, broadcaster: Broadcaster, rate: float = 1.0, seed: Optional[int] = None,
+                 log_file: str = "auction_simulation_log.csv"):
+        self.broadcaster = broadcaster
+        self.rate = rate
+        self.seed = seed
+        self.log_file = log_file
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        from app.simulation import get_world, world_lock
+        from auction.auction_manager import random_auction_loop_with_logging
+        from auction.scheduler import TickScheduler
+
+        self._thread = threading.Thread(
+            target=random_auction_loop_with_logging,
+            kwargs=dict(
+                log_file=self.log_file,
+                seed=self.seed,
+                scheduler=TickScheduler.paced(self.rate),
+                world=get_world(),
+                sink=LiveEventSink(self.broadcaster),
+                stop=self._stop,
+                world_lock=world_lock,
+            ),
+            name="live-auction-feed",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the loop after the current auction; it closes its log as on Ctrl+C."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+broadcaster = Broadcaster(Config.WS_CLIENT_QUEUE)
@@ -9,4 +9,15 @@ load_dotenv(dotenv_path=env_path)
 
 class Config:
     DATABASE_URL = os.getenv("DATABASE_URL")
-    SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
\ No newline at end of file
+    SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
+    # Random live auction loop streaming to /ws clients (single worker only)
+    LIVE_AUCTIONS = os.getenv("LIVE_AUCTIONS", "0") == "1"
+    LIVE_AUCTION_RATE = float(os.getenv("LIVE_AUCTION_RATE", "1.0"))
+    LIVE_AUCTION_SEED = int(os.environ["LIVE_AUCTION_SEED"]) if os.getenv("LIVE_AUCTION_SEED") else None
+    LIVE_AUCTION_LOG = os.getenv("LIVE_AUCTION_LOG", "auction_simulation_log.csv")
+    # World JSON file or CSV directory; the built-in dataset when unset
+    WORLD_FILE = os.getenv("WORLD_FILE") or None
+    WS_CLIENT_QUEUE = int(os.getenv("WS_CLIENT_QUEUE", "256"))
+    # Interactive bidding sessions held in memory
+    BIDDING_MAX_SESSIONS = int(os.getenv("BIDDING_MAX_SESSIONS", "10000"))
+    BIDDING_IDLE_TIMEOUT = float(os.getenv("BIDDING_IDLE_TIMEOUT", "900"))
\ No newline at end of file
@@ -4,12 +4,16 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.config import Config
 from app.models.database import Base
-from app.routes import groups, countries, resources, auctions
+from app.routes import groups, countries, resources, auctions, live, bidding
+from app import metrics
+from app.broadcast import LiveAuctionFeed, broadcaster
 
 engine = create_engine(Config.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base.metadata.create_all(bind=engine)
+metrics.register_pool(engine)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -26,11 +30,31 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.include_router(groups.router)
 app.include_router(countries.router)
 app.include_router(resources.router)
 app.include_router(auctions.router)
+app.include_router(metrics.router)
+app.include_router(live.router)
+app.include_router(bidding.router)
+
+live_feed = LiveAuctionFeed(
+    broadcaster,
+    rate=Config.LIVE_AUCTION_RATE,
+    seed=Config.LIVE_AUCTION_SEED,
+    log_file=Config.LIVE_AUCTION_LOG
+)
+
+@app.on_event("startup")
+def start_live_feed():
+    if Config.LIVE_AUCTIONS:
+        live_feed.start()
+
+@app.on_event("shutdown")
+def stop_live_feed():
+    live_feed.stop()
 
 @app.get("/")
 def root():
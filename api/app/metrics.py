@@ -0,0 +1,377 @@
+"""
+In-process Prometheus metrics for the API (text exposition format 0.0.4).
+
+- `MetricsMiddleware` records request counts, latency histograms per route
+  template and the number of in-flight requests.
+- `instrument_repository` times every public method of a repository class.
+- `register_pool(engine)` exposes the SQLAlchemy pool's checked-out /
+  overflow counts, read when the metrics are collected.
+
+Recording a sample is a dict lookup and a few additions under a lock, so it
+stays cheap under load. With several uvicorn workers set
+`METRICS_MULTIPROC_DIR` to a shared directory: every worker then writes a
+snapshot of its metrics there (at most once per `METRICS_SNAPSHOT_INTERVAL`
+seconds, and on exit) and `/metrics` merges the snapshots of all workers,
+whichever worker serves the scrape. Counters of exited workers are kept;
+their gauges are dropped. Empty the directory when the service restarts.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"values": [[list(k), v] for k, v in self.values.items()]}
+
+    @staticmethod
+    def merge(snapshots: List[Dict]) -> Dict[LabelValues, float]:
+        merged: Dict[LabelValues, float] = {}
+        for snapshot in snapshots:
+            for labels, value in snapshot["values"]:
+                key = tuple(labels)
+                merged[key] = merged.get(key, 0.0) + value
+        return merged
+
+    def render(self, snapshots: List[Dict]) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self.merge(snapshots).items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 collect: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+        self.collect = collect
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def dec(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        with self._lock:
+            self.values[labels] = value
+
+    def snapshot(self) -> Dict:
+        if self.collect is not None:
+            for labels, value in self.collect().items():
+                self.set(value, labels)
+        with self._lock:
+            return {"values": [[list(k), v] for k, v in self.values.items()]}
+
+    def render(self, snapshots: List[Dict]) -> List[str]:
+        # Gauges of live workers add up (in-flight requests, pool connections)
+        lines = self.header()
+        for labels, value in sorted(Counter.merge(snapshots).items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self.values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"values": [[list(k), list(counts), total] for k, (counts, total) in self.values.items()]}
+
+    def render(self, snapshots: List[Dict]) -> List[str]:
+        merged: Dict[LabelValues, list] = {}
+        for snapshot in snapshots:
+            for labels, counts, total in snapshot["values"]:
+                entry = merged.setdefault(tuple(labels), [[0] * len(counts), 0.0])
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+
+        lines = self.header()
+        for labels, (counts, total) in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics of this process, plus the snapshot files of sibling workers."""
+
+    def __init__(self, multiproc_dir: Optional[str] = None, snapshot_interval: float = 1.0):
+        self.metrics: Dict[str, _Metric] = {}
+        self.multiproc_dir = multiproc_dir
+        self.snapshot_interval = snapshot_interval
+        self._last_snapshot = 0.0
+        self._snapshot_lock = threading.Lock()
+        if multiproc_dir:
+            os.makedirs(multiproc_dir, exist_ok=True)
+            atexit.register(self.write_snapshot)
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.multiproc_dir, f"metrics_{pid}.json")
+
+    def write_snapshot(self) -> None:
+        """Atomically write this worker's metrics for the other workers to merge."""
+        if not self.multiproc_dir:
+            return
+        with self._snapshot_lock:
+            self._last_snapshot = time.monotonic()
+            path = self._snapshot_path(os.getpid())
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+
+    def maybe_write_snapshot(self) -> None:
+        """Cheap per-request hook: write a snapshot if the last one is old enough."""
+        if self.multiproc_dir and time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+            self.write_snapshot()
+
+    def _worker_snapshots(self) -> List[Tuple[Dict[str, Dict], bool]]:
+        """(snapshot, worker alive) of every worker, with this process' live metrics."""
+        snapshots = [(self.snapshot(), True)]
+        if not self.multiproc_dir:
+            return snapshots
+
+        self.write_snapshot()
+        own_pid = os.getpid()
+        for name in os.listdir(self.multiproc_dir):
+            if not (name.startswith("metrics_") and name.endswith(".json")):
+                continue
+            pid = int(name[len("metrics_"):-len(".json")])
+            if pid == own_pid:
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, name), encoding="utf-8") as f:
+                    snapshots.append((json.load(f), _pid_alive(pid)))
+            except (OSError, ValueError):
+                continue  # being replaced or removed right now
+        return snapshots
+
+    def render(self) -> str:
+        workers = self._worker_snapshots()
+        lines: List[str] = []
+        for name, metric in self.metrics.items():
+            snapshots = [
+                snapshot[name] for snapshot, alive in workers
+                if name in snapshot and (alive or metric.kind != "gauge")
+            ]
+            lines.extend(metric.render(snapshots))
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+registry = MetricsRegistry(
+    multiproc_dir=os.getenv("METRICS_MULTIPROC_DIR") or None,
+    snapshot_interval=float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "1.0"))
+)
+
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.",
+    ("method", "route", "status")))
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.",
+    ("method", "route"), LATENCY_BUCKETS))
+IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."))
+REPO_QUERIES = registry.register(Counter(
+    "repository_queries_total", "Repository method calls by repository, method and outcome.",
+    ("repository", "method", "outcome")))
+REPO_LATENCY = registry.register(Histogram(
+    "repository_query_duration_seconds", "Repository method duration.",
+    ("repository", "method"), QUERY_BUCKETS))
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no per-request task or body buffering) recording
+    latency, status and in-flight requests. Routes are labelled by their
+    template (e.g. `/auctions/{auction_id}`) to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "<unmatched>"
+            method = scope.get("method", "")
+            REQUESTS.inc((method, route_path, str(status["code"])))
+            REQUEST_LATENCY.observe(elapsed, (method, route_path))
+            registry.maybe_write_snapshot()
+
+
+def instrument_repository(cls):
+    """
+    Class decorator timing every public method of a repository.
+
+    Example:
+        @instrument_repository
+        class GroupRepository:
+            ...
+    """
+    repository = cls.__name__
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not callable(method):
+            continue
+        setattr(cls, name, _timed(repository, name, method))
+    return cls
+
+
+def _timed(repository: str, name: str, method):
+    labels = (repository, name)
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = method(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            REPO_LATENCY.observe(time.perf_counter() - start, labels)
+            REPO_QUERIES.inc(labels + (outcome,))
+    return wrapper
+
+
+def register_pool(engine) -> None:
+    """Expose the connection pool of `engine` (checked out / overflow / size / idle)."""
+    pool = engine.pool
+
+    def reading(method_name: str) -> Callable[[], Dict[LabelValues, float]]:
+        method = getattr(pool, method_name, None)
+        # Only QueuePool has the full set of counters as methods
+        return lambda: {(): float(method())} if callable(method) else {}
+
+    for metric_name, method_name, documentation in (
+        ("db_pool_checked_out", "checkedout", "Connections currently checked out of the pool."),
+        ("db_pool_overflow", "overflow", "Connections opened beyond the pool size (negative while the pool fills)."),
+        ("db_pool_size", "size", "Configured pool size."),
+        ("db_pool_checked_in", "checkedin", "Idle connections in the pool."),
+    ):
+        registry.register(Gauge(metric_name, documentation, collect=reading(method_name)))
+
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -130,4 +130,14 @@ class AuctionBidResponse(BaseModel):
     timestamp: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BiddingSessionCreate(BaseModel):
+    bidder_country: str
+    seller_country: str
+    resource_name: str
+    total_quantity: float = Field(gt=0)
+    base_price: float = Field(gt=0)
+
+class BidSubmit(BaseModel):
+    price: float
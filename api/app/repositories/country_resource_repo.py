@@ -2,7 +2,9 @@ from sqlalchemy.orm import Session
 from app.models.database import CountryResource
 from typing import List, Optional
 from uuid import UUID
+from app.metrics import instrument_repository
 
+@instrument_repository
 class CountryResourceRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, HTTPException
+from app.models.schemas import BiddingSessionCreate, BidSubmit
+from app.simulation import get_world, sessions, world_lock
+from auction.bidding_session import BiddingSession, SessionStateError
+from dataclasses import asdict
+
+router = APIRouter(prefix="/bidding", tags=["bidding"])
+
+def get_session(session_id: str) -> BiddingSession:
+    try:
+        return sessions.get(session_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Bidding session not found or expired")
+
+@router.post("/sessions")
+def start_session(body: BiddingSessionCreate):
+    world = get_world()
+    try:
+        bidder = world.get_country(body.bidder_country)
+        seller = world.get_country(body.seller_country)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Country not found: {e.args[0]}")
+    if bidder is seller:
+        raise HTTPException(status_code=400, detail="Bidder and seller must differ")
+    try:
+        # The live feed changes the world between auctions only
+        with world_lock:
+            session = sessions.start(world, bidder, seller, body.resource_name, body.total_quantity, body.base_price)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return session.to_dict()
+
+@router.get("/sessions/{session_id}")
+def get_session_state(session_id: str):
+    return get_session(session_id).to_dict()
+
+@router.post("/sessions/{session_id}/bid")
+def submit_bid(session_id: str, bid: BidSubmit):
+    session = get_session(session_id)
+    try:
+        result = session.submit_bid(bid.price)
+    except SessionStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"result": asdict(result), "session": session.to_dict()}
+
+@router.post("/sessions/{session_id}/pass")
+def pass_batch(session_id: str):
+    session = get_session(session_id)
+    try:
+        result = session.pass_batch()
+    except SessionStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"result": asdict(result), "session": session.to_dict()}
+
+@router.post("/sessions/{session_id}/exit")
+def exit_session(session_id: str):
+    session = get_session(session_id)
+    session.exit()
+    return session.to_dict()
+
+@router.delete("/sessions/{session_id}")
+def delete_session(session_id: str):
+    if sessions.remove(session_id) is None:
+        raise HTTPException(status_code=404, detail="Bidding session not found or expired")
+    return {"status": "deleted"}
@@ -0,0 +1,36 @@
+import asyncio
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from app.broadcast import HELLO, ClientChannel, broadcaster
+
+router = APIRouter(tags=["live"])
+
+async def _send_messages(websocket: WebSocket, channel: ClientChannel):
+    while True:
+        for message in await channel.next_messages():
+            await websocket.send_text(message)
+
+async def _receive_messages(websocket: WebSocket):
+    # Incoming messages (keep-alives) are ignored; this only notices the disconnect
+    while True:
+        await websocket.receive_text()
+
+@router.websocket("/ws")
+async def live_events(websocket: WebSocket):
+    await websocket.accept()
+    channel = broadcaster.connect()
+    try:
+        await websocket.send_text(HELLO)
+        tasks = {
+            asyncio.create_task(_send_messages(websocket, channel)),
+            asyncio.create_task(_receive_messages(websocket)),
+        }
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if not task.cancelled() and not isinstance(task.exception(), (WebSocketDisconnect, RuntimeError)):
+                raise task.exception()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        broadcaster.disconnect(channel)
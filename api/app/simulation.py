@@ -0,0 +1,45 @@
+"""
+The simulation engine as used by the API.
+
+The engine (`auction/`, `models/`) lives in the repository root, next to the
+API. One world is shared by the live auction feed and the bidding sessions:
+the feed holds `world_lock` for every auction, and a session holds it while
+it takes its snapshot of the world when it starts.
+"""
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from models.world import World
+from auction.bidding_session import BiddingSessionStore
+
+from app import metrics
+from app.config import Config
+
+
+_world: Optional[World] = None
+_world_lock = threading.Lock()
+
+# Guards the shared world itself (not just its creation)
+world_lock = threading.Lock()
+
+
+def get_world() -> World:
+    global _world
+    with _world_lock:
+        if _world is None:
+            _world = World.from_file(Config.WORLD_FILE) if Config.WORLD_FILE else World.from_country_data()
+        return _world
+
+
+sessions = BiddingSessionStore(
+    max_sessions=Config.BIDDING_MAX_SESSIONS,
+    idle_timeout=Config.BIDDING_IDLE_TIMEOUT
+)
+
+metrics.registry.register(metrics.Gauge(
+    "bidding_sessions", "Interactive bidding sessions held in memory.",
+    collect=lambda: {(): float(len(sessions))}))
@@ -0,0 +1,8 @@
+from .auction import AuctionStatus, Bid, BidBook, Auction
+
+__all__ = [
+    'AuctionStatus',
+    'Bid',
+    'BidBook',
+    'Auction',
+]
@@ -3,7 +3,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 from models.resourcess import Resource
@@ -54,9 +55,73 @@ class Bid:
             return f"Bid(country={self.country.name}, price=SEALED)"
 
 
+class BidBook:
+    """
+    Sealed bids of one auction, keyed by country name.
+
+    Duplicate bidders are found with a dict lookup and the highest and
+    second-highest bids are kept up to date as bids arrive (bids are never
+    withdrawn), so the winner is known without sorting. Ties go to the
+    earlier bid. All methods hold a lock only for a few dict operations and
+    never await, so a book can be shared by threads and coroutines alike.
+    """
+
+    def __init__(self):
+        self._bids: Dict[str, Bid] = {}
+        self._best: Optional[Bid] = None
+        self._second: Optional[Bid] = None
+        self._lock = threading.Lock()
+
+    def add(self, bid: Bid) -> bool:
+        """Add `bid`; returns False if its country has already bid."""
+        with self._lock:
+            return self._add(bid)
+
+    def _add(self, bid: Bid) -> bool:
+        name = bid.country.name
+        if name in self._bids:
+            return False
+        self._bids[name] = bid
+
+        price = bid.bid_price_per_unit
+        if self._best is None or price > self._best.bid_price_per_unit:
+            self._second = self._best
+            self._best = bid
+        elif self._second is None or price > self._second.bid_price_per_unit:
+            self._second = bid
+        return True
+
+    @property
+    def best(self) -> Optional[Bid]:
+        return self._best
+
+    @property
+    def second(self) -> Optional[Bid]:
+        return self._second
+
+    def get(self, country_name: str) -> Optional[Bid]:
+        return self._bids.get(country_name)
+
+    def __contains__(self, country_name: str) -> bool:
+        return country_name in self._bids
+
+    def __len__(self) -> int:
+        return len(self._bids)
+
+    def __iter__(self) -> Iterator[Bid]:
+        """Bids in submission order."""
+        with self._lock:
+            return iter(list(self._bids.values()))
+
+
 @dataclass
 class Auction:
-    """Represents a single sealed-bid auction."""
+    """
+    Represents a single sealed-bid auction.
+
+    Status changes (open, close, settle) are atomic, and bids go into a
+    `BidBook`, so many bidders may submit at once from threads or coroutines.
+    """
     seller: Country
     resource_name: str
     quantity: float
@@ -64,9 +129,15 @@ class Auction:
     asking_price_per_unit: float  
     current_market_price: float   
     status: AuctionStatus = AuctionStatus.PENDING
-    bids: List[Bid] = field(default_factory=list)
+    book: BidBook = field(default_factory=BidBook, repr=False, compare=False)
     winner: Optional[Country] = None
     final_price_per_unit: Optional[float] = None
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+    
+    @property
+    def bids(self) -> List[Bid]:
+        """All bids, in submission order."""
+        return list(self.book)
     
     @property
     def total_asking_price(self) -> float:
@@ -85,6 +156,14 @@ class Auction:
             return self.final_price_per_unit * self.quantity
         return None
     
+    def _transition(self, expected: AuctionStatus, new: AuctionStatus) -> bool:
+        """Move from `expected` to `new` status; False if the auction isn't in `expected`."""
+        with self._lock:
+            if self.status != expected:
+                return False
+            self.status = new
+            return True
+    
     def open_bidding(self) -> bool:
         """Open the auction for bidding."""
         if not self.seller.has_resource(self.resource_name):
@@ -97,7 +176,9 @@ class Auction:
             print(f"   Has: {seller_resource.amount} {self.resource_unit}, Needs: {self.quantity} {self.resource_unit}")
             return False
         
-        self.status = AuctionStatus.BIDDING_OPEN
+        if not self._transition(AuctionStatus.PENDING, AuctionStatus.BIDDING_OPEN):
+            print(f" Auction is already {self.status.value}")
+            return False
         print(f"\n Auction is now OPEN")
         print(f"   Seller: {self.seller.name}")
         print(f"   Resource: {self.quantity} {self.resource_unit} of {self.resource_name}")
@@ -107,95 +188,117 @@ class Auction:
         print(f"   Total Asking Price: ${self.total_asking_price:.2f}B")
         return True
     
-    def submit_bid(self, country: Country, bid_price_per_unit: float) -> bool:
-        """Submit a sealed bid."""
+    def _check_bid(self, country: Country, bid_price_per_unit: float) -> Optional[str]:
+        """Reason to reject the bid (with the lock held), or None if it is valid."""
         if self.status != AuctionStatus.BIDDING_OPEN:
-            print(f" Bidding is not open")
-            return False
-        
-        if country == self.seller:
-            print(f" {country.name} cannot bid on their own resource")
-            return False
+            return "Bidding is not open"
         
+        if country.name == self.seller.name:
+            return f"{country.name} cannot bid on their own resource"
         
         total_bid = bid_price_per_unit * self.quantity
-        
-        
         if country.budget < total_bid:
-            print(f" {country.name} doesn't have enough budget")
-            print(f"   Has: ${country.budget:.2f}B, Needs: ${total_bid:.2f}B")
-            return False
-        
+            return (f"{country.name} doesn't have enough budget\n"
+                    f"   Has: ${country.budget:.2f}B, Needs: ${total_bid:.2f}B")
         
         if bid_price_per_unit < self.asking_price_per_unit:
-            print(f" Bid too low. Minimum: ${self.asking_price_per_unit:.2f} per {self.resource_unit}")
-            return False
+            return f"Bid too low. Minimum: ${self.asking_price_per_unit:.2f} per {self.resource_unit}"
         
+        if country.name in self.book:
+            return f"{country.name} has already placed a bid"
         
-        for bid in self.bids:
-            if bid.country == country:
-                print(f" {country.name} has already placed a bid")
-                return False
+        return None
+    
+    def submit_bid(self, country: Country, bid_price_per_unit: float, verbose: bool = True) -> bool:
+        """Submit a sealed bid. With `verbose` the outcome is printed."""
+        with self._lock:
+            reason = self._check_bid(country, bid_price_per_unit)
+            if reason is None:
+                self.book.add(Bid(country=country, bid_price_per_unit=bid_price_per_unit, is_revealed=False))
         
-        bid = Bid(country=country, bid_price_per_unit=bid_price_per_unit, is_revealed=False)
-        self.bids.append(bid)
-        print(f" {country.name} submitted a sealed bid")
-        return True
+        if verbose:
+            print(f" {reason}" if reason else f" {country.name} submitted a sealed bid")
+        return reason is None
+    
+    def submit_bids(self, bids: Iterable[Tuple[Country, float]]) -> List[Optional[str]]:
+        """
+        Submit many sealed bids at once, without printing.
+        
+        Returns:
+            One entry per bid: None if it was accepted, else the reason it was rejected
+        """
+        reasons = []
+        with self._lock:
+            for country, bid_price_per_unit in bids:
+                reason = self._check_bid(country, bid_price_per_unit)
+                if reason is None:
+                    self.book.add(Bid(country=country, bid_price_per_unit=bid_price_per_unit, is_revealed=False))
+                reasons.append(reason)
+        return reasons
     
     def close_bidding(self) -> bool:
         """Close bidding for this auction."""
-        if self.status != AuctionStatus.BIDDING_OPEN:
+        if not self._transition(AuctionStatus.BIDDING_OPEN, AuctionStatus.BIDDING_CLOSED):
             print(f" Bidding is not open")
             return False
         
-        self.status = AuctionStatus.BIDDING_CLOSED
         print(f"\n Bidding is now CLOSED")
         return True
     
     def reveal_bids(self) -> None:
         """Reveal all sealed bids."""
-        if self.status != AuctionStatus.BIDDING_CLOSED:
-            print(f" Cannot reveal bids - bidding not closed")
-            return
+        with self._lock:
+            if self.status not in (AuctionStatus.BIDDING_CLOSED, AuctionStatus.COMPLETED):
+                print(f" Cannot reveal bids - bidding not closed")
+                return
+            bids = self.bids
+            for bid in bids:
+                bid.is_revealed = True
         
         print(f"\n Revealing bids:")
-        for bid in sorted(self.bids, key=lambda b: b.bid_price_per_unit, reverse=True):
-            bid.is_revealed = True
+        for bid in sorted(bids, key=lambda b: b.bid_price_per_unit, reverse=True):
             total = bid.get_total_bid(self.quantity)
             print(f"{bid.country.name}: ${bid.bid_price_per_unit:.2f} per {self.resource_unit} (Total: ${total:.2f}B)")
     
-    def determine_winner(self) -> bool:
-        """Determine the winner and complete the transaction."""
-        if self.status != AuctionStatus.BIDDING_CLOSED:
-            print(f" Bidding must be closed first")
-            return False
-        
-        if not self.bids:
-            print(f" No bids placed")
-            self.status = AuctionStatus.CANCELLED
-            return False
-        
-        self.reveal_bids()
-        
-        highest_bid = max(self.bids, key=lambda b: b.bid_price_per_unit)
-        winner = highest_bid.country
-        final_price_per_unit = highest_bid.bid_price_per_unit
-        total_price = final_price_per_unit * self.quantity
+    def determine_winner(self, reveal: bool = True) -> bool:
+        """
+        Determine the winner and complete the transaction.
         
-        seller_resource = self.seller.get_resource(self.resource_name)
-        seller_resource.amount -= self.quantity
-        
-        if winner.has_resource(self.resource_name):
-            winner.resources[self.resource_name].amount += self.quantity
-        else:
-            winner.resources[self.resource_name] = Resource(self.quantity, self.resource_unit)
-        
-        winner.budget -= total_price
-        self.seller.budget += total_price
+        The winner is read from the bid book in O(1); `reveal` additionally
+        prints every bid, sorted by price.
+        """
+        with self._lock:
+            if self.status != AuctionStatus.BIDDING_CLOSED:
+                print(f" Bidding must be closed first")
+                return False
+            
+            highest_bid = self.book.best
+            if highest_bid is None:
+                self.status = AuctionStatus.CANCELLED
+                print(f" No bids placed")
+                return False
+            
+            winner = highest_bid.country
+            final_price_per_unit = highest_bid.bid_price_per_unit
+            total_price = final_price_per_unit * self.quantity
+            
+            seller_resource = self.seller.get_resource(self.resource_name)
+            seller_resource.amount -= self.quantity
+            
+            if winner.has_resource(self.resource_name):
+                winner.resources[self.resource_name].amount += self.quantity
+            else:
+                winner.resources[self.resource_name] = Resource(self.quantity, self.resource_unit)
+            
+            winner.budget -= total_price
+            self.seller.budget += total_price
+            
+            self.winner = winner
+            self.final_price_per_unit = final_price_per_unit
+            self.status = AuctionStatus.COMPLETED
         
-        self.winner = winner
-        self.final_price_per_unit = final_price_per_unit
-        self.status = AuctionStatus.COMPLETED
+        if reveal:
+            self.reveal_bids()
         
         print(f"\n Winner: {winner.name}")
         print(f"   Final Price: ${final_price_per_unit:.2f} per {self.resource_unit}")
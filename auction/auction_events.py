@@ -0,0 +1,331 @@
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, TextIO
+
+
+CSV_HEADERS = [
+    "auction_id", "timestamp", "cluster_name", "batch_num", "quantity_sold", "resource_name",
+    "seller_name", "winner_name", "winning_price_per_unit", "total_cost",
+    "seller_budget_before", "seller_budget_after",
+    "seller_supply_before", "seller_supply_after",
+    "winner_budget_before", "winner_budget_after",
+    "winner_supply_before", "winner_supply_after",
+    "winner_demand_before", "winner_demand_after"
+]
+
+
+@dataclass
+class AuctionStarted:
+    """The seller has enough stock and the auction is about to be planned."""
+    auction_id: Optional[int]
+    seller_name: str
+    resource_name: str
+    resource_unit: str
+    total_quantity: float
+    base_price: float
+
+
+@dataclass
+class AuctionRejected:
+    """The seller does not hold enough of the resource to run the auction."""
+    auction_id: Optional[int]
+    seller_name: str
+    resource_name: str
+    total_quantity: float
+    available: float
+
+
+@dataclass
+class ClusterPlan:
+    """Planned share of one cluster."""
+    cluster_name: str
+    auction_quantity: float
+    num_batches: int
+
+
+@dataclass
+class BatchPlanned:
+    """The auction quantity has been split across clusters and batches."""
+    total_countries_in_world: int
+    total_quantity: float
+    clusters: List[ClusterPlan] = field(default_factory=list)
+
+
+@dataclass
+class ClusterStarted:
+    """Batch auctions are starting for one cluster."""
+    cluster_name: str
+    num_batches: int
+
+
+@dataclass
+class BatchOpened:
+    """A batch of one cluster is open for bids."""
+    cluster_name: str
+    batch_num: int
+    quantity: float
+    resource_unit: str
+
+
+@dataclass
+class StockExhausted:
+    """The seller's remaining auction stock can't cover the next batch."""
+    cluster_name: str
+    batch_num: int
+    needed: float
+    available: float
+
+
+@dataclass
+class BidEvaluated:
+    """A competitor's Laplace valuation for a batch."""
+    cluster_name: str
+    batch_num: int
+    country_name: str
+    v_value: float
+    accepted: bool
+
+
+@dataclass
+class NoBids:
+    """No accepted bids for a batch."""
+    cluster_name: str
+    batch_num: int
+
+
+@dataclass
+class WinnerChosen:
+    """The Vickrey winner of a batch and the (second) price it pays."""
+    cluster_name: str
+    batch_num: int
+    winner_name: str
+    bid_value: float
+    price_per_unit: float
+    num_bids: int
+
+
+@dataclass
+class BudgetFailed:
+    """The winner can't afford the batch; it stays unsold."""
+    cluster_name: str
+    batch_num: int
+    winner_name: str
+    budget: float
+    total_cost: float
+
+
+@dataclass
+class Settlement:
+    """A batch changed hands. Carries the before/after state of both parties."""
+    auction_id: Optional[int]
+    timestamp: datetime
+    cluster_name: str
+    batch_num: int
+    quantity: float
+    resource_name: str
+    seller_name: str
+    winner_name: str
+    price_per_unit: float
+    total_cost: float
+    seller_before: Dict
+    seller_after: Dict
+    winner_before: Dict
+    winner_after: Dict
+    live_auction_stock: float
+
+    def to_csv_row(self) -> Dict:
+        """Flatten into a row matching `CSV_HEADERS`."""
+        return {
+            "auction_id": self.auction_id,
+            "timestamp": self.timestamp.isoformat(),
+            "cluster_name": self.cluster_name,
+            "batch_num": self.batch_num,
+            "quantity_sold": self.quantity,
+            "resource_name": self.resource_name,
+            "seller_name": self.seller_name,
+            "winner_name": self.winner_name,
+            "winning_price_per_unit": self.price_per_unit,
+            "total_cost": self.total_cost,
+            "seller_budget_before": self.seller_before['budget'],
+            "seller_budget_after": self.seller_after['budget'],
+            "seller_supply_before": self.seller_before['supply'],
+            "seller_supply_after": self.seller_after['supply'],
+            "winner_budget_before": self.winner_before['budget'],
+            "winner_budget_after": self.winner_after['budget'],
+            "winner_supply_before": self.winner_before['supply'],
+            "winner_supply_after": self.winner_after['supply'],
+            "winner_demand_before": self.winner_before['demand'],
+            "winner_demand_after": self.winner_after['demand']
+        }
+
+
+@dataclass
+class AuctionCompleted:
+    """All clusters have been processed (or the stock ran out)."""
+    auction_id: Optional[int]
+    total_quantity: float
+    quantity_sold: float
+    sold_out: bool
+
+
+EventSink = Callable[[object], None]
+
+
+def wants_bid_events(sink: Optional[EventSink]) -> bool:
+    """
+    Whether `sink` needs the per-bid events (`BatchOpened`, `BidEvaluated`,
+    `WinnerChosen`, `NoBids`). Sinks that only look at outcomes declare
+    `bid_events = False`, and the auction then doesn't build them.
+    """
+    return sink is not None and getattr(sink, "bid_events", True)
+
+
+class CsvRowSink:
+    """Collects `Settlement` events as CSV-ready row dicts."""
+
+    bid_events = False
+
+    def __init__(self):
+        self.rows: List[Dict] = []
+
+    def __call__(self, event) -> None:
+        if type(event) is Settlement:
+            self.rows.append(event.to_csv_row())
+
+
+class MultiSink:
+    """Fans every event out to several sinks."""
+
+    def __init__(self, *sinks: EventSink):
+        self.sinks: Tuple[EventSink, ...] = tuple(s for s in sinks if s is not None)
+        self.bid_events = any(wants_bid_events(s) for s in self.sinks)
+
+    def __call__(self, event) -> None:
+        for sink in self.sinks:
+            sink(event)
+
+
+class PrintSink:
+    """Renders events as the human-readable console report of `run_simulation`."""
+
+    def __init__(self, file: Optional[TextIO] = None):
+        self.file = file
+        self._handlers = {
+            AuctionStarted: self._auction_started,
+            AuctionRejected: self._auction_rejected,
+            BatchPlanned: self._batch_planned,
+            ClusterStarted: self._cluster_started,
+            BatchOpened: self._batch_opened,
+            StockExhausted: self._stock_exhausted,
+            BidEvaluated: self._bid_evaluated,
+            NoBids: self._no_bids,
+            WinnerChosen: self._winner_chosen,
+            BudgetFailed: self._budget_failed,
+            Settlement: self._settlement,
+            AuctionCompleted: self._auction_completed,
+        }
+
+    def __call__(self, event) -> None:
+        handler = self._handlers.get(type(event))
+        if handler:
+            handler(event)
+
+    def _print(self, *lines: str) -> None:
+        out = self.file or sys.stdout
+        for line in lines:
+            print(line, file=out)
+
+    def _auction_started(self, e: AuctionStarted) -> None:
+        self._print(
+            f"--- STARTING SIMULATION ---",
+            f"  Seller: {e.seller_name}",
+            f"  Resource: {e.resource_name}",
+            f"  Total Quantity for Auction: {e.total_quantity}",
+            f"  Base (Reserve) Price: ${e.base_price}B per unit",
+        )
+
+    def _auction_rejected(self, e: AuctionRejected) -> None:
+        self._print(
+            f"\nSIMULATION FAILED: Seller does not have enough {e.resource_name} to auction.",
+            f"  Has: {e.available}, Needs: {e.total_quantity}",
+        )
+
+    def _batch_planned(self, e: BatchPlanned) -> None:
+        self._print(
+            "\n[Phase 1: Calculating proportional distribution...]",
+            f"  Total countries in all clusters: {e.total_countries_in_world}",
+            f"  Distributing {e.total_quantity} units proportionally.",
+            "\n[Phase 2: Verifying batch assignments...]",
+        )
+        total_planned_quantity = 0.0
+        for plan in e.clusters:
+            self._print(f"  {plan.cluster_name:<28}: Assigned {plan.auction_quantity:6.2f} units (Batches: {plan.num_batches})")
+            total_planned_quantity += plan.auction_quantity
+        self._print(
+            f"  {'-'*28}: {'-'*6}",
+            f"  {'Total Planned Quantity':<28}: {total_planned_quantity:6.2f} (Should match {e.total_quantity})",
+            "\n" + "="*70,
+            "STARTING BATCH AUCTIONS",
+            "="*70,
+        )
+
+    def _cluster_started(self, e: ClusterStarted) -> None:
+        self._print(f"\n--- Processing Cluster: {e.cluster_name} ---")
+        if not e.num_batches:
+            self._print("  No batches to process for this cluster.")
+
+    def _batch_opened(self, e: BatchOpened) -> None:
+        self._print(f"\n  --- Batch {e.batch_num} | Quantity: {e.quantity:.2f} {e.resource_unit} ---")
+
+    def _stock_exhausted(self, e: StockExhausted) -> None:
+        self._print(
+            f"  SELLER STOCK LOW: Not enough auction stock for this batch (Needs: {e.needed:.2f}, Has: {e.available:.2f}).",
+            f"  AUCTION FOR {e.cluster_name} ENDED.",
+        )
+
+    def _bid_evaluated(self, e: BidEvaluated) -> None:
+        verdict = "ACCEPTED" if e.accepted else "REJECTED"
+        self._print(f"    {e.country_name:<13}: Bid {verdict} (v_value: ${e.v_value:.4f}B)")
+
+    def _no_bids(self, e: NoBids) -> None:
+        self._print("    RESULT: No bids for this batch.")
+
+    def _winner_chosen(self, e: WinnerChosen) -> None:
+        if e.num_bids == 1:
+            self._print(
+                f"    RESULT: Only one bidder ({e.winner_name}).",
+                f"    Winner pays reserve (base) price.",
+            )
+        else:
+            self._print(
+                f"    RESULT: {e.num_bids} bidders.",
+                f"    Winner: {e.winner_name:<13} (Bid Value: ${e.bid_value:.4f}B)",
+                f"    Winner Pays (2nd Price): ${e.price_per_unit:.4f}B per unit",
+            )
+
+    def _budget_failed(self, e: BudgetFailed) -> None:
+        self._print(
+            f"    WINNER {e.winner_name} FAILED: Insufficient budget.",
+            f"      Budget: ${e.budget:.2f}B, Cost: ${e.total_cost:.2f}B",
+        )
+
+    def _settlement(self, e: Settlement) -> None:
+        self._print(
+            f"    TRANSACTION:",
+            f"      {e.winner_name:<13} pays ${e.total_cost:.2f}B",
+            f"      {e.seller_name:<13} receives ${e.total_cost:.2f}B",
+            f"    New Balances:",
+            f"      {e.winner_name:<13}: Budget ${e.winner_after['budget']:6.2f}B, {e.resource_name}: {e.winner_after['supply']:.2f}",
+            f"      {e.seller_name:<13}: Budget ${e.seller_after['budget']:6.2f}B, {e.resource_name}: {e.seller_after['supply']:.2f}",
+            f"      (Auction Stock Remaining: {e.live_auction_stock:.2f})",
+        )
+
+    def _auction_completed(self, e: AuctionCompleted) -> None:
+        if e.sold_out:
+            self._print(f"\n*** AUCTION ENDED: Total planned quantity ({e.total_quantity}) has been sold. ***")
+        self._print(
+            "\n" + "="*70,
+            "SIMULATION COMPLETE",
+            "="*70,
+        )
@@ -2,18 +2,74 @@ import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 import math
 import csv
 import random
+import threading
+from contextlib import nullcontext
+from concurrent.futures import Executor, ThreadPoolExecutor
+import numpy as np
 from models.country import Country
 from models.cluster import ClusterInfo  
-from models.cluster_enums import CountryClusters
 from models.resourcess import Resource
+from models.market_index import SurplusIndex
+from models.world import World
 from datetime import datetime
+from enum import Enum
+from time import perf_counter
 from auction import AuctionStatus, Bid, Auction 
-import io
-import time
+
+try:
+    from .scheduler import TickScheduler, SchedulerMode
+    from .transaction_log import TransactionLogger
+    from .columnar_log import ColumnarTransactionWriter, FORMAT_NPZ, FORMAT_ARROW
+    from .checkpoint import CheckpointManager
+    from .simulation_stats import (
+        SimulationStats, PHASE_DISTRIBUTION, PHASE_VERIFICATION,
+        OUTCOME_SETTLED, OUTCOME_NO_BIDS, OUTCOME_BUDGET_FAILED, OUTCOME_STOCK_EXHAUSTED
+    )
+except ImportError:
+    from scheduler import TickScheduler, SchedulerMode
+    from transaction_log import TransactionLogger
+    from columnar_log import ColumnarTransactionWriter, FORMAT_NPZ, FORMAT_ARROW
+    from checkpoint import CheckpointManager
+    from simulation_stats import (
+        SimulationStats, PHASE_DISTRIBUTION, PHASE_VERIFICATION,
+        OUTCOME_SETTLED, OUTCOME_NO_BIDS, OUTCOME_BUDGET_FAILED, OUTCOME_STOCK_EXHAUSTED
+    )
+
+try:
+    from .auction_events import (
+        CSV_HEADERS, EventSink, CsvRowSink, MultiSink, PrintSink, wants_bid_events,
+        AuctionStarted, AuctionRejected, BatchPlanned, ClusterPlan, ClusterStarted, BatchOpened,
+        StockExhausted, BidEvaluated, NoBids, WinnerChosen, BudgetFailed, Settlement, AuctionCompleted
+    )
+except ImportError:
+    from auction_events import (
+        CSV_HEADERS, EventSink, CsvRowSink, MultiSink, PrintSink, wants_bid_events,
+        AuctionStarted, AuctionRejected, BatchPlanned, ClusterPlan, ClusterStarted, BatchOpened,
+        StockExhausted, BidEvaluated, NoBids, WinnerChosen, BudgetFailed, Settlement, AuctionCompleted
+    )
+
+# Settings of the live auction loop: +/-3% noise on competitor bids and the
+# winner's remaining demand halves after every batch it wins.
+BID_NOISE = (0.97, 1.03)
+DEMAND_DECAY = 0.5
+
+
+@dataclass(frozen=True)
+class LaplaceParams:
+    """Shape of the competitors' bid curve (see `AuctionManager.laplace`)."""
+    k: float = 0.4       # curve width as a fraction of the bidder's demand
+    min_b: float = 1.0   # lower bound of the curve width
+
+
+class ClearingMode(Enum):
+    """How each cluster's share of an auction is sold."""
+    BATCHES = "batches"   # n-1 halving batches, one Vickrey round each
+    UNIFORM = "uniform"   # all batches cleared at once at one uniform price
+
 
 @dataclass
 class AuctionManager:
@@ -53,169 +109,710 @@ class AuctionManager:
             
         return v, True
 
+    @staticmethod
+    def laplace_batch(base_price: float, supply, demand, quantity, min_b=1, k=0.4) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized version of `laplace` for a whole set of bidders at once.
+
+        `supply`, `demand`, `quantity`, `min_b` and `k` may be scalars or arrays;
+        they are broadcast against each other, so one call can value every
+        bidder of a cluster (or of the world) for a batch, or every bidder for
+        every batch quantity.
+
+        Returns:
+            (v_values, accepted) arrays with the broadcast shape.
+        """
+        if base_price <= 0:
+            raise ValueError("Base price must be > 0")
+
+        supply = np.asarray(supply, dtype=np.float64)
+        demand = np.asarray(demand, dtype=np.float64)
+        quantity = np.asarray(quantity, dtype=np.float64)
+
+        has_supply = supply > 0
+        ratio = np.divide(demand, supply, out=np.zeros(np.broadcast(demand, supply).shape), where=has_supply)
+        max_increase = np.where(has_supply, np.clip(ratio - 1.0, 0.0, 1.0), 1.0)
+
+        b = np.maximum(np.abs(demand) * np.asarray(k, dtype=np.float64), np.asarray(min_b, dtype=np.float64))
+
+        distance = np.abs(quantity - demand)
+
+        w = np.exp(-distance / b)
+
+        v = base_price * (1.0 + max_increase * w)
+
+        return v, ~(v < base_price)
 
-def run_simulation(seller: Country, resource_name: str, total_quantity: float, base_price: float):
+
+def collect_bidders(countries: List[Country], resource_name: str, exclude: Tuple[str, ...] = ()) -> Tuple[List[Country], np.ndarray, np.ndarray]:
     """
-    Runs the full Vickrey (second-price) auction simulation.
-    
-    This function uses helper methods from all other files:
-    - `cluster_enums.py`: To loop through `CountryClusters`.
-    - `cluster.py`: To call `assign_auction_quantity` which calculates batches (n-1 rule).
-    - `country.py`: To call `get_resource`/`get_demand` and update `budget`/`resources`.
-    - `auction_manager.py`: To call `laplace` for bid decisions.
+    Collects the countries that can bid on `resource_name` (positive demand,
+    not excluded by name) together with their supply and demand as arrays,
+    ready to be passed to `AuctionManager.laplace_batch`.
     """
-    print(f"--- STARTING SIMULATION ---")
-    print(f"  Seller: {seller.name}")
-    print(f"  Resource: {resource_name}")
-    print(f"  Total Quantity for Auction: {total_quantity}")
-    print(f"  Base (Reserve) Price: ${base_price}B per unit")
-    
+    bidders = []
+    supplies = []
+    demands = []
+    for country in countries:
+        if country.name in exclude:
+            continue
+
+        demand_res = country.get_demand(resource_name)
+        if not demand_res or demand_res.amount <= 0:
+            continue
+
+        supply_res = country.get_resource(resource_name)
+        bidders.append(country)
+        supplies.append(supply_res.amount if supply_res else 0.0)
+        demands.append(demand_res.amount)
+
+    return bidders, np.array(supplies, dtype=np.float64), np.array(demands, dtype=np.float64)
+
+
+def top_two_bids(v_values: np.ndarray, accepted: np.ndarray) -> Tuple[List[int], int]:
+    """
+    Returns the indices of the highest and second-highest accepted bids
+    (ties keep bidder order, like a stable descending sort) and the number
+    of accepted bids.
+    """
+    accepted_idx = np.flatnonzero(accepted)
+    if accepted_idx.size == 0:
+        return [], 0
+    order = np.argsort(-v_values[accepted_idx], kind='stable')[:2]
+    return [int(i) for i in accepted_idx[order]], int(accepted_idx.size)
+
+
+def _transfer(seller: Country, seller_resource: Resource, winner: Country, resource_name: str, resource_unit: str,
+              quantity: float, total_cost: float, cluster_info: ClusterInfo,
+              demand_decay: Optional[float], surplus_index: Optional[SurplusIndex], wins: int = 1,
+              sales: Optional[List[Tuple[Country, float, float]]] = None) -> None:
+    """
+    Settles a sale: payment, goods, the winner's demand decay (once for each
+    of the `wins` batches sold) and the surplus index.
+
+    With a `sales` list only the winner's side is settled; the seller's side
+    is appended as (winner, quantity, total_cost) for `_settle_seller`.
+    """
+    winner.budget -= total_cost
+    if sales is None:
+        seller.budget += total_cost
+        seller_resource.amount -= quantity
+    else:
+        sales.append((winner, quantity, total_cost))
+
+    winner_resource = winner.get_resource(resource_name)
+    if winner_resource:
+        winner_resource.amount += quantity
+    else:
+        winner.resources[resource_name] = Resource(amount=quantity, unit=resource_unit)
+
+    if demand_decay is not None:
+        winner_demand = winner.get_demand(resource_name)
+        if winner_demand:
+            winner_demand.amount *= demand_decay if wins == 1 else demand_decay ** wins
+            cluster_info.update_bidder(winner, resource_name)
+
+    if surplus_index is not None:
+        if sales is None:
+            surplus_index.update(seller, resource_name)
+        surplus_index.update(winner, resource_name)
+
+
+def _settle_seller(seller: Country, seller_resource: Resource, resource_name: str, quantity: float,
+                   total_cost: float, surplus_index: Optional[SurplusIndex]) -> None:
+    """The seller's side of a sale settled by `_transfer(..., sales=...)`."""
+    seller.budget += total_cost
+    seller_resource.amount -= quantity
+    if surplus_index is not None:
+        surplus_index.update(seller, resource_name)
+
+
+def uniform_clearing(v_values: np.ndarray, accepted: np.ndarray, base_price: float) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Clears a cluster's batches as one multi-unit auction, in one sort and sweep.
+
+    Row `i` of `v_values` is bidder i's demand curve: column m holds its bid
+    per unit for an (m+1)-th batch. Curves are made non-increasing, and a
+    bidder stops bidding after its first rejected step. All steps are sorted
+    by price (ties to the earlier bidder, then the earlier step) and the best
+    `n` steps win the `n` batches, the best step getting the first batch.
+    Every winner pays one price: the best losing step, or `base_price` if
+    there is none. With a single batch this is the Vickrey rule of the batch
+    auction.
+
+    Returns:
+        (winning bidder per sold batch, winning bid per sold batch, clearing price);
+        batches past the number of accepted steps stay unsold
+    """
+    num_lots = v_values.shape[1]
+    curves = np.minimum.accumulate(v_values, axis=1) if num_lots else v_values
+    steps = np.where(np.logical_and.accumulate(accepted, axis=1), curves, -np.inf).ravel()
+
+    order = np.argsort(-steps, kind='stable')
+    num_steps = int(np.count_nonzero(steps > -np.inf))
+    winning = order[:min(num_lots, num_steps)]
+    price = float(steps[order[num_lots]]) if num_steps > num_lots else base_price
+    return winning // num_lots, steps[winning], price
+
+
+def _clear_cluster_uniform(
+    cluster_info: ClusterInfo,
+    schedule,
+    seller: Country,
+    seller_resource: Resource,
+    resource_name: str,
+    resource_unit: str,
+    base_price: float,
+    laplace: LaplaceParams,
+    live_auction_stock: float,
+    auction_id: Optional[int],
+    sink: Optional[EventSink],
+    noise: Optional[Tuple[float, float]],
+    demand_decay: Optional[float],
+    rng,
+    clock: Callable[[], datetime],
+    surplus_index: Optional[SurplusIndex],
+    stats: Optional[SimulationStats],
+    sales: Optional[List[Tuple[Country, float, float]]] = None
+) -> float:
+    """
+    `ClearingMode.UNIFORM` for one cluster, as one multi-unit auction.
+
+    Every bidder's demand curve is valued at once: its bid for an (m+1)-th
+    batch uses the batch quantity and its demand decayed m times, as the
+    batch auction would after m wins, and the bid noise is drawn per step.
+    The batches are then cleared with `uniform_clearing` and each winner
+    settles once for all the batches it won (the `Settlement` carries the
+    first of them), in the order of its first batch:
+    - stock: a winner is only served if the remaining auction stock covers
+      its quantity, otherwise the cluster ends
+    - budget: a winner that can't pay for all its batches takes the ones it
+      can afford, in batch order; the others stay unsold
+    - demand decay: applied once per batch won
+    Valuations are sealed when the cluster clears.
+
+    Returns:
+        The remaining auction stock.
+    """
+    epsilon = 1e-9
+    lots = [(batch_num, quantity) for batch_num, quantity in schedule.items() if quantity != 0]
+    if not lots:
+        return live_auction_stock
+
+    if stats is not None:
+        clearing_start = perf_counter()
+
+    bidders, supplies, demands = collect_bidders(cluster_info.get_bidders(resource_name), resource_name, exclude=(seller.name,))
+    quantities = np.array([quantity for _, quantity in lots], dtype=np.float64)
+    decay = demand_decay ** np.arange(len(lots)) if demand_decay is not None else np.ones(len(lots))
+    v_values, accepted = AuctionManager.laplace_batch(
+        base_price=base_price,
+        supply=supplies[:, None],
+        demand=demands[:, None] * decay[None, :],
+        quantity=quantities[None, :],
+        min_b=laplace.min_b,
+        k=laplace.k
+    )
+
+    if noise is not None:
+        # One draw from `rng` seeds the noise of every step of every curve
+        low, high = noise
+        step_noise = np.random.default_rng(rng.getrandbits(64)).uniform(low, high, size=v_values.shape)
+        v_values = v_values * step_noise
+
+    winners, winning_bids, price_per_unit = uniform_clearing(v_values, accepted, base_price)
+    winners = winners.tolist()
+    winning_bids = winning_bids.tolist()
+    bid_counts = accepted.sum(axis=0).tolist()
+
+    # Winner -> its lots, in the order of the first lot won
+    won: Dict[int, List[int]] = {}
+    for lot, winner_index in enumerate(winners):
+        won.setdefault(winner_index, []).append(lot)
+
+    if wants_bid_events(sink):
+        for lot, (batch_num, quantity) in enumerate(lots):
+            sink(BatchOpened(cluster_info.name, batch_num, quantity, resource_unit))
+            for country, v_value, is_accepted in zip(bidders, v_values[:, lot].tolist(), accepted[:, lot].tolist()):
+                sink(BidEvaluated(cluster_info.name, batch_num, country.name, v_value, is_accepted))
+            if lot < len(winners):
+                sink(WinnerChosen(cluster_info.name, batch_num, bidders[winners[lot]].name,
+                                  winning_bids[lot], price_per_unit, bid_counts[lot]))
+            else:
+                sink(NoBids(cluster_info.name, batch_num))
+
+    if stats is not None:
+        settlement_start = perf_counter()
+        # The one clearing step is shared out evenly between the batches
+        bidding_time = (settlement_start - clearing_start) / len(lots)
+        outcomes = [OUTCOME_SETTLED if lot < len(winners) else OUTCOME_NO_BIDS for lot in range(len(lots))]
+
+    for winner_index, winner_lots in won.items():
+        winner = bidders[winner_index]
+        quantity = 0.0
+        settled = 0
+        for lot in winner_lots:
+            lot_quantity = lots[lot][1]
+            if winner.budget < price_per_unit * (quantity + lot_quantity):
+                if sink is not None:
+                    sink(BudgetFailed(cluster_info.name, lots[lot][0], winner.name, winner.budget,
+                                      price_per_unit * (quantity + lot_quantity)))
+                if stats is not None:
+                    outcomes[lot] = OUTCOME_BUDGET_FAILED
+                continue
+            quantity += lot_quantity
+            settled += 1
+
+        if not settled:
+            continue
+
+        if live_auction_stock < (quantity - epsilon):
+            if sink is not None:
+                sink(StockExhausted(cluster_info.name, lots[winner_lots[0]][0], quantity, live_auction_stock))
+            if stats is not None:
+                for lot in winner_lots:
+                    outcomes[lot] = OUTCOME_STOCK_EXHAUSTED
+            break
+
+        total_cost = price_per_unit * quantity
+
+        if sink is not None:
+            seller_state_before = get_country_state(seller, resource_name)
+            winner_state_before = get_country_state(winner, resource_name)
+
+        _transfer(seller, seller_resource, winner, resource_name, resource_unit, quantity, total_cost,
+                  cluster_info, demand_decay, surplus_index, wins=settled, sales=sales)
+        live_auction_stock -= quantity
+
+        if sink is not None:
+            sink(Settlement(
+                auction_id=auction_id,
+                timestamp=clock(),
+                cluster_name=cluster_info.name,
+                batch_num=lots[winner_lots[0]][0],
+                quantity=quantity,
+                resource_name=resource_name,
+                seller_name=seller.name,
+                winner_name=winner.name,
+                price_per_unit=price_per_unit,
+                total_cost=total_cost,
+                seller_before=seller_state_before,
+                seller_after=get_country_state(seller, resource_name),
+                winner_before=winner_state_before,
+                winner_after=get_country_state(winner, resource_name),
+                live_auction_stock=live_auction_stock
+            ))
+
+        if live_auction_stock < epsilon:
+            break
+
+    if stats is not None:
+        settlement_time = (perf_counter() - settlement_start) / len(lots)
+        for lot, outcome in enumerate(outcomes):
+            evaluated = len(bidders) if outcome != OUTCOME_STOCK_EXHAUSTED else 0
+            stats.record_batch(resource_name, cluster_info.name, outcome, bidding_time + settlement_time,
+                               evaluated, bid_counts[lot] if evaluated else 0,
+                               bidding_time=bidding_time, settlement_time=settlement_time)
+
+    return live_auction_stock
+
+
+def _clear_cluster_batches(
+    cluster_info: ClusterInfo,
+    schedule,
+    seller: Country,
+    seller_resource: Resource,
+    resource_name: str,
+    resource_unit: str,
+    base_price: float,
+    laplace: LaplaceParams,
+    live_auction_stock: float,
+    auction_id: Optional[int],
+    sink: Optional[EventSink],
+    noise: Optional[Tuple[float, float]],
+    demand_decay: Optional[float],
+    rng,
+    clock: Callable[[], datetime],
+    surplus_index: Optional[SurplusIndex],
+    stats: Optional[SimulationStats],
+    sales: Optional[List[Tuple[Country, float, float]]] = None
+) -> float:
+    """
+    `ClearingMode.BATCHES` for one cluster: one Vickrey round per batch, until
+    the batches or the auction stock run out.
+
+    Returns:
+        The remaining auction stock.
+    """
+    epsilon = 1e-9
+    bid_sink = sink if wants_bid_events(sink) else None
+
+    for batch_num, quantity in schedule.items():
+        if quantity == 0:
+            continue
+
+        if stats is not None:
+            batch_start = perf_counter()
+
+        if bid_sink is not None:
+            bid_sink(BatchOpened(cluster_info.name, batch_num, quantity, resource_unit))
+
+        if live_auction_stock < (quantity - epsilon):
+            if sink is not None:
+                sink(StockExhausted(cluster_info.name, batch_num, quantity, live_auction_stock))
+            if stats is not None:
+                stats.record_batch(resource_name, cluster_info.name, OUTCOME_STOCK_EXHAUSTED,
+                                   perf_counter() - batch_start)
+            break
+
+        bidders, supplies, demands = collect_bidders(cluster_info.get_bidders(resource_name), resource_name, exclude=(seller.name,))
+        v_values, accepted = AuctionManager.laplace_batch(
+            base_price=base_price,
+            supply=supplies,
+            demand=demands,
+            quantity=quantity,
+            min_b=laplace.min_b,
+            k=laplace.k
+        )
+
+        if noise is not None:
+            low, high = noise
+            v_values = v_values * np.array([rng.uniform(low, high) for _ in bidders], dtype=np.float64)
+
+        if bid_sink is not None:
+            for country, v_value, is_accepted in zip(bidders, v_values.tolist(), accepted.tolist()):
+                bid_sink(BidEvaluated(cluster_info.name, batch_num, country.name, v_value, is_accepted))
+
+        top, num_bids = top_two_bids(v_values, accepted)
+        if stats is not None:
+            bidding_done = perf_counter()
+        if not num_bids:
+            if bid_sink is not None:
+                bid_sink(NoBids(cluster_info.name, batch_num))
+            if stats is not None:
+                stats.record_batch(resource_name, cluster_info.name, OUTCOME_NO_BIDS, bidding_done - batch_start,
+                                   len(bidders), 0, bidding_time=bidding_done - batch_start)
+            continue
+
+        winner_bid_v_value, winner = float(v_values[top[0]]), bidders[top[0]]
+
+        price_per_unit = base_price if num_bids == 1 else float(v_values[top[1]])
+        total_cost = price_per_unit * quantity
+
+        if bid_sink is not None:
+            bid_sink(WinnerChosen(cluster_info.name, batch_num, winner.name, winner_bid_v_value, price_per_unit, num_bids))
+
+        if winner.budget < total_cost:
+            if sink is not None:
+                sink(BudgetFailed(cluster_info.name, batch_num, winner.name, winner.budget, total_cost))
+            if stats is not None:
+                batch_end = perf_counter()
+                stats.record_batch(resource_name, cluster_info.name, OUTCOME_BUDGET_FAILED, batch_end - batch_start,
+                                   len(bidders), num_bids, bidding_time=bidding_done - batch_start,
+                                   settlement_time=batch_end - bidding_done)
+            continue
+
+        if sink is not None:
+            seller_state_before = get_country_state(seller, resource_name)
+            winner_state_before = get_country_state(winner, resource_name)
+
+        _transfer(seller, seller_resource, winner, resource_name, resource_unit, quantity, total_cost,
+                  cluster_info, demand_decay, surplus_index, sales=sales)
+        live_auction_stock -= quantity
+
+        if sink is not None:
+            sink(Settlement(
+                auction_id=auction_id,
+                timestamp=clock(),
+                cluster_name=cluster_info.name,
+                batch_num=batch_num,
+                quantity=quantity,
+                resource_name=resource_name,
+                seller_name=seller.name,
+                winner_name=winner.name,
+                price_per_unit=price_per_unit,
+                total_cost=total_cost,
+                seller_before=seller_state_before,
+                seller_after=get_country_state(seller, resource_name),
+                winner_before=winner_state_before,
+                winner_after=get_country_state(winner, resource_name),
+                live_auction_stock=live_auction_stock
+            ))
+
+        if stats is not None:
+            batch_end = perf_counter()
+            stats.record_batch(resource_name, cluster_info.name, OUTCOME_SETTLED, batch_end - batch_start,
+                               len(bidders), num_bids, bidding_time=bidding_done - batch_start,
+                               settlement_time=batch_end - bidding_done)
+
+        if live_auction_stock < epsilon:
+            break
+
+    return live_auction_stock
+
+
+class _EventBuffer(list):
+    """Holds a cluster's events until reconciliation; passes on the target sink's `bid_events`."""
+
+    def __init__(self, bid_events: bool):
+        super().__init__()
+        self.bid_events = bid_events
+
+    def __call__(self, event) -> None:
+        self.append(event)
+
+
+def _clear_clusters_concurrently(
+    executor: Executor,
+    clear_cluster: Callable[..., float],
+    clusters: List[ClusterInfo],
+    schedules,
+    seller: Country,
+    seller_resource: Resource,
+    resource_name: str,
+    resource_unit: str,
+    base_price: float,
+    laplace: LaplaceParams,
+    total_quantity: float,
+    auction_id: Optional[int],
+    sink: Optional[EventSink],
+    noise: Optional[Tuple[float, float]],
+    demand_decay: Optional[float],
+    rng,
+    clock: Callable[[], datetime],
+    surplus_index: Optional[SurplusIndex],
+    stats: Optional[SimulationStats]
+) -> float:
+    """
+    Clears every cluster on `executor` at once, then reconciles the results
+    in cluster order.
+
+    Clusters have disjoint bidders; what they share is the seller and the
+    auction stock. The stock is reserved up front, in cluster order: each
+    cluster's batches add up to its planned `auction_quantity`, and it clears
+    against the stock that earlier clusters haven't reserved, so no cluster
+    can sell into another one's share. Clusters only settle the winners'
+    side of their sales, and buffer their events and stats. Once all
+    clusters are done the seller's side of every sale is applied, and the
+    buffered events are passed on, in the order the sequential loop would
+    produce them; settlements get the seller's state, the auction stock and
+    a timestamp as they are at that point, so the log stays in time order.
+
+    Results only depend on `rng`, not on scheduling: with noise each cluster
+    gets its own `random.Random` seeded from `rng` in cluster order. Without
+    noise the outcome is the one of the sequential loop, except that the
+    last cluster may skip batches below the stock tolerance (1e-9) that the
+    loop would still sell out of stock left unsold by earlier clusters.
+
+    Experimental: per-cluster clearing is Python code holding the GIL, so on
+    a thread pool the clusters take turns and the auction is not faster
+    than the sequential loop (the handoffs usually make it slower).
+
+    Returns:
+        The remaining auction stock.
+    """
+    epsilon = 1e-9
+
+    # Stock each cluster may clear against: all of it minus the earlier clusters' shares
+    available = []
+    unreserved = total_quantity
+    for schedule in schedules:
+        available.append(unreserved)
+        unreserved = max(0.0, unreserved - schedule.auction_quantity)
+
+    if noise is not None:
+        cluster_rngs = [random.Random(rng.getrandbits(64)) for _ in clusters]
+    else:
+        cluster_rngs = [rng] * len(clusters)
+
+    def clear(cluster_info: ClusterInfo, schedule, stock: float, cluster_rng):
+        events = _EventBuffer(wants_bid_events(sink)) if sink is not None else None
+        sales: List[Tuple[Country, float, float]] = []
+        cluster_stats = SimulationStats() if stats is not None else None
+        clear_cluster(
+            cluster_info, schedule, seller, seller_resource, resource_name, resource_unit, base_price, laplace,
+            stock, auction_id, events, noise, demand_decay,
+            cluster_rng, clock, None, cluster_stats, sales
+        )
+        return events, sales, cluster_stats
+
+    futures = [
+        executor.submit(clear, cluster_info, schedule, stock, cluster_rng)
+        for cluster_info, schedule, stock, cluster_rng in zip(clusters, schedules, available, cluster_rngs)
+    ]
+    results = [future.result() for future in futures]
+
+    live_auction_stock = total_quantity
+    for cluster_info, schedule, (events, sales, cluster_stats) in zip(clusters, schedules, results):
+        if cluster_stats is not None:
+            stats.merge(cluster_stats)
+
+        if sink is None:
+            for winner, quantity, total_cost in sales:
+                _settle_seller(seller, seller_resource, resource_name, quantity, total_cost, surplus_index)
+                if surplus_index is not None:
+                    surplus_index.update(winner, resource_name)
+                live_auction_stock -= quantity
+        else:
+            sink(ClusterStarted(cluster_info.name, schedule.num_batches))
+            pending_sales = iter(sales)
+            for event in events:
+                if isinstance(event, Settlement):
+                    winner, quantity, total_cost = next(pending_sales)
+                    event.seller_before = get_country_state(seller, resource_name)
+                    _settle_seller(seller, seller_resource, resource_name, quantity, total_cost, surplus_index)
+                    if surplus_index is not None:
+                        surplus_index.update(winner, resource_name)
+                    live_auction_stock -= quantity
+                    event.seller_after = get_country_state(seller, resource_name)
+                    event.live_auction_stock = live_auction_stock
+                    event.timestamp = clock()
+                sink(event)
+
+        if live_auction_stock < epsilon:
+            break
+
+    return live_auction_stock
+
+
+def simulate_auction(
+    world: World,
+    seller: Country,
+    resource_name: str,
+    total_quantity: float,
+    base_price: float,
+    auction_id: Optional[int] = None,
+    sink: Optional[EventSink] = None,
+    noise: Optional[Tuple[float, float]] = None,
+    demand_decay: Optional[float] = None,
+    rng=random,
+    clock: Callable[[], datetime] = datetime.now,
+    surplus_index: Optional[SurplusIndex] = None,
+    stats: Optional[SimulationStats] = None,
+    clearing: ClearingMode = ClearingMode.BATCHES,
+    executor: Optional[Executor] = None,
+    laplace: LaplaceParams = LaplaceParams()
+) -> float:
+    """
+    Core of the Vickrey (second-price) batch auction.
+
+    Mutates budgets and resources of the seller and winners, and reports
+    every step as a typed event (see `auction_events.py`) to `sink`.
+    With no sink attached no event objects are built at all, and the per-bid
+    events are skipped for sinks that don't want them (`wants_bid_events`).
+
+    Args:
+        world: The world to auction in; `seller` must be one of its countries.
+        auction_id: Id copied into the events (used by the CSV log).
+        sink: Callable receiving each event, e.g. `PrintSink()` or `CsvRowSink()`.
+        noise: Optional (low, high) range; each bid value is multiplied by
+            `rng.uniform(low, high)`. Acceptance is decided before the noise.
+        demand_decay: Optional factor applied to the winner's demand after each win.
+        rng: Source of randomness for the noise (default: the `random` module).
+        clock: Returns the timestamp of each settlement (default: `datetime.now`).
+        surplus_index: Optional `SurplusIndex` kept up to date for the seller
+            and every winner after each settlement.
+        stats: Optional `SimulationStats` collecting per-phase and per-batch
+            timings and counters. Without it no timings are taken.
+        clearing: `ClearingMode.BATCHES` (default) sells every cluster batch by
+            batch; `ClearingMode.UNIFORM` clears all batches of a cluster at
+            once at a uniform price (see `_clear_cluster_uniform`).
+        executor: Optional thread pool; the clusters are then cleared
+            concurrently on it (see `_clear_clusters_concurrently`).
+            Experimental: clearing is GIL-bound, so this doesn't lower latency.
+        laplace: Shape of the competitors' bid curve (default: `k=0.4`, `min_b=1`).
+
+    Returns:
+        The quantity sold.
+    """
+    clusters = world.clusters
+    if stats is not None:
+        auction_start = perf_counter()
+
     seller_resource = seller.get_resource(resource_name)
+    resource_unit = seller_resource.unit if seller_resource else "unknown"
+
+    if sink is not None:
+        sink(AuctionStarted(auction_id, seller.name, resource_name, resource_unit, total_quantity, base_price))
 
     if not seller_resource or seller_resource.amount < total_quantity:
-        print(f"\nSIMULATION FAILED: Seller does not have enough {resource_name} to auction.")
-        print(f"  Has: {seller_resource.amount if seller_resource else 0}, Needs: {total_quantity}")
-        return
+        if sink is not None:
+            sink(AuctionRejected(auction_id, seller.name, resource_name, total_quantity,
+                                 seller_resource.amount if seller_resource else 0))
+        if stats is not None:
+            stats.record_auction(resource_name, perf_counter() - auction_start, rejected=True)
+        return 0.0
 
-    resource_unit = seller_resource.unit
-    
-    print("\n[Phase 1: Calculating proportional distribution...]")
-    total_countries_in_world = sum(cluster_enum.value.country_count for cluster_enum in CountryClusters)
-    print(f"  Total countries in all clusters: {total_countries_in_world}")
-    print(f"  Distributing {total_quantity} units proportionally.")
+    total_countries_in_world = world.total_country_count
 
-    for cluster_enum in CountryClusters:
-        cluster_info = cluster_enum.value
-        cluster_info.assign_auction_quantity(total_quantity, total_countries_in_world, seller=seller)
-    
-    print("\n[Phase 2: Verifying batch assignments...]")
-    total_planned_quantity = 0.0
-    for cluster_enum in CountryClusters:
-        cluster_info = cluster_enum.value
-        print(f"  {cluster_info.name:<28}: Assigned {cluster_info.auction_quantity:6.2f} units (Batches: {cluster_info.get_num_batches()})")
-        total_planned_quantity += cluster_info.auction_quantity
-    print(f"  {'-'*28}: {'-'*6}")
-    print(f"  {'Total Planned Quantity':<28}: {total_planned_quantity:6.2f} (Should match {total_quantity})")
+    schedules = [
+        cluster_info.plan_batches(total_quantity, total_countries_in_world, seller=seller)
+        for cluster_info in clusters
+    ]
 
+    if stats is not None:
+        planned = perf_counter()
+        stats.record_phase(PHASE_DISTRIBUTION, planned - auction_start)
 
-    print("\n" + "="*70)
-    print("STARTING BATCH AUCTIONS")
-    print("="*70)
+    if sink is not None:
+        sink(BatchPlanned(total_countries_in_world, total_quantity, [
+            ClusterPlan(schedule.cluster_name, schedule.auction_quantity, schedule.num_batches)
+            for schedule in schedules
+        ]))
+
+    if stats is not None:
+        stats.record_phase(PHASE_VERIFICATION, perf_counter() - planned)
 
     live_auction_stock = total_quantity
+    epsilon = 1e-9
 
-    for cluster_enum in CountryClusters:
-        cluster_info = cluster_enum.value
-        print(f"\n--- Processing Cluster: {cluster_info.name} ---")
-        
-        sorted_batch_nums = sorted(cluster_info.auction_batches.keys())
-        if not sorted_batch_nums:
-            print("  No batches to process for this cluster.")
-            continue
+    clear_cluster = _clear_cluster_uniform if clearing == ClearingMode.UNIFORM else _clear_cluster_batches
 
-        for batch_num in sorted_batch_nums:
-            quantity = cluster_info.get_batch_quantity(batch_num)
-            
-            if quantity is None or quantity == 0:
-                continue 
-            
-            print(f"\n  --- Batch {batch_num} | Quantity: {quantity:.2f} {resource_unit} ---")
+    if executor is not None:
+        live_auction_stock = _clear_clusters_concurrently(
+            executor, clear_cluster, clusters, schedules, seller, seller_resource, resource_name, resource_unit,
+            base_price, laplace, total_quantity, auction_id, sink, noise, demand_decay, rng, clock, surplus_index, stats
+        )
+    else:
+        for cluster_info, schedule in zip(clusters, schedules):
+            if sink is not None:
+                sink(ClusterStarted(cluster_info.name, schedule.num_batches))
 
-            epsilon = 1e-9
-            if live_auction_stock < (quantity - epsilon):
-                print(f"  SELLER STOCK LOW: Not enough auction stock for this batch (Needs: {quantity:.2f}, Has: {live_auction_stock:.2f}).")
-                print(f"  AUCTION FOR {cluster_info.name} ENDED.")
-                break 
-            
-            bids = [] 
-            for country in cluster_info.countries:
-            
-                if country.name == seller.name:
-                    continue
-                    
-                demand_res = country.get_demand(resource_name)
-                if not demand_res or demand_res.amount <= 0:
-                    continue
-                    
-                supply_res = country.get_resource(resource_name)
-                supply = supply_res.amount if supply_res else 0.0
-                demand = demand_res.amount
-                
-                v_value, accepted = AuctionManager.laplace(
-                    base_price=base_price,
-                    supply=supply,
-                    demand=demand,
-                    quantity=quantity
-                )
-                
-                if accepted:
-                    print(f"    {country.name:<13}: Bid ACCEPTED (v_value: ${v_value:.4f}B)")
-                    bids.append((v_value, country))
-                else:
-                    print(f"    {country.name:<13}: Bid REJECTED (v_value: ${v_value:.4f}B)")
-            
-            if not bids:
-                print("    RESULT: No bids for this batch.")
-                continue 
-                
-            bids.sort(key=lambda x: x[0], reverse=True)
-            
-            winner_bid_v_value, winner = bids[0]
-            
-            price_per_unit = 0.0
-            
-            if len(bids) == 1:
-                print(f"    RESULT: Only one bidder ({winner.name}).")
-                price_per_unit = base_price
-                print(f"    Winner pays reserve (base) price.")
-            else:
-                second_highest_v_value = bids[1][0]
-                price_per_unit = second_highest_v_value
-                print(f"    RESULT: {len(bids)} bidders.")
-                print(f"    Winner: {winner.name:<13} (Bid Value: ${winner_bid_v_value:.4f}B)")
-                print(f"    Winner Pays (2nd Price): ${price_per_unit:.4f}B per unit")
-            
-            total_cost = price_per_unit * quantity
-            
-            if winner.budget < total_cost:
-                print(f"    WINNER {winner.name} FAILED: Insufficient budget.")
-                print(f"      Budget: ${winner.budget:.2f}B, Cost: ${total_cost:.2f}B")
-                continue 
-                
-            print(f"    TRANSACTION:")
-            print(f"      {winner.name:<13} pays ${total_cost:.2f}B")
-            print(f"      {seller.name:<13} receives ${total_cost:.2f}B")
+            live_auction_stock = clear_cluster(
+                cluster_info, schedule, seller, seller_resource, resource_name, resource_unit, base_price, laplace,
+                live_auction_stock, auction_id, sink, noise, demand_decay, rng, clock, surplus_index, stats
+            )
 
-            winner.budget -= total_cost
-            seller.budget += total_cost
-            
-            seller_resource.amount -= quantity
-            live_auction_stock -= quantity 
-            
-            winner_resource = winner.get_resource(resource_name)
-            if winner_resource:
-                winner_resource.amount += quantity
-            else:
-                winner.resources[resource_name] = Resource(amount=quantity, unit=resource_unit)
-            
-            print(f"    New Balances:")
-            print(f"      {winner.name:<13}: Budget ${winner.budget:6.2f}B, {resource_name}: {winner.get_resource(resource_name).amount:.2f}")
-            print(f"      {seller.name:<13}: Budget ${seller.budget:6.2f}B, {resource_name}: {seller_resource.amount:.2f}")
-            print(f"      (Auction Stock Remaining: {live_auction_stock:.2f})")
-            
             if live_auction_stock < epsilon:
-                print(f"\n*** AUCTION ENDED: Total planned quantity ({total_quantity}) has been sold. ***")
-                break 
-        
-        if live_auction_stock < epsilon:
-            break # Stop 
+                break
 
-    print("\n" + "="*70)
-    print("SIMULATION COMPLETE")
-    print("="*70)
+    if sink is not None:
+        sink(AuctionCompleted(auction_id, total_quantity, total_quantity - live_auction_stock, live_auction_stock < epsilon))
+
+    if stats is not None:
+        stats.record_auction(resource_name, perf_counter() - auction_start)
+
+    return total_quantity - live_auction_stock
+
+
+def run_simulation(world: World, seller: Country, resource_name: str, total_quantity: float, base_price: float,
+                   stats: Optional[SimulationStats] = None, clearing: ClearingMode = ClearingMode.BATCHES):
+    """
+    Runs the full Vickrey (second-price) auction simulation and prints a
+    step-by-step report.
+    
+    This function uses helper methods from all other files:
+    - `world.py`: To loop through the world's clusters.
+    - `cluster.py`: To call `plan_batches` which calculates batches (n-1 rule).
+    - `country.py`: To call `get_resource`/`get_demand` and update `budget`/`resources`.
+    - `auction_manager.py`: To call `laplace` for bid decisions.
+    """
+    simulate_auction(world, seller, resource_name, total_quantity, base_price, sink=PrintSink(), stats=stats,
+                     clearing=clearing)
 
 
 def run_bidding_simulation(
+    world: World,
     bidder_country: Country,
     seller_country: Country,
     resource_name: str,
@@ -225,7 +822,14 @@ def run_bidding_simulation(
     """
     Interactive bidding simulation where YOU are the bidder.
     This is a "dry run" and does not affect the simulation state.
+    
+    A console front-end to `BiddingSession` (see `bidding_session.py`),
+    which the API drives over HTTP instead.
     """
+    try:
+        from .bidding_session import start_bidding_session, ACTION_BID, ACTION_BELOW_BASE, ACTION_OVER_BUDGET
+    except ImportError:
+        from bidding_session import start_bidding_session, ACTION_BID, ACTION_BELOW_BASE, ACTION_OVER_BUDGET
     
     print("\n" + "="*70)
     print(f"INTERACTIVE BIDDING SIMULATION - YOU ARE {bidder_country.name.upper()}")
@@ -236,11 +840,7 @@ def run_bidding_simulation(
     print(f"Base Price: ${base_price:.4f}B per unit")
     print(f"Your Budget: ${bidder_country.budget:.2f}B")
     
-    bidder_cluster = None
-    for cluster_enum in CountryClusters:
-        if bidder_country in cluster_enum.value.countries:
-            bidder_cluster = cluster_enum.value
-            break
+    bidder_cluster = world.get_cluster(bidder_country)
     
     if not bidder_cluster:
         print(f"\nERROR: {bidder_country.name} not found in any cluster.")
@@ -258,83 +858,40 @@ def run_bidding_simulation(
     your_demand_res = bidder_country.get_demand(resource_name)
     if not your_demand_res:
         print(f"\nWARNING: You have no demand for {resource_name}")
-        your_demand = 0.0
     else:
-        your_demand = your_demand_res.amount
-        print(f"Your Demand: {your_demand:.2f} {resource_unit}")
+        print(f"Your Demand: {your_demand_res.amount:.2f} {resource_unit}")
     
     your_supply_res = bidder_country.get_resource(resource_name)
     your_supply = your_supply_res.amount if your_supply_res else 0.0
     print(f"Your Supply: {your_supply:.2f} {resource_unit}")
     
-    total_countries_in_world = sum(cluster_enum.value.country_count for cluster_enum in CountryClusters)
-    
-    for cluster_enum in CountryClusters:
-        cluster_info = cluster_enum.value
-        cluster_info.assign_auction_quantity(total_quantity, total_countries_in_world, seller=seller_country)
+    session = start_bidding_session(world, bidder_country, seller_country, resource_name, total_quantity, base_price)
+    non_bidders = [
+        country.name for country in bidder_cluster.countries
+        if country.name not in (seller_country.name, bidder_country.name)
+        and country.name not in session.competitor_names
+    ]
     
     print("\n" + "="*70)
     print("STARTING BIDDING ROUNDS")
     print("="*70)
     
-    continue_bidding = True
-    winning_prices_summary = {}
-    your_wins = []
-    
-    sorted_batch_nums = sorted(bidder_cluster.auction_batches.keys())
-    
-    for batch_num in sorted_batch_nums:
-        if not continue_bidding:
-            print(f"\nYou chose to stop bidding. Remaining batches will be skipped.")
+    while True:
+        quote = session.current_quote()
+        if quote is None:
             break
-        
-        quantity = bidder_cluster.get_batch_quantity(batch_num)
-        
-        if quantity is None or quantity == 0:
-            continue
+        batch_num, quantity = quote.batch_num, quote.quantity
         
         print(f"\n{'='*70}")
         print(f"ROUND {batch_num} - Batch Quantity: {quantity:.2f} {resource_unit}")
         print(f"{'='*70}")
         
         print(f"\nOther bidders in your cluster:")
-        all_other_bids = []
-        
-        for country in bidder_cluster.countries:
-            if country.name == seller_country.name:
-                continue  
-            
-            if country.name == bidder_country.name:
-                continue  
-            
-            demand_res = country.get_demand(resource_name)
-            if not demand_res or demand_res.amount <= 0:
-                print(f"  {country.name:<15}: No demand, skipping")
-                continue
-            
-            supply_res = country.get_resource(resource_name)
-            supply = supply_res.amount if supply_res else 0.0
-            demand = demand_res.amount
-            
-            v_value, accepted = AuctionManager.laplace(
-                base_price=base_price,
-                supply=supply,
-                demand=demand,
-                quantity=quantity
-            )
-            
-            if accepted:
-                print(f"  {country.name:<15}: Bid ${v_value:.4f}B per unit (ACCEPTED)")
-                all_other_bids.append((v_value, country))
-            else:
-                print(f"  {country.name:<15}: Bid ${v_value:.4f}B per unit (REJECTED)")
-        
-        your_laplace_bid, your_laplace_accepted = AuctionManager.laplace(
-            base_price=base_price,
-            supply=your_supply,
-            demand=your_demand,
-            quantity=quantity
-        )
+        for name in non_bidders:
+            print(f"  {name:<15}: No demand, skipping")
+        for competitor in quote.competitors:
+            verdict = "ACCEPTED" if competitor.accepted else "REJECTED"
+            print(f"  {competitor.country_name:<15}: Bid ${competitor.v_value:.4f}B per unit ({verdict})")
         
         print(f"\n{'='*70}")
         print(f"YOUR TURN TO BID")
@@ -343,129 +900,97 @@ def run_bidding_simulation(
         print(f"  Quantity: {quantity:.2f} {resource_unit}")
         print(f"  Base Price: ${base_price:.4f}B per unit")
         print(f"  Total Cost (if you pay base): ${base_price * quantity:.2f}B")
-        print(f"  Your Budget: ${bidder_country.budget:.2f}B")
-        print(f"  Your Suggested Bid (Laplace): ${your_laplace_bid:.4f}B per unit")
-        if your_laplace_accepted:
+        print(f"  Your Budget: ${session.budget:.2f}B")
+        print(f"  Your Suggested Bid (Laplace): ${quote.suggested_bid:.4f}B per unit")
+        if quote.suggested_accepted:
             print(f"    (This bid would be ACCEPTED)")
         else:
             print(f"    (This bid would be REJECTED - below base price)")
         
-        my_bid_price = 0.0
-        my_accepted = False
-        
         try:
             my_bid_price_str = input(f"\nEnter your bid for Batch {batch_num} (per unit in $B, or 'pass' to skip): ").strip()
             
             if my_bid_price_str.lower() == 'pass':
                 print(f"You passed on Batch {batch_num}.")
-                my_accepted = False
-                winning_prices_summary[f"Batch {batch_num}"] = "You PASSED"
+                result = session.pass_batch()
             else:
-                my_bid_price = float(my_bid_price_str)
-                
-                if my_bid_price < base_price:
-                    print(f" Your bid ${my_bid_price:.4f}B is BELOW base price (${base_price:.4f}B). Bid REJECTED.")
-                    my_accepted = False
-                    winning_prices_summary[f"Batch {batch_num}"] = "Your bid REJECTED (too low)"
+                result = session.submit_bid(float(my_bid_price_str))
+                if result.action == ACTION_BELOW_BASE:
+                    print(f" Your bid ${result.your_bid:.4f}B is BELOW base price (${base_price:.4f}B). Bid REJECTED.")
+                elif result.action == ACTION_OVER_BUDGET:
+                    print(f" Insufficient budget! Need ${result.your_bid * quantity:.2f}B, Have ${session.budget:.2f}B. Bid REJECTED.")
                 else:
-                    total_cost = my_bid_price * quantity
-                    if bidder_country.budget < total_cost:
-                        print(f" Insufficient budget! Need ${total_cost:.2f}B, Have ${bidder_country.budget:.2f}B. Bid REJECTED.")
-                        my_accepted = False
-                        winning_prices_summary[f"Batch {batch_num}"] = "Your bid REJECTED (insufficient budget)"
-                    else:
-                        print(f"✓ Your bid: ${my_bid_price:.4f}B per unit SUBMITTED.")
-                        my_accepted = True
+                    print(f"✓ Your bid: ${result.your_bid:.4f}B per unit SUBMITTED.")
         
         except ValueError:
             print(f"Invalid input. Assuming you 'pass' on Batch {batch_num}.")
-            my_accepted = False
-            winning_prices_summary[f"Batch {batch_num}"] = "Invalid input - PASSED"
+            result = session.pass_batch()
         except (EOFError, KeyboardInterrupt, RuntimeError):
-            print(f"(Input not available, using suggested bid: ${your_laplace_bid:.4f}B)")
-            my_bid_price = your_laplace_bid
-            my_accepted = your_laplace_accepted
-            if my_accepted:
-                 print(f"✓ Your bid: ${my_bid_price:.4f}B per unit SUBMITTED.")
+            print(f"(Input not available, using suggested bid: ${quote.suggested_bid:.4f}B)")
+            if quote.suggested_accepted:
+                result = session.submit_bid(quote.suggested_bid)
+            else:
+                result = session.pass_batch()
+            if result.action == ACTION_BID:
+                 print(f"✓ Your bid: ${result.your_bid:.4f}B per unit SUBMITTED.")
             else:
                  print(f" Your suggested bid was REJECTED.")
-
         
-        all_bids = all_other_bids.copy()
-        if my_accepted:
-            all_bids.append((my_bid_price, bidder_country))
+        my_accepted = result.action == ACTION_BID
         
-        if not all_bids:
+        if result.winner_name is None:
             print(f"\n RESULT: No valid bids for Batch {batch_num}. Batch not sold.")
-            winning_prices_summary[f"Batch {batch_num}"] = "No bids"
             continue
         
-        all_bids.sort(key=lambda x: x[0], reverse=True)
-        
-        winner_v_value, winner = all_bids[0]
-        
-        if len(all_bids) == 1:
-            price_per_unit = base_price
-        else:
-            price_per_unit = all_bids[1][0]  
-        
-        total_payment = price_per_unit * quantity
-        winning_prices_summary[f"Batch {batch_num}"] = f"${price_per_unit:.4f}B per unit"
-        
         print(f"\n{'='*70}")
-        if winner.name == bidder_country.name:
+        if result.you_won:
             print(f" YOU WON BATCH {batch_num}! ")
             print(f"{'='*70}")
-            print(f"Your Bid: ${my_bid_price:.4f}B per unit")
-            print(f"You Pay (2nd price): ${price_per_unit:.4f}B per unit")
-            print(f"Total Payment: ${total_payment:.2f}B")
+            print(f"Your Bid: ${result.your_bid:.4f}B per unit")
+            print(f"You Pay (2nd price): ${result.price_per_unit:.4f}B per unit")
+            print(f"Total Payment: ${result.total_payment:.2f}B")
             print(f"Quantity Received: {quantity:.2f} {resource_unit}")
-            print(f"Budget After: ${bidder_country.budget - total_payment:.2f}B") 
-            
-            your_wins.append({
-                'batch': batch_num,
-                'quantity': quantity,
-                'price_per_unit': price_per_unit,
-                'total_payment': total_payment
-            })
+            print(f"Budget After: ${session.budget - result.total_payment:.2f}B") 
             
             try:
                 choice = input(f"\nPress Enter to continue to next batch, or type 'exit' to stop: ").strip().lower()
                 if choice == 'exit':
-                    continue_bidding = False
+                    session.exit()
                     print(f"You chose to exit. Skipping remaining batches.")
             except (EOFError, KeyboardInterrupt, RuntimeError):
                 print(f"(Auto-continuing to next batch...)")
         else:
             print(f" YOU LOST BATCH {batch_num}")
             print(f"{'='*70}")
-            print(f"Winner: {winner.name}")
-            print(f"Winning Bid: ${winner_v_value:.4f}B per unit")
-            print(f"Price Paid: ${price_per_unit:.4f}B per unit")
+            print(f"Winner: {result.winner_name}")
+            print(f"Winning Bid: ${result.winning_bid:.4f}B per unit")
+            print(f"Price Paid: ${result.price_per_unit:.4f}B per unit")
             if my_accepted:
-                print(f"Your Bid: ${my_bid_price:.4f}B per unit")
+                print(f"Your Bid: ${result.your_bid:.4f}B per unit")
                 print(f"You were outbid!")
     
+    if session.remaining_batches:
+        print(f"\nYou chose to stop bidding. Remaining batches will be skipped.")
+    
     print("\n" + "="*70)
     print(f"BIDDING SIMULATION COMPLETE - {bidder_country.name.upper()}")
     print("="*70)
     
     print(f"\nFinal Prices for All Batches:")
-    for batch_name, price in winning_prices_summary.items():
-        print(f"  {batch_name}: {price}")
+    for result in session.results:
+        price = "No bids" if result.winner_name is None else f"${result.price_per_unit:.4f}B per unit"
+        print(f"  Batch {result.batch_num}: {price}")
     
+    your_wins = [result for result in session.results if result.you_won]
     if your_wins:
         print(f"\n YOUR WINS:")
-        total_spent = 0.0
-        total_quantity_won = 0.0
         for win in your_wins:
-            print(f"  Batch {win['batch']}: {win['quantity']:.2f} {resource_unit} for ${win['total_payment']:.2f}B")
-            total_spent += win['total_payment']
-            total_quantity_won += win['quantity']
-        print(f"\n  Total Won: {total_quantity_won:.2f} {resource_unit}")
-        print(f"  Total Spent: ${total_spent:.2f}B")
-        if total_quantity_won > 0:
-             print(f"  Average Price: ${total_spent / total_quantity_won:.4f}B per unit")
+            print(f"  Batch {win.batch_num}: {win.quantity:.2f} {resource_unit} for ${win.total_payment:.2f}B")
+        summary = session.summary()
+        print(f"\n  Total Won: {summary['total_quantity_won']:.2f} {resource_unit}")
+        print(f"  Total Spent: ${summary['total_spent']:.2f}B")
+        if summary['average_price'] is not None:
+             print(f"  Average Price: ${summary['average_price']:.4f}B per unit")
     else:
         print(f"\n You did not win any batches.")
     
@@ -484,10 +1009,59 @@ def get_country_state(country: Country, resource_name: str) -> Dict:
     }
 
 
+def pick_random_auction(countries: List[Country], rng=random, skip_name: Optional[str] = None,
+                        sell_range: Tuple[float, float] = (0.09, 0.11),
+                        surplus_index: Optional[SurplusIndex] = None) -> Optional[Tuple[Country, str, float]]:
+    """
+    Picks a random seller, one of its surplus resources and a quantity to sell,
+    the way the live auction loop does. With a `surplus_index` the seller's
+    exports are read from the index instead of re-analysing the country.
+    
+    Returns:
+        (seller, resource_name, quantity), or None if this draw yields no auction
+    """
+    random_country = rng.choice(countries)
+    
+    if random_country.name == skip_name:
+        return None
+    
+    # Sorted so that a seeded rng picks the same resource regardless of set ordering
+    if surplus_index is not None:
+        exportable_resources = surplus_index.get_export_resources(random_country.name)
+    else:
+        exportable_resources = sorted(random_country.get_export_resources())
+    
+    if not exportable_resources:
+        return None
+    
+    random_resource_name = rng.choice(exportable_resources)
+    random_resource = random_country.get_resource(random_resource_name)
+    
+    sell_quantity = random_resource.amount * rng.uniform(*sell_range)
+    
+    if sell_quantity < 0.01:
+        return None
+    
+    return random_country, random_resource_name, sell_quantity
+
+
 def random_auction_loop_with_logging(
     logged_in_country_name: str = "Japan", 
     base_price: float = 0.5,
-    log_file: str = "auction_simulation_log.csv"
+    log_file: str = "auction_simulation_log.csv",
+    seed: Optional[int] = None,
+    scheduler: Optional[TickScheduler] = None,
+    max_auctions: Optional[int] = None,
+    logger: Optional[TransactionLogger] = None,
+    world: Optional[World] = None,
+    checkpoints: Optional[CheckpointManager] = None,
+    resume: bool = False,
+    stats: Optional[SimulationStats] = None,
+    sink: Optional[EventSink] = None,
+    stop: Optional[threading.Event] = None,
+    clearing: ClearingMode = ClearingMode.BATCHES,
+    cluster_workers: Optional[int] = None,
+    world_lock: Optional[threading.Lock] = None
 ):
     """
     Infinite loop that randomly picks countries to auction their resources.
@@ -497,11 +1071,45 @@ def random_auction_loop_with_logging(
         logged_in_country_name: Name of the country that's logged in (will be skipped)
         base_price: Base price for all auctions (default: 0.5B per unit)
         log_file: Path to the CSV log file (default: "auction_simulation_log.csv")
+        seed: Optional seed for a private RNG, making the run reproducible
+        scheduler: Paces the loop and stamps the rows (default: 1 auction per second)
+        max_auctions: Stop after this many auction ids (default: run until Ctrl+C)
+        logger: Buffered writer for the rows (default: a `TransactionLogger` on `log_file`)
+        world: The world to run in (default: a fresh `World.from_country_data()`)
+        checkpoints: Optional `CheckpointManager` saving the world, auction counter
+            and RNG state periodically and when the loop stops
+        resume: Continue from the latest checkpoint of `checkpoints`, if there is one;
+            rows `logger` holds for auctions after it are dropped first
+        stats: Optional `SimulationStats` filled by every auction and reported at the end
+        sink: Optional extra event sink receiving every event of every auction,
+            e.g. to stream settlements to the API's WebSocket clients
+        stop: Optional event ending the loop (like Ctrl+C) once it is set,
+            for running the loop in a background thread
+        clearing: How each cluster's share is sold (see `ClearingMode`)
+        cluster_workers: Optional number of threads clearing the clusters of
+            each auction concurrently (see `_clear_clusters_concurrently`);
+            experimental, not faster than sequential clearing
+        world_lock: Optional lock held while an auction reads and changes
+            `world`, for worlds shared with other threads (e.g. the API's
+            bidding sessions)
     """
     
-    all_countries = []
-    for cluster_enum in CountryClusters:
-        all_countries.extend(cluster_enum.value.countries)
+    rng = random.Random(seed) if seed is not None else random
+    if scheduler is None:
+        scheduler = TickScheduler.paced(1.0)
+    
+    if world is None:
+        world = World.from_country_data()
+    
+    auction_count = 0
+    if resume and checkpoints is not None:
+        checkpoint = checkpoints.load_latest()
+        if checkpoint is not None:
+            checkpoint.restore(world, rng)
+            auction_count = checkpoint.auction_count
+    
+    all_countries = world.all_countries()
+    surplus_index = SurplusIndex.from_countries(all_countries)
     
     print("="*70)
     print("RANDOM AUCTION LOOP - INFINITE SIMULATION WITH CSV LOGGING")
@@ -510,226 +1118,194 @@ def random_auction_loop_with_logging(
     print(f"Total countries in pool: {len(all_countries)}")
     print(f"Base price for all auctions: ${base_price}B per unit")
     print(f"Logging to: {log_file}")
+    print(f"Pacing: {scheduler.mode.value}" + (f" @ {scheduler.rate} auctions/s" if scheduler.mode != SchedulerMode.FAST else ""))
+    if auction_count:
+        print(f"Resumed from checkpoint at auction #{auction_count}")
     print("\nStarting infinite auction loop... (Press Ctrl+C to stop)\n")
     
-    csv_headers = [
-        "auction_id", "timestamp", "cluster_name", "batch_num", "quantity_sold", "resource_name",
-        "seller_name", "winner_name", "winning_price_per_unit", "total_cost",
-        "seller_budget_before", "seller_budget_after",
-        "seller_supply_before", "seller_supply_after",
-        "winner_budget_before", "winner_budget_after",
-        "winner_supply_before", "winner_supply_after",
-        "winner_demand_before", "winner_demand_after"
-    ]
+    if logger is None:
+        logger = TransactionLogger(log_file)
     
     try:
-        with open(log_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=csv_headers)
-            writer.writeheader()
-        print(f"✓ CSV file created: {log_file}\n")
+        if resume and checkpoints is not None:
+            # Rows of auctions after the checkpoint would be logged again by the resumed run
+            dropped = logger.truncate_after(auction_count)
+            if dropped:
+                print(f"Dropped {dropped} logged rows of auctions after #{auction_count}")
+        logger.open()
+        print(f"✓ Log file created: {logger.path}\n")
     except IOError as e:
         print(f"[ERROR] Could not create CSV file: {e}. Exiting.")
         return
-
-    auction_count = 0
     
+    executor = ThreadPoolExecutor(cluster_workers, thread_name_prefix="cluster") if cluster_workers else None
+
+    started_at = auction_count
     try:
-        while True:
+        while max_auctions is None or auction_count - started_at < max_auctions:
+            if stop is not None and stop.is_set():
+                break
             auction_count += 1
             
-            random_country = random.choice(all_countries)
-            
-            if random_country.name == logged_in_country_name:
-                continue
-            
-            exportable_resources = random_country.get_export_resources()
-            
-            if not exportable_resources:
-                continue
-            
-            random_resource_name = random.choice(exportable_resources)
-            random_resource = random_country.get_resource(random_resource_name)
-            print(random_resource)
-            
-            sell_percentage = random.uniform(0.09, 0.11)
-            sell_quantity = random_resource.amount * sell_percentage
-            
-            if sell_quantity < 0.01:
-                continue
-            
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] Auction #{auction_count}: {random_country.name} selling {sell_quantity:.2f} {random_resource.unit} of {random_resource_name}")
-            
-            transaction_rows = run_auction_and_capture_data(
-                auction_id=auction_count,
-                seller=random_country,
-                resource_name=random_resource_name,
-                total_quantity=sell_quantity,
-                base_price=base_price
-            )
+            with world_lock if world_lock is not None else nullcontext():
+                picked = pick_random_auction(all_countries, rng, skip_name=logged_in_country_name, surplus_index=surplus_index)
+                if picked is None:
+                    continue
+                
+                random_country, random_resource_name, sell_quantity = picked
+                random_resource = random_country.get_resource(random_resource_name)
+                print(random_resource)
+                
+                print(f"[{scheduler.now().strftime('%H:%M:%S')}] Auction #{auction_count}: {random_country.name} selling {sell_quantity:.2f} {random_resource.unit} of {random_resource_name}")
+                
+                transaction_rows = run_auction_and_capture_data(
+                    world,
+                    auction_id=auction_count,
+                    seller=random_country,
+                    resource_name=random_resource_name,
+                    total_quantity=sell_quantity,
+                    base_price=base_price,
+                    rng=rng,
+                    clock=scheduler.now,
+                    surplus_index=surplus_index,
+                    stats=stats,
+                    sink=sink,
+                    clearing=clearing,
+                    executor=executor
+                )
             
-            if transaction_rows:
-                try:
-                    with open(log_file, 'a', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=csv_headers)
-                        writer.writerows(transaction_rows)
-                    
+            try:
+                logger.write_rows(transaction_rows)
+            except IOError as e:
+                print(f"  → [ERROR] Could not write to CSV: {e}\n")
+            else:
+                if transaction_rows:
                     total_profit = sum(row['total_cost'] for row in transaction_rows)
                     print(f"  → Profit: ${total_profit:.2f}B | Transactions: {len(transaction_rows)} | Logged to CSV\n")
-                except IOError as e:
-                    print(f"  → [ERROR] Could not write to CSV: {e}\n")
 
-            time.sleep(1)  
+            if checkpoints is not None and checkpoints.due(auction_count):
+                # Rows of the auctions covered by the checkpoint must be on disk first
+                logger.flush()
+                checkpoints.save(world, auction_count, rng)
+
+            scheduler.tick()
             
     except KeyboardInterrupt:
         print("\n\n" + "="*70)
         print("SIMULATION STOPPED BY USER")
         print("="*70)
-        print(f"Total auctions created: {auction_count}")
-        print(f"Log saved to: {log_file}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        logger.close()
+        if checkpoints is not None:
+            checkpoints.save(world, auction_count, rng)
+    
+    print(f"Total auctions created: {auction_count}")
+    print(f"Throughput: {scheduler.throughput():.2f} auctions/s over {scheduler.elapsed:.2f}s")
+    print(f"Log saved to: {logger.path}" + (f" (+ {len(logger.segments)} rotated segments)" if logger.segments else ""))
+    if checkpoints is not None:
+        print(f"Checkpoints: {checkpoints.saved} written to {checkpoints.directory}")
+    if stats is not None:
+        print("\n" + "="*70)
+        stats.report()
 
 
-def run_auction_and_capture_data(auction_id: int, seller: Country, resource_name: str, total_quantity: float, base_price: float) -> List[Dict]:
+def run_auction_and_capture_data(world: World, auction_id: int, seller: Country, resource_name: str, total_quantity: float,
+                                 base_price: float, rng=random,
+                                 clock: Callable[[], datetime] = datetime.now,
+                                 surplus_index: Optional[SurplusIndex] = None,
+                                 stats: Optional[SimulationStats] = None,
+                                 sink: Optional[EventSink] = None,
+                                 clearing: ClearingMode = ClearingMode.BATCHES,
+                                 executor: Optional[Executor] = None,
+                                 noise: Optional[Tuple[float, float]] = BID_NOISE,
+                                 laplace: LaplaceParams = LaplaceParams()) -> List[Dict]:
     """
     Runs the auction simulation and captures detailed "before/after" data
-    for every successful transaction. Suppresses console output.
+    for every successful transaction. Nothing is printed.
     Returns a list of dictionaries, ready for the CSV writer.
+    Every event is also passed to `sink`, if one is given; without one the
+    per-bid events aren't built.
+    `noise` and `laplace` default to the live loop's settings; see
+    `parameter_sweep.py` for calibrating them.
     """
-    
-    old_stdout = sys.stdout
-    sys.stdout = io.StringIO()
-    
-    transaction_log_rows = []
-    
-    seller_resource = seller.get_resource(resource_name)
-    
-    if not seller_resource or seller_resource.amount < total_quantity:
-        sys.stdout = old_stdout 
-        return [] 
-    
-    resource_unit = seller_resource.unit
-    
-    
-    total_countries_in_world = sum(cluster_enum.value.country_count for cluster_enum in CountryClusters)
-    
-    for cluster_enum in CountryClusters:
-        cluster_info = cluster_enum.value
-        cluster_info.assign_auction_quantity(total_quantity, total_countries_in_world, seller=seller)
-    
-    live_auction_stock = total_quantity
-    epsilon = 1e-9
-    
-    try:
-        for cluster_enum in CountryClusters:
-            cluster_info = cluster_enum.value
-            
-            sorted_batch_nums = sorted(cluster_info.auction_batches.keys())
-            if not sorted_batch_nums:
-                continue
-            
-            for batch_num in sorted_batch_nums:
-                quantity = cluster_info.get_batch_quantity(batch_num)
-                
-                if quantity is None or quantity == 0:
-                    continue
-                                
-                if live_auction_stock < (quantity - epsilon):
-                    break
-                
-                bids = []
-                for country in cluster_info.countries:
-                    if country.name == seller.name:
-                        continue
-                    
-                    demand_res = country.get_demand(resource_name)
-                    if not demand_res or demand_res.amount <= 0:
-                        continue
-                    
-                    supply_res = country.get_resource(resource_name)
-                    supply = supply_res.amount if supply_res else 0.0
-                    demand = demand_res.amount
-                    
-                    v_value, accepted = AuctionManager.laplace(
-                        base_price=base_price,
-                        supply=supply,
-                        demand=demand,
-                        quantity=quantity
-                    )
-                    
-                    noise = random.uniform(0.97, 1.03)
-                    v_value = v_value * noise
-                    
-                    if accepted:
-                        bids.append((v_value, country))
-                
-                if not bids:
-                    continue
-                
-                bids.sort(key=lambda x: x[0], reverse=True)
-                winner_bid_v_value, winner = bids[0]
-                
-                price_per_unit = base_price if len(bids) == 1 else bids[1][0]
-                total_cost = price_per_unit * quantity
-                
-                if winner.budget < total_cost:
-                    continue
-                
-                seller_state_before = get_country_state(seller, resource_name)
-                winner_state_before = get_country_state(winner, resource_name)
-
-                winner.budget -= total_cost
-                seller.budget += total_cost
-                
-                seller_resource.amount -= quantity
-                live_auction_stock -= quantity
-                
-                winner_resource = winner.get_resource(resource_name)
-                if winner_resource:
-                    winner_resource.amount += quantity
-                else:
-                    winner.resources[resource_name] = Resource(amount=quantity, unit=resource_unit)
-                
-                winner_demand = winner.get_demand(resource_name)
-                if winner_demand:
-                    winner_demand.amount *= 0.5
-                
-                seller_state_after = get_country_state(seller, resource_name)
-                winner_state_after = get_country_state(winner, resource_name)
-
-                csv_row = {
-                    "auction_id": auction_id,
-                    "timestamp": datetime.now().isoformat(),
-                    "cluster_name": cluster_info.name,
-                    "batch_num": batch_num,
-                    "quantity_sold": quantity,
-                    "resource_name": resource_name,
-                    "seller_name": seller.name,
-                    "winner_name": winner.name,
-                    "winning_price_per_unit": price_per_unit,
-                    "total_cost": total_cost,
-                    "seller_budget_before": seller_state_before['budget'],
-                    "seller_budget_after": seller_state_after['budget'],
-                    "seller_supply_before": seller_state_before['supply'],
-                    "seller_supply_after": seller_state_after['supply'],
-                    "winner_budget_before": winner_state_before['budget'],
-                    "winner_budget_after": winner_state_after['budget'],
-                    "winner_supply_before": winner_state_before['supply'],
-                    "winner_supply_after": winner_state_after['supply'],
-                    "winner_demand_before": winner_state_before['demand'],
-                    "winner_demand_after": winner_state_after['demand']
-                }
-                transaction_log_rows.append(csv_row)
-                
-                if live_auction_stock < epsilon:
-                    break
-            
-            if live_auction_stock < epsilon:
-                break
-    
-    finally:
-        sys.stdout = old_stdout
-    
-    return transaction_log_rows
+    rows = CsvRowSink()
+    simulate_auction(
+        world, seller, resource_name, total_quantity, base_price,
+        auction_id=auction_id,
+        sink=rows if sink is None else MultiSink(rows, sink),
+        noise=noise,
+        demand_decay=DEMAND_DECAY,
+        rng=rng,
+        clock=clock,
+        surplus_index=surplus_index,
+        stats=stats,
+        clearing=clearing,
+        executor=executor,
+        laplace=laplace
+    )
+    return rows.rows
 
 
 if __name__ == '__main__':
-    random_auction_loop_with_logging()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the random live auction loop with CSV logging.")
+    parser.add_argument("--mode", choices=[m.value for m in SchedulerMode], default=SchedulerMode.PACED.value,
+                        help="paced: hold --rate; fast: no sleeping; simulated: virtual clock advancing 1/--rate s per auction")
+    parser.add_argument("--rate", type=float, default=1.0, help="Target auctions per second (default: 1)")
+    parser.add_argument("--max-auctions", type=int, default=None, help="Stop after this many auctions")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a reproducible run")
+    parser.add_argument("--log-file", default="auction_simulation_log.csv")
+    parser.add_argument("--max-log-bytes", type=int, default=None, help="Rotate the log once it grows past this size")
+    parser.add_argument("--log-format", choices=["csv", FORMAT_NPZ, FORMAT_ARROW], default="csv",
+                        help="csv, or a columnar binary log (npz chunk directory / arrow IPC stream)")
+    parser.add_argument("--log-flush-interval", type=float, default=None,
+                        help="Seconds between writes of buffered log rows (default: 1 for csv, 60 for npz/arrow; "
+                             "longer intervals give larger, better compressed columnar chunks)")
+    parser.add_argument("--index-log", action="store_true", help="Maintain a query index (<log>.idx) next to the CSV log")
+    parser.add_argument("--checkpoint-dir", default="auction_checkpoints", help="Directory of world-state checkpoints")
+    parser.add_argument("--checkpoint-every", type=int, default=None, help="Write a checkpoint every N auctions")
+    parser.add_argument("--checkpoint-interval", type=float, default=None, help="Write a checkpoint every N seconds")
+    parser.add_argument("--checkpoint-keep", type=int, default=3,
+                        help="Number of newest checkpoints to keep; 0 keeps all (for replay.py)")
+    parser.add_argument("--stats", action="store_true", help="Time every phase and batch and print a report at the end")
+    parser.add_argument("--clearing", choices=[m.value for m in ClearingMode], default=ClearingMode.BATCHES.value,
+                        help="batches: one Vickrey round per batch; uniform: clear each cluster at one uniform price")
+    parser.add_argument("--world", default=None,
+                        help="World JSON file or CSV directory (default: the built-in dataset)")
+    parser.add_argument("--cluster-workers", type=int, default=None,
+                        help="Experimental: clear the clusters of each auction concurrently on this many "
+                             "threads. Clearing is GIL-bound, so this is not faster than the default "
+                             "sequential clearing (usually slower)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the latest checkpoint and append to the existing log "
+                             "(rows logged after the checkpoint are dropped)")
+    args = parser.parse_args()
+
+    flush_interval = {} if args.log_flush_interval is None else {"flush_interval": args.log_flush_interval}
+    if args.log_format == "csv":
+        logger = TransactionLogger(args.log_file, max_bytes=args.max_log_bytes, append=args.resume,
+                                   build_index=args.index_log, **flush_interval)
+    else:
+        logger = ColumnarTransactionWriter(args.log_file, fmt=args.log_format, append=args.resume, **flush_interval)
+
+    checkpoints = None
+    if args.resume or args.checkpoint_every is not None or args.checkpoint_interval is not None:
+        checkpoints = CheckpointManager(args.checkpoint_dir, every_auctions=args.checkpoint_every,
+                                        every_seconds=args.checkpoint_interval, keep=args.checkpoint_keep)
+
+    random_auction_loop_with_logging(
+        log_file=args.log_file,
+        seed=args.seed,
+        scheduler=TickScheduler(rate=args.rate, mode=SchedulerMode(args.mode)),
+        max_auctions=args.max_auctions,
+        logger=logger,
+        world=World.from_file(args.world) if args.world else None,
+        checkpoints=checkpoints,
+        resume=args.resume,
+        stats=SimulationStats() if args.stats else None,
+        clearing=ClearingMode(args.clearing),
+        cluster_workers=args.cluster_workers
+    )
@@ -0,0 +1,364 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.country import Country
+from models.world import World
+
+try:
+    from .auction_manager import AuctionManager, collect_bidders, top_two_bids
+except ImportError:
+    from auction_manager import AuctionManager, collect_bidders, top_two_bids
+
+
+class SessionState(Enum):
+    BIDDING = "bidding"      # waiting for a bid or pass on the current batch
+    COMPLETED = "completed"  # every batch has been resolved
+    EXITED = "exited"        # the bidder stopped before the last batch
+
+
+# What the bidder did on a batch
+ACTION_BID = "bid"
+ACTION_PASS = "pass"
+ACTION_BELOW_BASE = "below_base"      # bid below the base price, rejected
+ACTION_OVER_BUDGET = "over_budget"    # bid * quantity above the budget, rejected
+
+
+class SessionStateError(Exception):
+    """The operation isn't possible in the session's current state."""
+
+
+@dataclass
+class CompetitorBid:
+    country_name: str
+    v_value: float
+    accepted: bool
+
+
+@dataclass
+class BatchQuote:
+    """The open batch: what the bidder sees before bidding."""
+    batch_num: int
+    quantity: float
+    suggested_bid: float
+    suggested_accepted: bool
+    competitors: List[CompetitorBid]
+
+
+@dataclass
+class BatchResult:
+    """How a batch was resolved."""
+    batch_num: int
+    quantity: float
+    action: str
+    your_bid: Optional[float]
+    num_bids: int
+    winner_name: Optional[str]
+    winning_bid: Optional[float]
+    price_per_unit: Optional[float]
+    total_payment: float
+    you_won: bool
+
+
+class BiddingSession:
+    """
+    Non-blocking version of `run_bidding_simulation`: one bidder against the
+    rest of its cluster, one batch at a time.
+
+    Competitor valuations don't depend on the bidder's choices, so all of them
+    are computed for every batch when the session starts; `submit_bid()`,
+    `pass_batch()` and `exit()` only compare against the precomputed top two
+    bids and return immediately. Like the interactive simulation this is a dry
+    run: the world is only read, when the session starts.
+
+    Sessions are safe to drive from several threads; use `start_bidding_session`
+    to create one.
+    """
+
+    def __init__(self, session_id: str, bidder_name: str, seller_name: str, cluster_name: str,
+                 resource_name: str, resource_unit: str, base_price: float, budget: float,
+                 batches: List[Tuple[int, float]], suggestions: List[Tuple[float, bool]],
+                 competitor_names: Tuple[str, ...], v_values: np.ndarray, accepted: np.ndarray,
+                 clock: Callable[[], float] = time.monotonic):
+        self.session_id = session_id
+        self.bidder_name = bidder_name
+        self.seller_name = seller_name
+        self.cluster_name = cluster_name
+        self.resource_name = resource_name
+        self.resource_unit = resource_unit
+        self.base_price = base_price
+        self.budget = budget
+        self.batches = batches
+        self.suggestions = suggestions
+        # competitors x batches
+        self.competitor_names = competitor_names
+        self.v_values = v_values
+        self.accepted = accepted
+        self.top_bids = [top_two_bids(v_values[:, i], accepted[:, i]) for i in range(len(batches))]
+
+        self.state = SessionState.BIDDING if batches else SessionState.COMPLETED
+        self.position = 0
+        self.results: List[BatchResult] = []
+        self.clock = clock
+        self.last_active = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def remaining_batches(self) -> int:
+        return len(self.batches) - self.position
+
+    def current_quote(self) -> Optional[BatchQuote]:
+        """The open batch, or None once the session is over."""
+        if self.state != SessionState.BIDDING:
+            return None
+        i = self.position
+        batch_num, quantity = self.batches[i]
+        suggested_bid, suggested_accepted = self.suggestions[i]
+        competitors = [
+            CompetitorBid(name, v_value, is_accepted)
+            for name, v_value, is_accepted in zip(
+                self.competitor_names, self.v_values[:, i].tolist(), self.accepted[:, i].tolist()
+            )
+        ]
+        return BatchQuote(batch_num, quantity, suggested_bid, suggested_accepted, competitors)
+
+    def submit_bid(self, price: float) -> BatchResult:
+        """
+        Bid `price` per unit on the open batch and resolve it (Vickrey,
+        second price). Bids below the base price or above the budget are
+        rejected and the batch goes to the competitors.
+        """
+        if not np.isfinite(price):
+            raise ValueError("Bid must be a finite number")
+        with self._lock:
+            self._check_open()
+            quantity = self.batches[self.position][1]
+            if price < self.base_price:
+                return self._resolve(ACTION_BELOW_BASE, price)
+            if self.budget < price * quantity:
+                return self._resolve(ACTION_OVER_BUDGET, price)
+            return self._resolve(ACTION_BID, price)
+
+    def pass_batch(self) -> BatchResult:
+        """Don't bid on the open batch; it goes to the competitors."""
+        with self._lock:
+            self._check_open()
+            return self._resolve(ACTION_PASS, None)
+
+    def exit(self) -> None:
+        """Stop bidding; the remaining batches are skipped."""
+        with self._lock:
+            self.last_active = self.clock()
+            if self.state == SessionState.BIDDING:
+                self.state = SessionState.EXITED
+
+    def _check_open(self) -> None:
+        self.last_active = self.clock()
+        if self.state != SessionState.BIDDING:
+            raise SessionStateError(f"Session {self.session_id} is {self.state.value}")
+
+    def _resolve(self, action: str, your_bid: Optional[float]) -> BatchResult:
+        i = self.position
+        batch_num, quantity = self.batches[i]
+        top, num_other_bids = self.top_bids[i]
+        bids = [(self.v_values[j, i].item(), self.competitor_names[j]) for j in top]
+
+        # Ties go to the competitors, like the stable sort of the interactive version
+        if action == ACTION_BID:
+            if not bids or your_bid > bids[0][0]:
+                bids.insert(0, (your_bid, self.bidder_name))
+            else:
+                bids.insert(1 if len(bids) == 1 or your_bid > bids[1][0] else 2, (your_bid, self.bidder_name))
+        num_bids = num_other_bids + (1 if action == ACTION_BID else 0)
+
+        if not bids:
+            result = BatchResult(batch_num, quantity, action, your_bid, 0, None, None, None, 0.0, False)
+        else:
+            winning_bid, winner_name = bids[0]
+            price_per_unit = bids[1][0] if num_bids > 1 else self.base_price
+            result = BatchResult(
+                batch_num, quantity, action, your_bid, num_bids, winner_name, winning_bid,
+                price_per_unit, price_per_unit * quantity, winner_name == self.bidder_name
+            )
+
+        self.results.append(result)
+        self.position += 1
+        if self.position == len(self.batches):
+            self.state = SessionState.COMPLETED
+        return result
+
+    def summary(self) -> Dict:
+        wins = [result for result in self.results if result.you_won]
+        total_spent = sum(result.total_payment for result in wins)
+        total_won = sum(result.quantity for result in wins)
+        return {
+            "batches_won": len(wins),
+            "total_quantity_won": total_won,
+            "total_spent": total_spent,
+            "average_price": total_spent / total_won if total_won > 0 else None,
+        }
+
+    def to_dict(self) -> Dict:
+        quote = self.current_quote()
+        return {
+            "session_id": self.session_id,
+            "state": self.state.value,
+            "bidder": self.bidder_name,
+            "seller": self.seller_name,
+            "cluster": self.cluster_name,
+            "resource": self.resource_name,
+            "unit": self.resource_unit,
+            "base_price": self.base_price,
+            "budget": self.budget,
+            "total_batches": len(self.batches),
+            "current_batch": asdict(quote) if quote else None,
+            "results": [asdict(result) for result in self.results],
+            "summary": self.summary(),
+        }
+
+
+def start_bidding_session(
+    world: World,
+    bidder_country: Country,
+    seller_country: Country,
+    resource_name: str,
+    total_quantity: float,
+    base_price: float,
+    session_id: Optional[str] = None,
+    clock: Callable[[], float] = time.monotonic
+) -> BiddingSession:
+    """
+    Plan the bidder cluster's batches and value every competitor for all of
+    them at once.
+
+    Raises:
+        ValueError: the bidder is in no cluster, the seller doesn't hold the
+            resource or the base price isn't positive
+    """
+    bidder_cluster = world.get_cluster(bidder_country)
+    if not bidder_cluster:
+        raise ValueError(f"{bidder_country.name} not found in any cluster")
+
+    seller_resource = seller_country.get_resource(resource_name)
+    if not seller_resource:
+        raise ValueError(f"Seller doesn't have {resource_name}")
+
+    your_demand_res = bidder_country.get_demand(resource_name)
+    your_demand = your_demand_res.amount if your_demand_res else 0.0
+    your_supply_res = bidder_country.get_resource(resource_name)
+    your_supply = your_supply_res.amount if your_supply_res else 0.0
+
+    schedule = bidder_cluster.plan_batches(total_quantity, world.total_country_count, seller=seller_country)
+    batches = [(batch_num, quantity) for batch_num, quantity in schedule.items() if quantity != 0]
+    suggestions = [
+        AuctionManager.laplace(base_price=base_price, supply=your_supply, demand=your_demand, quantity=quantity)
+        for _, quantity in batches
+    ]
+
+    bidders, supplies, demands = collect_bidders(
+        bidder_cluster.countries, resource_name,
+        exclude=(seller_country.name, bidder_country.name)
+    )
+    quantities = np.array([quantity for _, quantity in batches], dtype=np.float64)
+    v_values, accepted = AuctionManager.laplace_batch(
+        base_price=base_price,
+        supply=supplies[:, None],
+        demand=demands[:, None],
+        quantity=quantities[None, :]
+    )
+
+    return BiddingSession(
+        session_id=session_id or uuid.uuid4().hex,
+        bidder_name=bidder_country.name,
+        seller_name=seller_country.name,
+        cluster_name=bidder_cluster.name,
+        resource_name=resource_name,
+        resource_unit=seller_resource.unit,
+        base_price=base_price,
+        budget=bidder_country.budget,
+        batches=batches,
+        suggestions=suggestions,
+        competitor_names=tuple(country.name for country in bidders),
+        v_values=v_values,
+        accepted=accepted,
+        clock=clock
+    )
+
+
+class BiddingSessionStore:
+    """
+    Bounded, thread-safe registry of bidding sessions.
+
+    Sessions idle for longer than `idle_timeout` seconds are evicted, and once
+    `max_sessions` are held the least recently used one makes room for a new
+    session. Sessions are kept in access order, so eviction only looks at the
+    oldest entries.
+    """
+
+    def __init__(self, max_sessions: int = 10_000, idle_timeout: float = 900.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be >= 1")
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.evicted = 0
+        self._sessions: "OrderedDict[str, BiddingSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def start(self, world: World, bidder_country: Country, seller_country: Country,
+              resource_name: str, total_quantity: float, base_price: float) -> BiddingSession:
+        session = start_bidding_session(world, bidder_country, seller_country, resource_name,
+                                        total_quantity, base_price, clock=self.clock)
+        with self._lock:
+            self._evict_idle()
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> BiddingSession:
+        """
+        Raises:
+            KeyError: unknown or evicted session
+        """
+        with self._lock:
+            self._evict_idle()
+            session = self._sessions[session_id]
+            self._sessions.move_to_end(session_id)
+            session.last_active = self.clock()
+            return session
+
+    def remove(self, session_id: str) -> Optional[BiddingSession]:
+        with self._lock:
+            return self._sessions.pop(session_id, None)
+
+    def evict_idle(self) -> int:
+        """Drop the sessions idle for longer than `idle_timeout`; returns how many."""
+        with self._lock:
+            return self._evict_idle()
+
+    def _evict_idle(self) -> int:
+        deadline = self.clock() - self.idle_timeout
+        count = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_active > deadline:
+                break
+            self._sessions.popitem(last=False)
+            count += 1
+        self.evicted += count
+        return count
@@ -0,0 +1,182 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import glob
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+from models.world import World
+from models.world_state import WorldState
+
+
+CHECKPOINT_VERSION = 1
+
+_STATE_ARRAYS = ["supply", "demand", "has_supply", "has_demand", "budget", "ppp"]
+
+
+@dataclass
+class Checkpoint:
+    """A saved live-loop state: the whole world, the auction counter and the RNG state."""
+    path: str
+    state: WorldState
+    auction_count: int
+    saved_at: datetime
+    rng_state: Optional[tuple] = None
+
+    def restore(self, world: World, rng=None) -> None:
+        """
+        Load the saved budgets, supplies and demands into `world` (matching
+        countries by name) and, if given, put `rng` back into its saved state.
+        """
+        countries = [country for country in world.all_countries() if country.name in self.state.country_index]
+        self.state.write_back(countries)
+        for cluster_info in world.clusters:
+            cluster_info.invalidate_bidders()
+
+        if rng is not None and self.rng_state is not None:
+            rng.setstate(self.rng_state)
+
+
+def save_checkpoint(path: str, world: World, auction_count: int, rng=None) -> str:
+    """
+    Atomically write a binary (uncompressed npz) checkpoint of `world`.
+
+    `rng` may be a `random.Random` or the `random` module itself; anything
+    with `getstate()` works.
+    """
+    state = WorldState.from_countries(world.all_countries())
+    arrays = {name: getattr(state, name) for name in _STATE_ARRAYS}
+    arrays["country_names"] = np.array(state.country_names, dtype=str)
+    arrays["resource_names"] = np.array(state.resource_names, dtype=str)
+    arrays["units"] = np.array(state.units, dtype=str)
+    arrays["auction_count"] = np.int64(auction_count)
+    arrays["saved_at"] = np.array(datetime.now().isoformat())
+    arrays["version"] = np.int64(CHECKPOINT_VERSION)
+
+    if rng is not None:
+        rng_version, internal_state, gauss_next = rng.getstate()
+        arrays["rng_version"] = np.int64(rng_version)
+        arrays["rng_internal"] = np.array(internal_state, dtype=np.int64)
+        arrays["rng_gauss"] = np.float64(np.nan if gauss_next is None else gauss_next)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """Read a checkpoint written by `save_checkpoint`."""
+    with np.load(path) as data:
+        version = int(data["version"])
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version} in {path}")
+
+        state = WorldState(data["country_names"].tolist(), data["resource_names"].tolist(), data["units"].tolist())
+        for name in _STATE_ARRAYS:
+            setattr(state, name, data[name].copy())
+
+        rng_state = None
+        if "rng_internal" in data:
+            gauss = float(data["rng_gauss"])
+            rng_state = (
+                int(data["rng_version"]),
+                tuple(int(x) for x in data["rng_internal"]),
+                None if np.isnan(gauss) else gauss
+            )
+
+        return Checkpoint(
+            path=path,
+            state=state,
+            auction_count=int(data["auction_count"]),
+            saved_at=datetime.fromisoformat(str(data["saved_at"])),
+            rng_state=rng_state
+        )
+
+
+class CheckpointManager:
+    """
+    Writes periodic checkpoints of the live loop into a directory.
+
+    A checkpoint is due every `every_auctions` auctions and/or every
+    `every_seconds` seconds (whichever comes first); `maybe_save` is meant
+    to be called once per loop iteration. Files are named
+    `checkpoint_<auction_count>.npz` and only the newest `keep` are kept
+    (`keep=0` keeps all of them, e.g. for `replay.py`).
+
+    Example:
+        checkpoints = CheckpointManager("auction_checkpoints", every_auctions=1000)
+        latest = checkpoints.load_latest()
+        if latest:
+            latest.restore(world, rng)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        every_auctions: Optional[int] = None,
+        every_seconds: Optional[float] = None,
+        keep: int = 3
+    ):
+        self.directory = directory
+        self.every_auctions = every_auctions
+        self.every_seconds = every_seconds
+        self.keep = keep
+
+        self.saved = 0
+        self._last_count: Optional[int] = None
+        self._last_time = time.monotonic()
+
+    def _path_for(self, auction_count: int) -> str:
+        return os.path.join(self.directory, f"checkpoint_{auction_count:012d}.npz")
+
+    def checkpoints(self) -> List[str]:
+        """Existing checkpoint files, oldest first."""
+        return sorted(glob.glob(os.path.join(self.directory, "checkpoint_*.npz")))
+
+    def latest(self) -> Optional[str]:
+        paths = self.checkpoints()
+        return paths[-1] if paths else None
+
+    def load_latest(self) -> Optional[Checkpoint]:
+        """Load the newest checkpoint, or None if there is none yet."""
+        path = self.latest()
+        if path is None:
+            return None
+        checkpoint = load_checkpoint(path)
+        self._last_count = checkpoint.auction_count
+        return checkpoint
+
+    def due(self, auction_count: int) -> bool:
+        if self._last_count is None:
+            self._last_count = 0
+        if self.every_auctions is not None and auction_count - self._last_count >= self.every_auctions:
+            return True
+        if self.every_seconds is not None and time.monotonic() - self._last_time >= self.every_seconds:
+            return True
+        return False
+
+    def save(self, world: World, auction_count: int, rng=None) -> str:
+        """Write a checkpoint now and prune old ones."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = save_checkpoint(self._path_for(auction_count), world, auction_count, rng)
+        self.saved += 1
+        self._last_count = auction_count
+        self._last_time = time.monotonic()
+
+        for old_path in self.checkpoints()[:-self.keep] if self.keep else []:
+            os.remove(old_path)
+        return path
+
+    def maybe_save(self, world: World, auction_count: int, rng=None) -> Optional[str]:
+        """Write a checkpoint if one is due. Returns its path, or None."""
+        if not self.due(auction_count):
+            return None
+        return self.save(world, auction_count, rng)
@@ -0,0 +1,338 @@
+import atexit
+import csv
+import glob
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+try:
+    from .auction_events import CSV_HEADERS
+except ImportError:
+    from auction_events import CSV_HEADERS
+
+
+# Column types of the transaction log (same columns as the CSV log)
+INT_COLUMNS = ["auction_id", "batch_num"]
+STRING_COLUMNS = ["cluster_name", "resource_name", "seller_name", "winner_name"]
+TIMESTAMP_COLUMN = "timestamp"
+FLOAT_COLUMNS = [name for name in CSV_HEADERS
+                 if name not in INT_COLUMNS and name not in STRING_COLUMNS and name != TIMESTAMP_COLUMN]
+
+FORMAT_NPZ = "npz"
+FORMAT_ARROW = "arrow"
+
+
+def _encode_strings(values: List[str]):
+    """Dictionary-encode a string column into (codes, dictionary)."""
+    dictionary, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    code_type = np.uint8 if len(dictionary) <= 0xFF else (np.uint16 if len(dictionary) <= 0xFFFF else np.uint32)
+    return codes.astype(code_type), dictionary
+
+
+def rows_to_columns(rows: List[Dict]) -> Dict[str, np.ndarray]:
+    """Turn CSV-style row dicts into typed column arrays (strings left as str arrays)."""
+    columns = {}
+    for name in INT_COLUMNS:
+        columns[name] = np.fromiter((int(row[name]) for row in rows), dtype=np.int64, count=len(rows))
+    columns[TIMESTAMP_COLUMN] = np.array([row[TIMESTAMP_COLUMN] for row in rows], dtype="datetime64[us]")
+    for name in STRING_COLUMNS:
+        columns[name] = np.array([row[name] for row in rows], dtype=str)
+    for name in FLOAT_COLUMNS:
+        columns[name] = np.fromiter((float(row[name]) for row in rows), dtype=np.float64, count=len(rows))
+    return columns
+
+
+class ColumnarTransactionWriter:
+    """
+    Columnar, binary alternative to `TransactionLogger`.
+
+    Rows are buffered and written as chunks of typed columns: int64 ids,
+    datetime64[us] timestamps, float64 amounts and dictionary-encoded name
+    columns (small unsigned codes + the distinct values of the chunk).
+
+    - FORMAT_NPZ: `path` is a directory of `chunk_000000.npz` files
+      (compressed with `np.savez_compressed` unless `compress=False`).
+      Every chunk is self-contained, so a crash loses at most the rows
+      buffered since the last flush.
+    - FORMAT_ARROW: `path` is an Arrow IPC stream (zstd compressed) with
+      dictionary-typed name columns. Requires `pyarrow`.
+
+    The buffer is written once `chunk_rows` rows are pending or
+    `flush_interval` seconds have passed since the last flush. Chunks only
+    compress well with enough rows in them, so the interval is much longer
+    than `TransactionLogger`'s (at 1 auction/s, one minute is ~800 rows with
+    the stock world). Pending rows are flushed by `close()`, by leaving a
+    `with` block and, as a last resort, at interpreter exit.
+
+    Has the same `open` / `write_rows` / `flush` / `close` interface as
+    `TransactionLogger`, so the live loop can use either. With `append=True`
+    an NPZ log keeps its chunks and continues after the last one (Arrow
+    streams can't be appended to).
+    """
+
+    def __init__(self, path: str, fmt: str = FORMAT_NPZ, chunk_rows: int = 65536, compress: bool = True,
+                 append: bool = False, flush_interval: float = 60.0):
+        if fmt not in (FORMAT_NPZ, FORMAT_ARROW):
+            raise ValueError(f"Unknown columnar log format: {fmt}")
+        if fmt == FORMAT_ARROW and pa is None:
+            raise ImportError("The arrow log format requires pyarrow")
+        if fmt == FORMAT_ARROW and append:
+            raise ValueError("Appending is only supported for the npz log format")
+
+        self.path = path
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.flush_interval = flush_interval
+        self.compress = compress
+        self.append = append
+
+        self.rows_written = 0
+        self.segments: List[str] = []
+
+        self._buffer: List[Dict] = []
+        self._next_chunk = 0
+        self._arrow_sink = None
+        self._arrow_writer = None
+        self._opened = False
+        self._last_flush = time.monotonic()
+
+    def open(self) -> "ColumnarTransactionWriter":
+        if self._opened:
+            return self
+        if self.fmt == FORMAT_NPZ:
+            os.makedirs(self.path, exist_ok=True)
+            old_chunks = sorted(glob.glob(os.path.join(self.path, "chunk_*.npz")))
+            if self.append:
+                if old_chunks:
+                    self._next_chunk = int(os.path.basename(old_chunks[-1])[len("chunk_"):-len(".npz")]) + 1
+            else:
+                for old_chunk in old_chunks:
+                    os.remove(old_chunk)
+        else:
+            self._arrow_sink = pa.OSFile(self.path, "wb")
+            options = pa.ipc.IpcWriteOptions(compression="zstd" if self.compress else None)
+            self._arrow_writer = pa.ipc.new_stream(self._arrow_sink, _arrow_schema(), options=options)
+        self._opened = True
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+        return self
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def write_rows(self, rows: List[Dict]) -> None:
+        if rows:
+            self._buffer.extend(rows)
+        if len(self._buffer) >= self.chunk_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as one chunk."""
+        self._last_flush = time.monotonic()
+        if not self._buffer or not self._opened:
+            return
+
+        columns = rows_to_columns(self._buffer)
+        if self.fmt == FORMAT_NPZ:
+            self._write_npz_chunk(columns)
+        else:
+            self._write_arrow_batch(columns)
+
+        self.rows_written += len(self._buffer)
+        self._buffer.clear()
+
+    def _write_npz_chunk(self, columns: Dict[str, np.ndarray]) -> None:
+        arrays = {}
+        for name, values in columns.items():
+            if name in STRING_COLUMNS:
+                arrays[f"{name}__codes"], arrays[f"{name}__dict"] = _encode_strings(values)
+            elif name == TIMESTAMP_COLUMN:
+                arrays[name] = values.astype(np.int64)
+            else:
+                arrays[name] = values
+
+        self._save_chunk(os.path.join(self.path, f"chunk_{self._next_chunk:06d}.npz"), arrays)
+        self._next_chunk += 1
+
+    def _save_chunk(self, chunk_path: str, arrays: Dict[str, np.ndarray]) -> None:
+        tmp_path = chunk_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            (np.savez_compressed if self.compress else np.savez)(f, **arrays)
+        os.replace(tmp_path, chunk_path)
+
+    def truncate_after(self, auction_id: int) -> int:
+        """
+        Drop the rows of auctions after `auction_id` from an NPZ log, e.g.
+        before resuming from a checkpoint taken at `auction_id`. Chunks are
+        in auction order, so only the newest ones are removed or rewritten.
+        Call before `open()`. Returns the number of rows dropped.
+        """
+        if self.fmt != FORMAT_NPZ:
+            raise ValueError("Truncating is only supported for the npz log format")
+
+        dropped = 0
+        for chunk_path in reversed(sorted(glob.glob(os.path.join(self.path, "chunk_*.npz")))):
+            with np.load(chunk_path) as chunk:
+                arrays = {name: chunk[name] for name in chunk.files}
+            keep = arrays["auction_id"] <= auction_id
+            if keep.all():
+                break
+            dropped += int((~keep).sum())
+            if not keep.any():
+                os.remove(chunk_path)
+                continue
+            # Dictionaries of the name columns stay as they are; every other array has one value per row
+            self._save_chunk(chunk_path, {
+                name: values if name.endswith("__dict") else values[keep]
+                for name, values in arrays.items()
+            })
+            break
+        return dropped
+
+    def _write_arrow_batch(self, columns: Dict[str, np.ndarray]) -> None:
+        arrays = []
+        for name in CSV_HEADERS:
+            values = columns[name]
+            if name in STRING_COLUMNS:
+                codes, dictionary = _encode_strings(values)
+                arrays.append(pa.DictionaryArray.from_arrays(codes.astype(np.int32), pa.array(dictionary)))
+            else:
+                arrays.append(pa.array(values))
+        self._arrow_writer.write_batch(pa.record_batch(arrays, schema=_arrow_schema()))
+
+    def close(self) -> None:
+        if not self._opened:
+            return
+        try:
+            self.flush()
+        finally:
+            if self._arrow_writer is not None:
+                self._arrow_writer.close()
+                self._arrow_sink.close()
+                self._arrow_writer = None
+                self._arrow_sink = None
+            self._opened = False
+            atexit.unregister(self.close)
+
+    def __enter__(self) -> "ColumnarTransactionWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _arrow_schema():
+    fields = []
+    for name in CSV_HEADERS:
+        if name in INT_COLUMNS:
+            fields.append(pa.field(name, pa.int64()))
+        elif name in STRING_COLUMNS:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        elif name == TIMESTAMP_COLUMN:
+            fields.append(pa.field(name, pa.timestamp("us")))
+        else:
+            fields.append(pa.field(name, pa.float64()))
+    return pa.schema(fields)
+
+
+class ColumnarTransactionReader:
+    """
+    Reads logs written by `ColumnarTransactionWriter` back into column arrays.
+
+    Example:
+        columns = ColumnarTransactionReader("auction_log_columns").read()
+        copper = columns["resource_name"] == "COPPER"
+        print(columns["winning_price_per_unit"][copper].mean())
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fmt = FORMAT_NPZ if os.path.isdir(path) else FORMAT_ARROW
+
+    def iter_chunks(self, columns: Optional[List[str]] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Yield one dict of column arrays per chunk / record batch."""
+        names = columns or CSV_HEADERS
+        if self.fmt == FORMAT_NPZ:
+            for chunk_path in sorted(glob.glob(os.path.join(self.path, "chunk_*.npz"))):
+                with np.load(chunk_path) as chunk:
+                    yield {name: self._npz_column(chunk, name) for name in names}
+        else:
+            if pa is None:
+                raise ImportError("Reading an arrow log requires pyarrow")
+            with pa.OSFile(self.path, "rb") as source:
+                for batch in pa.ipc.open_stream(source):
+                    yield {name: self._arrow_column(batch.column(name), name) for name in names}
+
+    @staticmethod
+    def _npz_column(chunk, name: str) -> np.ndarray:
+        if name in STRING_COLUMNS:
+            return chunk[f"{name}__dict"][chunk[f"{name}__codes"]]
+        if name == TIMESTAMP_COLUMN:
+            return chunk[name].astype("datetime64[us]")
+        return chunk[name]
+
+    @staticmethod
+    def _arrow_column(column, name: str) -> np.ndarray:
+        if name in STRING_COLUMNS:
+            return np.asarray(column.dictionary.to_numpy(zero_copy_only=False), dtype=str)[column.indices.to_numpy()]
+        return column.to_numpy(zero_copy_only=False)
+
+    def read(self, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Read the whole log, concatenating chunks column by column."""
+        names = columns or CSV_HEADERS
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name in names}
+        for chunk in self.iter_chunks(names):
+            for name in names:
+                parts[name].append(chunk[name])
+        return {
+            name: np.concatenate(arrays) if arrays else np.array([])
+            for name, arrays in parts.items()
+        }
+
+    def iter_rows(self) -> Iterator[Dict]:
+        """Yield CSV-style row dicts (timestamps as ISO strings)."""
+        for chunk in self.iter_chunks():
+            n = len(chunk["auction_id"])
+            timestamps = np.datetime_as_string(chunk[TIMESTAMP_COLUMN], unit="us")
+            lists = {name: chunk[name].tolist() for name in CSV_HEADERS if name != TIMESTAMP_COLUMN}
+            for i in range(n):
+                row = {name: lists[name][i] for name in lists}
+                row[TIMESTAMP_COLUMN] = str(timestamps[i])
+                yield {name: row[name] for name in CSV_HEADERS}
+
+
+def convert_csv_log(csv_path: str, out_path: str, fmt: str = FORMAT_NPZ, chunk_rows: int = 65536) -> int:
+    """Convert an existing CSV transaction log into the columnar format. Returns the row count."""
+    with open(csv_path, newline='', encoding='utf-8') as f, \
+            ColumnarTransactionWriter(out_path, fmt=fmt, chunk_rows=chunk_rows,
+                                      flush_interval=float("inf")) as writer:
+        for row in csv.DictReader(f):
+            writer.write_rows([row])
+        return writer.rows_written + writer.pending
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a CSV auction log to the columnar format.")
+    parser.add_argument("csv_path")
+    parser.add_argument("out_path")
+    parser.add_argument("--format", choices=[FORMAT_NPZ, FORMAT_ARROW], default=FORMAT_NPZ)
+    args = parser.parse_args()
+
+    count = convert_csv_log(args.csv_path, args.out_path, fmt=args.format)
+    if os.path.isdir(args.out_path):
+        out_size = sum(os.path.getsize(p) for p in glob.glob(os.path.join(args.out_path, "*")))
+    else:
+        out_size = os.path.getsize(args.out_path)
+    csv_size = os.path.getsize(args.csv_path)
+    print(f"Converted {count} rows: {csv_size} bytes -> {out_size} bytes ({csv_size / max(out_size, 1):.1f}x smaller)")
@@ -0,0 +1,313 @@
+import csv
+import mmap
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+try:
+    from .auction_events import CSV_HEADERS
+    from .columnar_log import INT_COLUMNS, FLOAT_COLUMNS
+except ImportError:
+    from auction_events import CSV_HEADERS
+    from columnar_log import INT_COLUMNS, FLOAT_COLUMNS
+
+
+EPOCH = datetime(1970, 1, 1)
+
+# Bump when the saved index layout changes, so old index files are rebuilt
+INDEX_VERSION = 1
+
+_KEY_MAPPINGS = ["by_seller", "by_winner", "by_resource", "by_bucket"]
+
+
+def _parse_timestamp(value: Union[str, datetime]) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def parse_row(fields: List[str]) -> Dict:
+    """Turn the raw string fields of a CSV log line into a typed row dict."""
+    row = dict(zip(CSV_HEADERS, fields))
+    for name in INT_COLUMNS:
+        row[name] = int(row[name])
+    for name in FLOAT_COLUMNS:
+        row[name] = float(row[name])
+    return row
+
+
+class LogIndex:
+    """
+    Secondary index over a CSV transaction log.
+
+    Maps seller, winner, resource and time bucket to the byte offsets of the
+    matching rows, plus the (auction_id, offset) of every row in file order.
+    It can be built from an existing log (`build`), extended with rows as
+    `TransactionLogger` appends them (`add`), or caught up with rows appended
+    since it was saved (`refresh`). Saved next to the log as `<log>.idx`.
+    """
+
+    def __init__(self, path: str, bucket_seconds: int = 60):
+        self.path = path
+        self.bucket_seconds = bucket_seconds
+        self.indexed_bytes = 0
+
+        self.offsets = array('q')
+        self.auction_ids = array('q')
+        self.by_seller: Dict[str, array] = {}
+        self.by_winner: Dict[str, array] = {}
+        self.by_resource: Dict[str, array] = {}
+        self.by_bucket: Dict[int, array] = {}
+        self._auction_ids_sorted = True
+
+    @staticmethod
+    def index_path(log_path: str) -> str:
+        return log_path + ".idx"
+
+    def bucket_of(self, timestamp: Union[str, datetime]) -> int:
+        """Time bucket number of a timestamp (naive datetimes, as written by the logger)."""
+        return int((_parse_timestamp(timestamp) - EPOCH).total_seconds() // self.bucket_seconds)
+
+    def add(self, row: Dict, offset: int) -> None:
+        """Index one row that starts at byte `offset` of the log."""
+        auction_id = int(row["auction_id"])
+        if self.auction_ids and auction_id < self.auction_ids[-1]:
+            self._auction_ids_sorted = False
+        self.offsets.append(offset)
+        self.auction_ids.append(auction_id)
+
+        for mapping, key in (
+            (self.by_seller, row["seller_name"]),
+            (self.by_winner, row["winner_name"]),
+            (self.by_resource, row["resource_name"]),
+            (self.by_bucket, self.bucket_of(row["timestamp"])),
+        ):
+            offsets = mapping.get(key)
+            if offsets is None:
+                offsets = mapping[key] = array('q')
+            offsets.append(offset)
+
+    def refresh(self) -> int:
+        """Index rows appended to the log since the last build/refresh. Returns the number of new rows."""
+        if not os.path.exists(self.path):
+            return 0
+
+        added = 0
+        with open(self.path, 'rb') as f:
+            f.seek(self.indexed_bytes)
+            offset = self.indexed_bytes
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written row; pick it up next time
+                if offset == 0:
+                    offset += len(line)  # header
+                    continue
+                fields = next(csv.reader([line.decode('utf-8')]))
+                self.add(dict(zip(CSV_HEADERS, fields)), offset)
+                offset += len(line)
+                added += 1
+            self.indexed_bytes = offset
+        return added
+
+    @classmethod
+    def build(cls, path: str, bucket_seconds: int = 60) -> "LogIndex":
+        """Index an existing CSV log from scratch."""
+        index = cls(path, bucket_seconds=bucket_seconds)
+        index.refresh()
+        return index
+
+    @classmethod
+    def load(cls, path: str, refresh: bool = True) -> "LogIndex":
+        """
+        Load the saved index of the log at `path`, catching up with rows
+        appended since it was saved. Builds a new index if none exists or the
+        saved one can't be read.
+        """
+        index_path = cls.index_path(path)
+        if not os.path.exists(index_path):
+            return cls.build(path)
+        try:
+            index = cls._read(path, index_path)
+        except Exception:
+            return cls.build(path)  # Corrupt, foreign or old-format index file
+        if refresh:
+            index.refresh()
+        return index
+
+    @classmethod
+    def _read(cls, path: str, index_path: str) -> "LogIndex":
+        with np.load(index_path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != INDEX_VERSION:
+                raise ValueError(f"Unsupported log index version {version} in {index_path}")
+
+            index = cls(path, bucket_seconds=int(data["bucket_seconds"]))
+            index.indexed_bytes = int(data["indexed_bytes"])
+            index.offsets = array('q', data["offsets"].tobytes())
+            index.auction_ids = array('q', data["auction_ids"].tobytes())
+            index._auction_ids_sorted = bool(data["auction_ids_sorted"])
+            for name in _KEY_MAPPINGS:
+                keys = data[f"{name}__keys"].tolist()
+                offsets = data[f"{name}__offsets"]
+                bounds = np.cumsum(data[f"{name}__counts"])[:-1]
+                setattr(index, name, {
+                    key: array('q', part.tobytes()) for key, part in zip(keys, np.split(offsets, bounds))
+                } if keys else {})
+        return index
+
+    def save(self) -> str:
+        """
+        Atomically write the index next to its log, as an npz file of plain
+        arrays (no pickles): every key mapping is stored as its keys, the
+        number of offsets per key and all offsets concatenated.
+        """
+        arrays = {
+            "version": np.int64(INDEX_VERSION),
+            "bucket_seconds": np.int64(self.bucket_seconds),
+            "indexed_bytes": np.int64(self.indexed_bytes),
+            "auction_ids_sorted": np.bool_(self._auction_ids_sorted),
+            "offsets": np.frombuffer(self.offsets, dtype=np.int64),
+            "auction_ids": np.frombuffer(self.auction_ids, dtype=np.int64),
+        }
+        for name in _KEY_MAPPINGS:
+            mapping = getattr(self, name)
+            keys = list(mapping)
+            arrays[f"{name}__keys"] = np.array(keys, dtype=np.int64 if name == "by_bucket" else str)
+            arrays[f"{name}__counts"] = np.array([len(mapping[key]) for key in keys], dtype=np.int64)
+            arrays[f"{name}__offsets"] = np.concatenate(
+                [np.frombuffer(mapping[key], dtype=np.int64) for key in keys]
+            ) if keys else np.zeros(0, dtype=np.int64)
+
+        index_path = self.index_path(self.path)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, index_path)
+        return index_path
+
+    def lookup(
+        self,
+        seller: Optional[str] = None,
+        winner: Optional[str] = None,
+        resource: Optional[str] = None,
+        start: Optional[Union[str, datetime]] = None,
+        end: Optional[Union[str, datetime]] = None,
+        min_auction_id: Optional[int] = None,
+        max_auction_id: Optional[int] = None
+    ) -> List[int]:
+        """
+        Sorted offsets of the rows that may match. Key filters are exact;
+        the time range is resolved to whole buckets (see `LogQuery` for the
+        exact filtering).
+        """
+        candidates: Optional[set] = None
+
+        def narrow(offsets: Iterable[int]) -> None:
+            nonlocal candidates
+            candidates = set(offsets) if candidates is None else candidates.intersection(offsets)
+
+        for mapping, key in ((self.by_seller, seller), (self.by_winner, winner), (self.by_resource, resource)):
+            if key is not None:
+                narrow(mapping.get(key, ()))
+
+        if start is not None or end is not None:
+            first = self.bucket_of(start) if start is not None else min(self.by_bucket, default=0)
+            last = self.bucket_of(end) if end is not None else max(self.by_bucket, default=-1)
+            in_range = []
+            for bucket, offsets in self.by_bucket.items():
+                if first <= bucket <= last:
+                    in_range.extend(offsets)
+            narrow(in_range)
+
+        if min_auction_id is not None or max_auction_id is not None:
+            narrow(self.offsets_for_auctions(min_auction_id, max_auction_id))
+
+        if candidates is None:
+            return list(self.offsets)
+        return sorted(candidates)
+
+    def offsets_for_auctions(self, min_auction_id: Optional[int] = None, max_auction_id: Optional[int] = None) -> List[int]:
+        """Offsets of rows with min_auction_id <= auction_id <= max_auction_id, in file order."""
+        low = min_auction_id if min_auction_id is not None else -2**63
+        high = max_auction_id if max_auction_id is not None else 2**63 - 1
+        if self._auction_ids_sorted:
+            return list(self.offsets[bisect_left(self.auction_ids, low):bisect_right(self.auction_ids, high)])
+        return [offset for offset, auction_id in zip(self.offsets, self.auction_ids) if low <= auction_id <= high]
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __repr__(self) -> str:
+        return f"LogIndex(path='{self.path}', rows={len(self)}, sellers={len(self.by_seller)}, resources={len(self.by_resource)})"
+
+
+class LogQuery:
+    """
+    Reads only the matching rows of a CSV log through a memory map.
+
+    Example:
+        with LogQuery("auction_simulation_log.csv") as log:
+            for row in log.query(resource="COPPER", seller="Iran", start=t1, end=t2):
+                print(row["winner_name"], row["winning_price_per_unit"])
+    """
+
+    def __init__(self, path: str, index: Optional[LogIndex] = None):
+        self.path = path
+        self.index = index or LogIndex.load(path)
+        self._file = None
+        self._map = None
+
+    def open(self) -> "LogQuery":
+        if self._map is None:
+            self._file = open(self.path, 'rb')
+            if os.fstat(self._file.fileno()).st_size == 0:
+                # An empty file can't be memory mapped, and has no rows to read
+                self._map = b""
+            else:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def close(self) -> None:
+        if self._map is not None:
+            if isinstance(self._map, mmap.mmap):
+                self._map.close()
+            self._file.close()
+            self._map = None
+            self._file = None
+
+    def __enter__(self) -> "LogQuery":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def read_row(self, offset: int) -> Dict:
+        """Parse the row starting at `offset`."""
+        self.open()
+        end = self._map.find(b"\n", offset)
+        line = self._map[offset:end if end != -1 else len(self._map)].decode('utf-8')
+        return parse_row(next(csv.reader([line])))
+
+    def query(
+        self,
+        seller: Optional[str] = None,
+        winner: Optional[str] = None,
+        resource: Optional[str] = None,
+        start: Optional[Union[str, datetime]] = None,
+        end: Optional[Union[str, datetime]] = None,
+        min_auction_id: Optional[int] = None,
+        max_auction_id: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """Yield typed rows matching every given filter (time range inclusive), in file order."""
+        start_dt = _parse_timestamp(start) if start is not None else None
+        end_dt = _parse_timestamp(end) if end is not None else None
+
+        for offset in self.index.lookup(seller, winner, resource, start, end, min_auction_id, max_auction_id):
+            row = self.read_row(offset)
+            if start_dt is not None or end_dt is not None:
+                timestamp = datetime.fromisoformat(row["timestamp"])
+                if (start_dt is not None and timestamp < start_dt) or (end_dt is not None and timestamp > end_dt):
+                    continue
+            yield row
@@ -0,0 +1,269 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.market_index import SurplusIndex
+from models.world import World
+from models.world_loader import WorldDefinition, load_world_definition
+
+try:
+    from .auction_events import Settlement, BudgetFailed, AuctionCompleted
+    from .auction_manager import (
+        simulate_auction, pick_random_auction, ClearingMode, LaplaceParams, BID_NOISE, DEMAND_DECAY
+    )
+except ImportError:
+    from auction_events import Settlement, BudgetFailed, AuctionCompleted
+    from auction_manager import (
+        simulate_auction, pick_random_auction, ClearingMode, LaplaceParams, BID_NOISE, DEMAND_DECAY
+    )
+
+
+@dataclass
+class MonteCarloResult:
+    """
+    Merged outcome of many independent randomized simulations.
+
+    `price_histograms` maps resource name -> counts of clearing prices per
+    bin of `bin_edges` (prices outside the edges land in the first/last bin).
+    `winner_stats` maps country name -> {"wins", "quantity", "spent"}.
+    """
+    bin_edges: np.ndarray
+    price_histograms: Dict[str, np.ndarray] = field(default_factory=dict)
+    winner_stats: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    simulations: int = 0
+    auctions: int = 0
+    trades: int = 0
+    price_sum: float = 0.0
+    quantity_offered: float = 0.0
+    quantity_sold: float = 0.0
+    budget_failures: int = 0
+
+    def merge(self, other: "MonteCarloResult") -> None:
+        """Add another result (computed with the same bin edges) into this one."""
+        for resource_name, counts in other.price_histograms.items():
+            if resource_name in self.price_histograms:
+                self.price_histograms[resource_name] = self.price_histograms[resource_name] + counts
+            else:
+                self.price_histograms[resource_name] = counts.copy()
+
+        for country_name, stats in other.winner_stats.items():
+            mine = self.winner_stats.setdefault(country_name, {"wins": 0, "quantity": 0.0, "spent": 0.0})
+            for key, value in stats.items():
+                mine[key] += value
+
+        self.simulations += other.simulations
+        self.auctions += other.auctions
+        self.trades += other.trades
+        self.price_sum += other.price_sum
+        self.quantity_offered += other.quantity_offered
+        self.quantity_sold += other.quantity_sold
+        self.budget_failures += other.budget_failures
+
+    def mean_price(self, resource_name: str) -> Optional[float]:
+        """Histogram estimate of the mean clearing price of a resource."""
+        counts = self.price_histograms.get(resource_name)
+        if counts is None or counts.sum() == 0:
+            return None
+        centers = (self.bin_edges[:-1] + self.bin_edges[1:]) / 2.0
+        return float((centers * counts).sum() / counts.sum())
+
+    def win_shares(self) -> Dict[str, float]:
+        """Fraction of all trades won by each country."""
+        if not self.trades:
+            return {}
+        return {name: stats["wins"] / self.trades for name, stats in self.winner_stats.items()}
+
+    def mean_clearing_price(self) -> Optional[float]:
+        """Exact mean clearing price over all trades of all resources."""
+        return self.price_sum / self.trades if self.trades else None
+
+    def fraction_sold(self) -> Optional[float]:
+        """Quantity sold over quantity offered, for auctions that weren't rejected."""
+        return self.quantity_sold / self.quantity_offered if self.quantity_offered else None
+
+    def winner_concentration(self) -> float:
+        """Herfindahl index of the win shares: 1 / (number of countries) when even, 1.0 for a single winner."""
+        return sum(share * share for share in self.win_shares().values())
+
+
+class _TradeCollector:
+    """Event sink that only keeps what the Monte Carlo summary needs."""
+
+    bid_events = False
+
+    def __init__(self):
+        self.prices: Dict[str, List[float]] = {}
+        self.winner_stats: Dict[str, Dict[str, float]] = {}
+        self.trades = 0
+        self.quantity_offered = 0.0
+        self.quantity_sold = 0.0
+        self.budget_failures = 0
+
+    def __call__(self, event) -> None:
+        event_type = type(event)
+        if event_type is BudgetFailed:
+            self.budget_failures += 1
+            return
+        if event_type is AuctionCompleted:
+            self.quantity_offered += event.total_quantity
+            self.quantity_sold += event.quantity_sold
+            return
+        if event_type is not Settlement:
+            return
+        self.prices.setdefault(event.resource_name, []).append(event.price_per_unit)
+        stats = self.winner_stats.setdefault(event.winner_name, {"wins": 0, "quantity": 0.0, "spent": 0.0})
+        stats["wins"] += 1
+        stats["quantity"] += event.quantity
+        stats["spent"] += event.total_cost
+        self.trades += 1
+
+
+def _run_simulation_task(task: Tuple[int, int, float, np.ndarray, Optional[str], ClearingMode,
+                                      Tuple[float, float], LaplaceParams, Optional[WorldDefinition]]) -> MonteCarloResult:
+    """
+    Runs one independent simulation: a fresh `World` (stock, or built from
+    the parsed `definition`) and `num_auctions` consecutive random auctions
+    driven by a private RNG. Top-level so it can be pickled into worker
+    processes.
+    """
+    seed, num_auctions, base_price, bin_edges, skip_name, clearing, noise, laplace, definition = task
+
+    rng = random.Random(seed)
+    world = definition.build() if definition is not None else World.from_country_data()
+    countries = world.all_countries()
+    surplus_index = SurplusIndex.from_countries(countries)
+
+    collector = _TradeCollector()
+    auctions = 0
+    for _ in range(num_auctions):
+        picked = pick_random_auction(countries, rng, skip_name=skip_name, surplus_index=surplus_index)
+        if picked is None:
+            continue
+        seller, resource_name, quantity = picked
+        simulate_auction(
+            world, seller, resource_name, quantity, base_price,
+            sink=collector,
+            noise=noise,
+            demand_decay=DEMAND_DECAY,
+            rng=rng,
+            surplus_index=surplus_index,
+            clearing=clearing,
+            laplace=laplace
+        )
+        auctions += 1
+
+    low, high = bin_edges[0], bin_edges[-1]
+    histograms = {
+        resource_name: np.histogram(np.clip(prices, low, high), bins=bin_edges)[0]
+        for resource_name, prices in collector.prices.items()
+    }
+    return MonteCarloResult(
+        bin_edges=bin_edges,
+        price_histograms=histograms,
+        winner_stats=collector.winner_stats,
+        simulations=1,
+        auctions=auctions,
+        trades=collector.trades,
+        price_sum=sum(sum(prices) for prices in collector.prices.values()),
+        quantity_offered=collector.quantity_offered,
+        quantity_sold=collector.quantity_sold,
+        budget_failures=collector.budget_failures
+    )
+
+
+class MonteCarloRunner:
+    """
+    Runs many independent randomized auction simulations across a process pool.
+
+    Every simulation gets its own fresh `World` and its own
+    seed, spawned from `seed` with `numpy.random.SeedSequence`, so results
+    only depend on `seed` - not on the number of workers or on scheduling.
+    `clearing` selects the clearing mechanism, so both can be compared on
+    the same seeds; `noise` and `laplace` set the competitors' bid model
+    (see `parameter_sweep.py` for sweeping them). `world_file` runs the
+    simulations in a world loaded from a data file; it is parsed once, here,
+    and the parsed `world_definition` is shipped to the workers.
+
+    Example:
+        runner = MonteCarloRunner(num_simulations=1000, auctions_per_simulation=50, seed=42)
+        result = runner.run()
+        print(result.mean_price("PETROLEUM"))
+    """
+
+    def __init__(
+        self,
+        num_simulations: int,
+        auctions_per_simulation: int = 100,
+        base_price: float = 0.5,
+        seed: int = 0,
+        max_workers: Optional[int] = None,
+        bins: int = 50,
+        skip_country_name: Optional[str] = None,
+        clearing: ClearingMode = ClearingMode.BATCHES,
+        noise: Tuple[float, float] = BID_NOISE,
+        laplace: LaplaceParams = LaplaceParams(),
+        world_file: Optional[str] = None,
+        world_definition: Optional[WorldDefinition] = None
+    ):
+        self.num_simulations = num_simulations
+        self.auctions_per_simulation = auctions_per_simulation
+        self.base_price = base_price
+        self.seed = seed
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.skip_country_name = skip_country_name
+        self.clearing = clearing
+        self.noise = noise
+        self.laplace = laplace
+        self.world_file = world_file
+        if world_definition is None and world_file:
+            world_definition = load_world_definition(world_file)
+        self.world_definition = world_definition
+        # Competitor bids lie in [base, 2 * base] before the +/- noise is applied
+        self.bin_edges = np.linspace(base_price * noise[0], 2.0 * base_price * noise[1], bins + 1)
+
+    def simulation_seeds(self) -> List[int]:
+        """Deterministic per-simulation seeds derived from the runner seed."""
+        children = np.random.SeedSequence(self.seed).spawn(self.num_simulations)
+        return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in children]
+
+    def tasks(self) -> List[Tuple]:
+        """One picklable task per simulation, for `_run_simulation_task`."""
+        return [
+            (seed, self.auctions_per_simulation, self.base_price, self.bin_edges, self.skip_country_name,
+             self.clearing, self.noise, self.laplace, self.world_definition)
+            for seed in self.simulation_seeds()
+        ]
+
+    def run(self) -> MonteCarloResult:
+        """Run all simulations and merge their results (in simulation order)."""
+        result = MonteCarloResult(bin_edges=self.bin_edges)
+        tasks = self.tasks()
+
+        if self.max_workers == 1:
+            for partial in map(_run_simulation_task, tasks):
+                result.merge(partial)
+            return result
+
+        chunksize = max(1, len(tasks) // (self.max_workers * 4))
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for partial in executor.map(_run_simulation_task, tasks, chunksize=chunksize):
+                result.merge(partial)
+        return result
+
+
+if __name__ == '__main__':
+    runner = MonteCarloRunner(num_simulations=200, auctions_per_simulation=50, seed=42)
+    result = runner.run()
+    print(f"Simulations: {result.simulations} | Auctions: {result.auctions} | Trades: {result.trades}")
+    for resource_name in sorted(result.price_histograms):
+        print(f"  {resource_name:<20}: mean clearing price ${result.mean_price(resource_name):.4f}B "
+              f"({int(result.price_histograms[resource_name].sum())} trades)")
+    print("\nTop winners:")
+    for name, share in sorted(result.win_shares().items(), key=lambda x: x[1], reverse=True)[:5]:
+        print(f"  {name:<15}: {share:.1%} of trades")
@@ -0,0 +1,327 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import csv
+import hashlib
+import itertools
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+
+from models.world_loader import load_world_definition, source_hash
+
+try:
+    from .auction_manager import ClearingMode, LaplaceParams, DEMAND_DECAY
+    from .monte_carlo import MonteCarloResult, MonteCarloRunner, _run_simulation_task
+except ImportError:
+    from auction_manager import ClearingMode, LaplaceParams, DEMAND_DECAY
+    from monte_carlo import MonteCarloResult, MonteCarloRunner, _run_simulation_task
+
+
+# Bump when a change to the simulation makes cached sweep results stale
+SWEEP_CACHE_VERSION = 1
+
+SUMMARY_FIELDS = [
+    "k", "min_b", "noise_width", "base_price", "simulations", "auctions", "trades",
+    "mean_price", "mean_markup", "fraction_sold", "budget_failures",
+    "winner_concentration", "top_winner", "top_winner_share",
+]
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """One setting of the competitors' bid model: Laplace shape, noise and base price."""
+    k: float
+    min_b: float
+    noise_width: float   # bids are multiplied by uniform(1 - width, 1 + width)
+    base_price: float
+
+    def __post_init__(self):
+        if self.k < 0 or self.min_b <= 0:
+            raise ValueError("k must be >= 0 and min_b > 0")
+        if not 0 <= self.noise_width < 1:
+            raise ValueError("noise_width must be in [0, 1)")
+        if self.base_price <= 0:
+            raise ValueError("Base price must be > 0")
+
+    @property
+    def noise(self) -> Tuple[float, float]:
+        return (1.0 - self.noise_width, 1.0 + self.noise_width)
+
+    @property
+    def laplace(self) -> LaplaceParams:
+        return LaplaceParams(k=self.k, min_b=self.min_b)
+
+
+def grid_points(k: Sequence[float], min_b: Sequence[float], noise_width: Sequence[float],
+                base_price: Sequence[float]) -> List[SweepPoint]:
+    """Every combination of the given values."""
+    return [SweepPoint(*values) for values in itertools.product(k, min_b, noise_width, base_price)]
+
+
+def random_points(num_points: int, k: Tuple[float, float], min_b: Tuple[float, float],
+                  noise_width: Tuple[float, float], base_price: Tuple[float, float],
+                  seed: int = 0) -> List[SweepPoint]:
+    """`num_points` points drawn uniformly from the (low, high) range of every parameter."""
+    rng = random.Random(seed)
+    return [
+        SweepPoint(rng.uniform(*k), rng.uniform(*min_b), rng.uniform(*noise_width), rng.uniform(*base_price))
+        for _ in range(num_points)
+    ]
+
+
+@dataclass
+class SweepResult:
+    """Summary of the Monte Carlo simulations of one sweep point."""
+    point: SweepPoint
+    simulations: int
+    auctions: int
+    trades: int
+    mean_price: Optional[float]
+    mean_markup: Optional[float]     # mean price / base price
+    fraction_sold: Optional[float]
+    budget_failures: int
+    winner_concentration: float      # Herfindahl index of the win shares
+    top_winner: Optional[str]
+    top_winner_share: float
+    cached: bool = False
+
+    @classmethod
+    def from_monte_carlo(cls, point: SweepPoint, result: MonteCarloResult) -> "SweepResult":
+        shares = result.win_shares()
+        top_winner = max(shares, key=shares.get) if shares else None
+        mean_price = result.mean_clearing_price()
+        return cls(
+            point=point,
+            simulations=result.simulations,
+            auctions=result.auctions,
+            trades=result.trades,
+            mean_price=mean_price,
+            mean_markup=mean_price / point.base_price if mean_price is not None else None,
+            fraction_sold=result.fraction_sold(),
+            budget_failures=result.budget_failures,
+            winner_concentration=result.winner_concentration(),
+            top_winner=top_winner,
+            top_winner_share=shares[top_winner] if top_winner else 0.0
+        )
+
+    def to_row(self) -> Dict:
+        """Flatten into a row matching `SUMMARY_FIELDS`."""
+        row = asdict(self.point)
+        row.update({name: getattr(self, name) for name in SUMMARY_FIELDS if name not in row})
+        return row
+
+    @classmethod
+    def from_row(cls, row: Dict, cached: bool = False) -> "SweepResult":
+        point = SweepPoint(row["k"], row["min_b"], row["noise_width"], row["base_price"])
+        values = {name: row[name] for name in SUMMARY_FIELDS if name not in asdict(point)}
+        return cls(point=point, cached=cached, **values)
+
+
+class ParameterSweep:
+    """
+    Runs `MonteCarloRunner` simulations for every point of a parameter sweep.
+
+    All points use the same simulation seeds (derived from `seed`), so they
+    are compared on the same random auction sequences. The simulations of
+    all points that aren't cached yet are spread over one process pool.
+
+    Each point's summary is cached as JSON in `cache_dir`, keyed by a hash of
+    the point and of the simulation settings, so rerunning a sweep with new
+    points only simulates those. Delete the directory (or bump
+    `SWEEP_CACHE_VERSION`) after changing the simulation itself.
+
+    Example:
+        sweep = ParameterSweep(grid_points([0.2, 0.4, 0.8], [1.0], [0.03], [0.5]), num_simulations=20)
+        results = sweep.run()
+        write_summary(results, "sweep_summary.csv")
+    """
+
+    def __init__(
+        self,
+        points: List[SweepPoint],
+        num_simulations: int = 20,
+        auctions_per_simulation: int = 50,
+        seed: int = 0,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[str] = "sweep_cache",
+        clearing: ClearingMode = ClearingMode.BATCHES,
+        skip_country_name: Optional[str] = None,
+        world_file: Optional[str] = None
+    ):
+        self.points = points
+        self.num_simulations = num_simulations
+        self.auctions_per_simulation = auctions_per_simulation
+        self.seed = seed
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.clearing = clearing
+        self.skip_country_name = skip_country_name
+        self.world_file = world_file
+        # Cached results are tied to the contents of the world file, not to its name
+        self.world_hash = source_hash(world_file) if world_file else None
+        self.world_definition = load_world_definition(world_file) if world_file else None
+
+    def cache_key(self, point: SweepPoint) -> str:
+        settings = {
+            "version": SWEEP_CACHE_VERSION,
+            "point": asdict(point),
+            "num_simulations": self.num_simulations,
+            "auctions_per_simulation": self.auctions_per_simulation,
+            "seed": self.seed,
+            "clearing": self.clearing.value,
+            "skip_country_name": self.skip_country_name,
+            "demand_decay": DEMAND_DECAY,
+            "world": self.world_hash,
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:20]
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key: str) -> Optional[SweepResult]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._cache_path(key)) as f:
+                return SweepResult.from_row(json.load(f), cached=True)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store(self, key: str, result: SweepResult) -> None:
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result.to_row(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _runner(self, point: SweepPoint) -> MonteCarloRunner:
+        return MonteCarloRunner(
+            num_simulations=self.num_simulations,
+            auctions_per_simulation=self.auctions_per_simulation,
+            base_price=point.base_price,
+            seed=self.seed,
+            max_workers=1,
+            skip_country_name=self.skip_country_name,
+            clearing=self.clearing,
+            noise=point.noise,
+            laplace=point.laplace,
+            world_file=self.world_file,
+            world_definition=self.world_definition
+        )
+
+    def run(self) -> List[SweepResult]:
+        """Results for every point, in the order of `points`; cached points aren't simulated again."""
+        keys = [self.cache_key(point) for point in self.points]
+        results: Dict[str, SweepResult] = {}
+        pending: Dict[str, SweepPoint] = {}
+        for key, point in zip(keys, self.points):
+            if key in results or key in pending:
+                continue
+            cached = self._load(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = point
+
+        runners = {key: self._runner(point) for key, point in pending.items()}
+        merged = {key: MonteCarloResult(bin_edges=runner.bin_edges) for key, runner in runners.items()}
+        owners = []
+        tasks = []
+        for key, runner in runners.items():
+            for task in runner.tasks():
+                owners.append(key)
+                tasks.append(task)
+
+        if self.max_workers == 1 or len(tasks) <= 1:
+            partials = map(_run_simulation_task, tasks)
+            for key, partial in zip(owners, partials):
+                merged[key].merge(partial)
+        else:
+            chunksize = max(1, len(tasks) // (self.max_workers * 4))
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                for key, partial in zip(owners, executor.map(_run_simulation_task, tasks, chunksize=chunksize)):
+                    merged[key].merge(partial)
+
+        for key, point in pending.items():
+            result = SweepResult.from_monte_carlo(point, merged[key])
+            self._store(key, result)
+            results[key] = result
+
+        return [results[key] for key in keys]
+
+
+def write_summary(results: List[SweepResult], path: str) -> None:
+    """Write one CSV row per sweep point."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result.to_row())
+
+
+def print_summary(results: List[SweepResult], file: Optional[TextIO] = None) -> None:
+    """Print the sweep as a table, one line per point."""
+    out = file or sys.stdout
+
+    def fmt(value: Optional[float], spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    print(f"{'k':>7} {'min_b':>7} {'noise':>7} {'base':>7} | {'trades':>7} {'price':>8} {'markup':>7} "
+          f"{'sold':>6} {'budget':>6} {'HHI':>6} | top winner", file=out)
+    for result in results:
+        point = result.point
+        top = f"{result.top_winner} ({result.top_winner_share:.1%})" if result.top_winner else "-"
+        print(f"{point.k:7.3f} {point.min_b:7.3f} {point.noise_width:7.3f} {point.base_price:7.3f} | "
+              f"{result.trades:7d} {fmt(result.mean_price, '8.4f')} {fmt(result.mean_markup, '7.3f')} "
+              f"{fmt(result.fraction_sold, '6.1%')} {result.budget_failures:6d} "
+              f"{result.winner_concentration:6.3f} | {top}" + (" [cached]" if result.cached else ""), file=out)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Sweep the competitors' bid model (Laplace k / min_b, bid noise, base price) "
+                    "with seeded Monte Carlo simulations.")
+    parser.add_argument("--k", type=float, nargs="+", default=[0.4])
+    parser.add_argument("--min-b", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--noise-width", type=float, nargs="+", default=[0.03])
+    parser.add_argument("--base-price", type=float, nargs="+", default=[0.5])
+    parser.add_argument("--random", type=int, default=None, metavar="N",
+                        help="Sample N random points instead of the grid; every parameter then takes "
+                             "LOW HIGH (or one fixed value)")
+    parser.add_argument("--simulations", type=int, default=20, help="Simulations per point")
+    parser.add_argument("--auctions", type=int, default=50, help="Auctions per simulation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--clearing", choices=[m.value for m in ClearingMode], default=ClearingMode.BATCHES.value)
+    parser.add_argument("--world", default=None,
+                        help="World JSON file or CSV directory (default: the built-in dataset)")
+    parser.add_argument("--cache-dir", default="sweep_cache")
+    parser.add_argument("--output", default="sweep_summary.csv")
+    args = parser.parse_args()
+
+    if args.random is not None:
+        def value_range(values: List[float]) -> Tuple[float, float]:
+            if len(values) not in (1, 2):
+                parser.error("with --random every parameter takes LOW HIGH or one value")
+            return (values[0], values[-1])
+
+        points = random_points(args.random, value_range(args.k), value_range(args.min_b),
+                               value_range(args.noise_width), value_range(args.base_price), seed=args.seed)
+    else:
+        points = grid_points(args.k, args.min_b, args.noise_width, args.base_price)
+
+    sweep = ParameterSweep(points, num_simulations=args.simulations, auctions_per_simulation=args.auctions,
+                           seed=args.seed, max_workers=args.workers, cache_dir=args.cache_dir,
+                           clearing=ClearingMode(args.clearing), world_file=args.world)
+    results = sweep.run()
+    print_summary(results)
+    write_summary(results, args.output)
+    print(f"\n{len(results)} points ({sum(result.cached for result in results)} cached) -> {args.output}")
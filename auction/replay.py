@@ -0,0 +1,245 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import glob
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from models.country import Country
+from models.resourcess import Resource
+from models.world import World
+
+try:
+    from .checkpoint import Checkpoint, CheckpointManager, load_checkpoint
+    from .log_index import LogIndex, LogQuery
+except ImportError:
+    from checkpoint import Checkpoint, CheckpointManager, load_checkpoint
+    from log_index import LogIndex, LogQuery
+
+
+def log_segments(log_path: str) -> List[str]:
+    """
+    The files of a (possibly rotated) CSV log in write order: the rotated
+    `<stem>.<n><suffix>` segments by n, then the live file.
+    """
+    stem, suffix = os.path.splitext(log_path)
+    pattern = re.compile(re.escape(stem) + r"\.(\d+)" + re.escape(suffix) + "$")
+    numbered = []
+    for path in glob.glob(glob.escape(stem) + ".*" + glob.escape(suffix)):
+        match = pattern.match(path)
+        if match:
+            numbered.append((int(match.group(1)), path))
+    segments = [path for _, path in sorted(numbered)]
+    if os.path.exists(log_path):
+        segments.append(log_path)
+    return segments
+
+
+def apply_log_row(world: World, row: Dict) -> None:
+    """
+    Put the seller and winner of one settlement row into their logged
+    "after" state. The CSV log stores floats with full precision, so the
+    result is bit-identical to the state the live loop had.
+    """
+    resource_name = row["resource_name"]
+    seller = world.get_country(row["seller_name"])
+    winner = world.get_country(row["winner_name"])
+
+    seller.budget = row["seller_budget_after"]
+    seller_resource = seller.get_resource(resource_name)
+    seller_resource.amount = row["seller_supply_after"]
+
+    winner.budget = row["winner_budget_after"]
+    winner_resource = winner.get_resource(resource_name)
+    if winner_resource:
+        winner_resource.amount = row["winner_supply_after"]
+    else:
+        winner.resources[resource_name] = Resource(amount=row["winner_supply_after"], unit=seller_resource.unit)
+
+    winner_demand = winner.get_demand(resource_name)
+    if winner_demand:
+        winner_demand.amount = row["winner_demand_after"]
+
+
+@dataclass
+class ReplayResult:
+    """World state rebuilt as of a point in the log."""
+    world: World
+    auction_id: int
+    checkpoint: Optional[str]
+    rows_applied: int
+    rng_state: Optional[tuple] = None
+
+
+class ReplayEngine:
+    """
+    Rebuilds the live loop's world as of any auction id or log timestamp.
+
+    Starts from the newest checkpoint at or before the requested point (or
+    from a fresh world when there is none) and applies only the log rows
+    written after it, found through the `LogIndex` of each log segment. With
+    checkpoints every N auctions a query costs at most N auctions of rows,
+    however long the history is. Keep old checkpoints around for this
+    (`CheckpointManager(keep=0)` / `--checkpoint-keep 0`).
+
+    Example:
+        engine = ReplayEngine("auction_simulation_log.csv", "auction_checkpoints")
+        japan = engine.country_at("Japan", auction_id=50000)
+        print(japan.budget)
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        checkpoint_dir: Optional[str] = None,
+        world_factory: Callable[[], World] = World.from_country_data
+    ):
+        self.log_path = log_path
+        self.checkpoints = CheckpointManager(checkpoint_dir) if checkpoint_dir else None
+        self.world_factory = world_factory
+        self._queries: Dict[str, LogQuery] = {}
+
+    def _query(self, path: str) -> LogQuery:
+        query = self._queries.get(path)
+        if query is None:
+            query = self._queries[path] = LogQuery(path, LogIndex.load(path))
+        else:
+            query.index.refresh()
+            query.close()  # re-map, the file may have grown
+        return query
+
+    def close(self) -> None:
+        for query in self._queries.values():
+            query.close()
+        self._queries.clear()
+
+    def __enter__(self) -> "ReplayEngine":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _checkpoint_counts(self) -> List[Tuple[int, str]]:
+        if self.checkpoints is None:
+            return []
+        counts = []
+        for path in self.checkpoints.checkpoints():
+            name = os.path.basename(path)
+            counts.append((int(name[len("checkpoint_"):-len(".npz")]), path))
+        return counts
+
+    def _nearest_checkpoint(self, auction_id: int, strictly_before: bool = False) -> Optional[Checkpoint]:
+        best = None
+        for count, path in self._checkpoint_counts():
+            if count < auction_id or (count == auction_id and not strictly_before):
+                best = path
+        return load_checkpoint(best) if best else None
+
+    def _start(self, auction_id: int, strictly_before: bool = False) -> Tuple[World, int, Optional[Checkpoint]]:
+        world = self.world_factory()
+        checkpoint = self._nearest_checkpoint(auction_id, strictly_before)
+        if checkpoint is None:
+            return world, 0, None
+        checkpoint.restore(world)
+        return world, checkpoint.auction_count, checkpoint
+
+    def _rows_after(self, first_auction_id: int, last_auction_id: int) -> Iterator[Tuple[str, int, Dict]]:
+        """(segment, offset, row) of every row with first <= auction_id <= last, in log order."""
+        for path in log_segments(self.log_path):
+            query = self._query(path)
+            for offset in query.index.offsets_for_auctions(first_auction_id, last_auction_id):
+                yield path, offset, query.read_row(offset)
+
+    def state_at_auction(self, auction_id: int) -> ReplayResult:
+        """The world right after auction `auction_id` (and every auction before it) completed."""
+        world, start, checkpoint = self._start(auction_id)
+        applied = 0
+        for _, _, row in self._rows_after(start + 1, auction_id):
+            apply_log_row(world, row)
+            applied += 1
+        return self._result(world, auction_id, checkpoint, applied)
+
+    def state_at_time(self, timestamp: Union[str, datetime]) -> ReplayResult:
+        """The world right after the last settlement logged at or before `timestamp`."""
+        target = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
+        last = self._last_row_at_or_before(target)
+        if last is None:
+            world = self.world_factory()
+            return ReplayResult(world, 0, None, 0)
+
+        last_path, last_offset, last_auction_id = last
+        world, start, checkpoint = self._start(last_auction_id, strictly_before=True)
+        applied = 0
+        for path, offset, row in self._rows_after(start + 1, last_auction_id):
+            apply_log_row(world, row)
+            applied += 1
+            if path == last_path and offset == last_offset:
+                break
+        return self._result(world, last_auction_id, checkpoint, applied)
+
+    def _last_row_at_or_before(self, target: datetime) -> Optional[Tuple[str, int, int]]:
+        """Binary search the (time-ordered) log for the last row with timestamp <= target."""
+        for path in reversed(log_segments(self.log_path)):
+            query = self._query(path)
+            offsets = query.index.offsets
+            if not offsets or datetime.fromisoformat(query.read_row(offsets[0])["timestamp"]) > target:
+                continue
+
+            low, high = 0, len(offsets) - 1
+            while low < high:
+                mid = (low + high + 1) // 2
+                if datetime.fromisoformat(query.read_row(offsets[mid])["timestamp"]) <= target:
+                    low = mid
+                else:
+                    high = mid - 1
+            return path, offsets[low], query.index.auction_ids[low]
+        return None
+
+    def _result(self, world: World, auction_id: int, checkpoint: Optional[Checkpoint], applied: int) -> ReplayResult:
+        for cluster_info in world.clusters:
+            cluster_info.invalidate_bidders()
+        return ReplayResult(
+            world=world,
+            auction_id=auction_id,
+            checkpoint=checkpoint.path if checkpoint else None,
+            rows_applied=applied,
+            # The RNG state is only known exactly at a checkpoint
+            rng_state=checkpoint.rng_state if checkpoint and checkpoint.auction_count == auction_id else None
+        )
+
+    def country_at(
+        self,
+        country_name: str,
+        auction_id: Optional[int] = None,
+        timestamp: Optional[Union[str, datetime]] = None
+    ) -> Country:
+        """One country as of an auction id or a timestamp (exactly one must be given)."""
+        if (auction_id is None) == (timestamp is None):
+            raise ValueError("Give exactly one of auction_id or timestamp")
+        if auction_id is not None:
+            result = self.state_at_auction(auction_id)
+        else:
+            result = self.state_at_time(timestamp)
+        return result.world.get_country(country_name)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild the live loop's world state from checkpoints and the CSV log.")
+    parser.add_argument("country")
+    parser.add_argument("--log-file", default="auction_simulation_log.csv")
+    parser.add_argument("--checkpoint-dir", default="auction_checkpoints")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--auction-id", type=int)
+    group.add_argument("--timestamp")
+    args = parser.parse_args()
+
+    with ReplayEngine(args.log_file, args.checkpoint_dir) as engine:
+        country = engine.country_at(args.country, auction_id=args.auction_id, timestamp=args.timestamp)
+    print(country)
+    for resource_name, resource in sorted(country.resources.items()):
+        demand = country.get_demand(resource_name)
+        print(f"  {resource_name:<20}: supply {resource}" + (f" | demand {demand}" if demand else ""))
@@ -0,0 +1,100 @@
+import time
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Dict, Optional
+
+
+class SchedulerMode(Enum):
+    """How the auction loop is paced."""
+    PACED = "paced"          # sleep to hold a target auctions-per-second rate
+    FAST = "fast"            # never sleep, run as fast as possible
+    SIMULATED = "simulated"  # never sleep, timestamps advance on a virtual clock
+
+
+class TickScheduler:
+    """
+    Paces the live auction loop and provides the clock used for timestamps.
+
+    Call `tick()` once after every auction.
+    - PACED: sleeps until the next slot of a `rate` auctions/second schedule.
+      Slots are anchored to a deadline, so time spent running the auction
+      counts towards the interval. When the loop falls behind it re-anchors
+      instead of bursting to catch up.
+    - FAST: returns immediately; timestamps are wall-clock time.
+    - SIMULATED: returns immediately; `now()` starts at `start` and advances
+      by 1 / `rate` seconds per tick, independent of how long auctions take.
+    """
+
+    def __init__(self, rate: float = 1.0, mode: SchedulerMode = SchedulerMode.PACED, start: Optional[datetime] = None):
+        if mode != SchedulerMode.FAST and rate <= 0:
+            raise ValueError("Rate must be > 0")
+
+        self.rate = rate
+        self.mode = mode
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.ticks = 0
+
+        self._started = time.perf_counter()
+        self._deadline = self._started + self.interval
+        self._virtual_start = start or datetime.now()
+        self._virtual_now = self._virtual_start
+
+    @classmethod
+    def paced(cls, rate: float) -> "TickScheduler":
+        return cls(rate=rate, mode=SchedulerMode.PACED)
+
+    @classmethod
+    def fast(cls) -> "TickScheduler":
+        return cls(rate=0.0, mode=SchedulerMode.FAST)
+
+    @classmethod
+    def simulated(cls, rate: float, start: Optional[datetime] = None) -> "TickScheduler":
+        return cls(rate=rate, mode=SchedulerMode.SIMULATED, start=start)
+
+    def now(self) -> datetime:
+        """Current time according to this scheduler (virtual in SIMULATED mode)."""
+        if self.mode == SchedulerMode.SIMULATED:
+            return self._virtual_now
+        return datetime.now()
+
+    def tick(self) -> None:
+        """Mark one auction as done and wait for the next slot if pacing."""
+        self.ticks += 1
+
+        if self.mode == SchedulerMode.SIMULATED:
+            self._virtual_now = self._virtual_start + timedelta(seconds=self.ticks * self.interval)
+            return
+
+        if self.mode == SchedulerMode.PACED:
+            delay = self._deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+                self._deadline += self.interval
+            else:
+                self._deadline = time.perf_counter() + self.interval
+
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock seconds since the scheduler was created."""
+        return time.perf_counter() - self._started
+
+    def throughput(self) -> float:
+        """Achieved auctions per wall-clock second."""
+        elapsed = self.elapsed
+        return self.ticks / elapsed if elapsed > 0 else 0.0
+
+    def stats(self) -> Dict:
+        """Summary of the run so far."""
+        stats = {
+            "mode": self.mode.value,
+            "target_rate": self.rate if self.mode != SchedulerMode.FAST else None,
+            "ticks": self.ticks,
+            "elapsed_seconds": self.elapsed,
+            "achieved_rate": self.throughput(),
+        }
+        if self.mode == SchedulerMode.SIMULATED:
+            stats["virtual_elapsed_seconds"] = (self._virtual_now - self._virtual_start).total_seconds()
+        return stats
+
+    def __repr__(self) -> str:
+        return f"TickScheduler(mode={self.mode.value}, rate={self.rate}, ticks={self.ticks})"
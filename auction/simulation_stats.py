@@ -0,0 +1,229 @@
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, TextIO
+
+
+# Phases of `simulate_auction`, in the order of the printed report
+PHASE_DISTRIBUTION = "distribution"    # Phase 1: proportional split across clusters
+PHASE_VERIFICATION = "verification"    # Phase 2: checking the batch plan / seller stock
+PHASE_BIDDING = "bidding"              # collecting bidders, bid values, top two
+PHASE_SETTLEMENT = "settlement"        # budget check, transfers, demand decay, events
+PHASES = [PHASE_DISTRIBUTION, PHASE_VERIFICATION, PHASE_BIDDING, PHASE_SETTLEMENT]
+
+# Batch outcomes
+OUTCOME_SETTLED = "settled"
+OUTCOME_NO_BIDS = "no_bids"
+OUTCOME_BUDGET_FAILED = "budget_failed"
+OUTCOME_STOCK_EXHAUSTED = "stock_exhausted"
+
+# 1us .. ~16s in powers of two
+TIME_EDGES = [1e-6 * 2 ** i for i in range(25)]
+# 1 .. 65536 bidders in powers of two
+COUNT_EDGES = [float(2 ** i) for i in range(17)]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram: `counts[i]` counts values in [edges[i-1], edges[i]),
+    with one underflow and one overflow bucket. Also keeps count/total/min/max.
+    """
+
+    def __init__(self, edges: List[float]):
+        self.edges = edges
+        self.counts = [0] * (len(edges) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_right(self.edges, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper bucket edge below which at least `q` (0..1) of the values fall."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.edges[i] if i < len(self.edges) else self.max
+        return self.max
+
+    def merge(self, other: "Histogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count, "total": self.total, "mean": self.mean,
+            "min": self.min, "max": self.max,
+            "p50": self.percentile(0.5), "p99": self.percentile(0.99),
+        }
+
+
+@dataclass
+class GroupStats:
+    """Counters and histograms of all batches of one resource or one cluster."""
+    batches: int = 0
+    bids_evaluated: int = 0
+    bids_accepted: int = 0
+    settlements: int = 0
+    no_bids: int = 0
+    budget_failures: int = 0
+    stock_exhausted: int = 0
+    batch_time: Histogram = field(default_factory=lambda: Histogram(TIME_EDGES))
+    bidders: Histogram = field(default_factory=lambda: Histogram(COUNT_EDGES))
+    phase_time: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+
+    def record_batch(self, outcome: str, seconds: float, evaluated: int, accepted: int,
+                     bidding_time: float, settlement_time: float) -> None:
+        self.batches += 1
+        self.bids_evaluated += evaluated
+        self.bids_accepted += accepted
+        if outcome == OUTCOME_SETTLED:
+            self.settlements += 1
+        elif outcome == OUTCOME_NO_BIDS:
+            self.no_bids += 1
+        elif outcome == OUTCOME_BUDGET_FAILED:
+            self.budget_failures += 1
+        elif outcome == OUTCOME_STOCK_EXHAUSTED:
+            self.stock_exhausted += 1
+        self.batch_time.record(seconds)
+        if outcome != OUTCOME_STOCK_EXHAUSTED:
+            self.bidders.record(evaluated)
+        self.phase_time[PHASE_BIDDING] += bidding_time
+        self.phase_time[PHASE_SETTLEMENT] += settlement_time
+
+    def merge(self, other: "GroupStats") -> None:
+        for name in ("batches", "bids_evaluated", "bids_accepted", "settlements",
+                     "no_bids", "budget_failures", "stock_exhausted"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.batch_time.merge(other.batch_time)
+        self.bidders.merge(other.bidders)
+        for phase, seconds in other.phase_time.items():
+            self.phase_time[phase] = self.phase_time.get(phase, 0.0) + seconds
+
+    def to_dict(self) -> Dict:
+        return {
+            "batches": self.batches, "bids_evaluated": self.bids_evaluated,
+            "bids_accepted": self.bids_accepted, "settlements": self.settlements,
+            "no_bids": self.no_bids, "budget_failures": self.budget_failures,
+            "stock_exhausted": self.stock_exhausted,
+            "batch_time": self.batch_time.to_dict(), "bidders": self.bidders.to_dict(),
+            "phase_time": dict(self.phase_time),
+        }
+
+
+class SimulationStats:
+    """
+    Optional timers and counters for `simulate_auction`.
+
+    Pass one instance as `stats=` to any number of auctions; it aggregates
+    wall time per phase, per-batch outcomes and bid counts, and histograms of
+    batch and auction times, overall as well as per resource and per cluster.
+    When no stats object is passed the core takes no timings at all.
+
+    Example:
+        stats = SimulationStats()
+        run_auction_and_capture_data(world, 1, seller, "COPPER", 5.0, 0.5, stats=stats)
+        stats.report()
+    """
+
+    def __init__(self):
+        self.auctions = 0
+        self.rejected = 0
+        self.auction_time = Histogram(TIME_EDGES)
+        self.phase_time: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.totals = GroupStats()
+        self.by_resource: Dict[str, GroupStats] = {}
+        self.by_cluster: Dict[str, GroupStats] = {}
+        self.auction_time_by_resource: Dict[str, Histogram] = {}
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        self.phase_time[phase] += seconds
+
+    def record_batch(self, resource_name: str, cluster_name: str, outcome: str, seconds: float,
+                     evaluated: int = 0, accepted: int = 0,
+                     bidding_time: float = 0.0, settlement_time: float = 0.0) -> None:
+        self.phase_time[PHASE_BIDDING] += bidding_time
+        self.phase_time[PHASE_SETTLEMENT] += settlement_time
+        for group in (
+            self.totals,
+            self.by_resource.get(resource_name) or self.by_resource.setdefault(resource_name, GroupStats()),
+            self.by_cluster.get(cluster_name) or self.by_cluster.setdefault(cluster_name, GroupStats()),
+        ):
+            group.record_batch(outcome, seconds, evaluated, accepted, bidding_time, settlement_time)
+
+    def record_auction(self, resource_name: str, seconds: float, rejected: bool = False) -> None:
+        self.auctions += 1
+        if rejected:
+            self.rejected += 1
+        self.auction_time.record(seconds)
+        histogram = self.auction_time_by_resource.get(resource_name)
+        if histogram is None:
+            histogram = self.auction_time_by_resource[resource_name] = Histogram(TIME_EDGES)
+        histogram.record(seconds)
+
+    def merge(self, other: "SimulationStats") -> None:
+        self.auctions += other.auctions
+        self.rejected += other.rejected
+        self.auction_time.merge(other.auction_time)
+        for phase, seconds in other.phase_time.items():
+            self.phase_time[phase] += seconds
+        self.totals.merge(other.totals)
+        for mine, theirs in ((self.by_resource, other.by_resource), (self.by_cluster, other.by_cluster)):
+            for name, group in theirs.items():
+                mine.setdefault(name, GroupStats()).merge(group)
+        for name, histogram in other.auction_time_by_resource.items():
+            self.auction_time_by_resource.setdefault(name, Histogram(TIME_EDGES)).merge(histogram)
+
+    def to_dict(self) -> Dict:
+        return {
+            "auctions": self.auctions,
+            "rejected": self.rejected,
+            "auction_time": self.auction_time.to_dict(),
+            "phase_time": dict(self.phase_time),
+            "totals": self.totals.to_dict(),
+            "by_resource": {name: group.to_dict() for name, group in self.by_resource.items()},
+            "by_cluster": {name: group.to_dict() for name, group in self.by_cluster.items()},
+        }
+
+    def report(self, file: Optional[TextIO] = None) -> None:
+        """Print a summary table."""
+        out = file or sys.stdout
+        t = self.totals
+        print(f"Auctions: {self.auctions} ({self.rejected} rejected) | "
+              f"mean {self.auction_time.mean * 1e3:.3f} ms, p99 <= {self.auction_time.percentile(0.99) * 1e3:.3f} ms", file=out)
+        print(f"Batches: {t.batches} | bids evaluated {t.bids_evaluated}, accepted {t.bids_accepted} | "
+              f"settled {t.settlements}, no bids {t.no_bids}, budget failures {t.budget_failures}, "
+              f"stock exhausted {t.stock_exhausted}", file=out)
+
+        total_phase_time = sum(self.phase_time.values()) or 1.0
+        print("Time per phase:", file=out)
+        for phase in PHASES:
+            seconds = self.phase_time[phase]
+            print(f"  {phase:<14}: {seconds * 1e3:10.2f} ms ({seconds / total_phase_time:6.1%})", file=out)
+
+        for title, groups in (("resource", self.by_resource), ("cluster", self.by_cluster)):
+            print(f"By {title}:", file=out)
+            for name, group in sorted(groups.items(), key=lambda item: item[1].batch_time.total, reverse=True):
+                print(f"  {name:<30}: {group.batches:6d} batches, {group.bidders.mean:6.1f} bidders/batch, "
+                      f"{group.batch_time.total * 1e3:9.2f} ms, {group.budget_failures} budget failures", file=out)
@@ -0,0 +1,248 @@
+import atexit
+import csv
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .auction_events import CSV_HEADERS
+    from .log_index import LogIndex
+except ImportError:
+    from auction_events import CSV_HEADERS
+    from log_index import LogIndex
+
+
+class _LineCollector:
+    """File-like target for `csv.writer` that keeps the rendered text."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+
+
+def _find_cut(path: str, auction_id: int) -> Tuple[int, int, int]:
+    """
+    Scan a CSV log file for the rows of auctions after `auction_id`.
+
+    Returns:
+        (header size, byte offset of the first row to drop - the file size
+        if there is none, number of complete rows from there on). A partly
+        written last row is dropped as well.
+    """
+    with open(path, 'rb') as f:
+        header_bytes = len(f.readline())
+        offset = header_bytes
+        cut = None
+        dropped = 0
+        for line in f:
+            complete = line.endswith(b"\n")
+            if cut is None and (not complete or int(line.split(b",", 1)[0]) > auction_id):
+                cut = offset
+            if cut is not None and complete:
+                dropped += 1
+            offset += len(line)
+    return header_bytes, offset if cut is None else cut, dropped
+
+
+class TransactionLogger:
+    """
+    Long-lived, buffered CSV writer for auction transaction rows.
+
+    The file handle stays open for the whole run. Rows are buffered in memory
+    and written in one go once `flush_rows` rows are pending or
+    `flush_interval` seconds have passed since the last flush. When the
+    current file grows past `max_bytes` it is rotated: the file is renamed to
+    `<stem>.<n><suffix>` (n = 1, 2, ...) and a fresh file with a header is
+    started at `path`.
+
+    Pending rows are flushed by `close()`, by leaving a `with` block (also on
+    KeyboardInterrupt) and, as a last resort, at interpreter exit.
+
+    With `build_index=True` a `LogIndex` of every written row is maintained
+    as rows are flushed and saved next to each file (and each rotated segment).
+
+    Example:
+        with TransactionLogger("auction_simulation_log.csv") as logger:
+            logger.write_rows(rows)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fieldnames: Optional[List[str]] = None,
+        flush_rows: int = 1000,
+        flush_interval: float = 1.0,
+        max_bytes: Optional[int] = None,
+        append: bool = False,
+        build_index: bool = False,
+        index_bucket_seconds: int = 60
+    ):
+        self.path = path
+        self.fieldnames = list(fieldnames or CSV_HEADERS)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.append = append
+        self.build_index = build_index
+        self.index_bucket_seconds = index_bucket_seconds
+        self.index: Optional[LogIndex] = None
+
+        self.rows_written = 0
+        self.segments: List[str] = []
+
+        self._buffer: List[Dict] = []
+        self._file = None
+        self._writer = None
+        self._last_flush = time.monotonic()
+
+    def open(self) -> "TransactionLogger":
+        """Open (or create) the log file. Raises OSError if it can't be opened."""
+        if self._file is not None:
+            return self
+
+        write_header = not (self.append and os.path.exists(self.path) and os.path.getsize(self.path) > 0)
+        self._file = open(self.path, 'a' if self.append else 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        if write_header:
+            self._writer.writeheader()
+        self._file.flush()
+
+        if self.build_index:
+            if write_header:
+                self.index = LogIndex(self.path, bucket_seconds=self.index_bucket_seconds)
+            else:
+                self.index = LogIndex.load(self.path)
+            self.index.indexed_bytes = os.path.getsize(self.path)
+
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+        return self
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered rows not yet written."""
+        return len(self._buffer)
+
+    def write_rows(self, rows: List[Dict]) -> None:
+        """Buffer rows, flushing if a threshold has been reached."""
+        if rows:
+            self._buffer.extend(rows)
+        if len(self._buffer) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered rows to disk and rotate if the file is too large."""
+        self._last_flush = time.monotonic()
+        if not self._buffer or self._file is None:
+            return
+
+        if self.index is None:
+            self._writer.writerows(self._buffer)
+        else:
+            self._write_indexed(self._buffer)
+        self.rows_written += len(self._buffer)
+        self._buffer.clear()
+        self._file.flush()
+
+        if self.max_bytes is not None and self._file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def _write_indexed(self, rows: List[Dict]) -> None:
+        """Render rows one by one so each row's byte offset can be indexed."""
+        collector = _LineCollector()
+        writer = csv.DictWriter(collector, fieldnames=self.fieldnames)
+        position = self.index.indexed_bytes
+        for row in rows:
+            start = len(collector.parts)
+            writer.writerow(row)
+            self.index.add(row, position)
+            position += sum(len(part.encode('utf-8')) for part in collector.parts[start:])
+        self._file.write("".join(collector.parts))
+        self.index.indexed_bytes = position
+
+    def _segment_path(self, n: int) -> str:
+        stem, suffix = os.path.splitext(self.path)
+        return f"{stem}.{n}{suffix}"
+
+    def truncate_after(self, auction_id: int) -> int:
+        """
+        Drop the rows of auctions after `auction_id` from the log and its
+        rotated segments, e.g. before resuming from a checkpoint taken at
+        `auction_id`, so the resumed run doesn't log those auctions twice.
+        Rows are in auction order, so only the newest files are touched;
+        segments left without rows are removed, and the saved index of a
+        truncated file is deleted (it is rebuilt on the next load).
+        Call before `open()`. Returns the number of rows dropped.
+        """
+        files = []
+        n = 1
+        while os.path.exists(self._segment_path(n)):
+            files.append(self._segment_path(n))
+            n += 1
+        if os.path.exists(self.path):
+            files.append(self.path)
+
+        dropped = 0
+        for file_path in reversed(files):
+            header_bytes, cut, file_dropped = _find_cut(file_path, auction_id)
+            dropped += file_dropped
+            if cut < os.path.getsize(file_path):
+                if cut <= header_bytes and file_path != self.path:
+                    os.remove(file_path)
+                else:
+                    os.truncate(file_path, cut)
+                index_path = LogIndex.index_path(file_path)
+                if os.path.exists(index_path):
+                    os.remove(index_path)
+            if cut > header_bytes:
+                break
+        return dropped
+
+    def rotate(self) -> str:
+        """Close the current file, move it to the next segment name and start a new one."""
+        self.flush()
+        self._file.close()
+
+        n = len(self.segments) + 1
+        while os.path.exists(self._segment_path(n)):
+            n += 1
+        segment = self._segment_path(n)
+        os.replace(self.path, segment)
+        self.segments.append(segment)
+
+        if self.index is not None:
+            self.index.path = segment
+            self.index.save()
+
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        self._writer.writeheader()
+        self._file.flush()
+
+        if self.index is not None:
+            self.index = LogIndex(self.path, bucket_seconds=self.index_bucket_seconds)
+            self.index.indexed_bytes = os.path.getsize(self.path)
+        return segment
+
+    def close(self) -> None:
+        """Flush pending rows and close the file. Safe to call more than once."""
+        if self._file is None:
+            return
+        try:
+            self.flush()
+            os.fsync(self._file.fileno())
+            if self.index is not None:
+                self.index.save()
+        finally:
+            self._file.close()
+            self._file = None
+            self._writer = None
+            atexit.unregister(self.close)
+
+    def __enter__(self) -> "TransactionLogger":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,16 @@
+from .harness import Benchmark, BenchmarkResult, compare_results, load_results, save_results
+from .synthetic import synthetic_world
+from .micro import micro_benchmarks
+from .macro import macro_benchmarks, SYNTHETIC_SIZES
+
+__all__ = [
+    'Benchmark',
+    'BenchmarkResult',
+    'compare_results',
+    'load_results',
+    'save_results',
+    'synthetic_world',
+    'micro_benchmarks',
+    'macro_benchmarks',
+    'SYNTHETIC_SIZES',
+]
@@ -0,0 +1,81 @@
+"""
+Benchmark runner.
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks run --quick --compare baseline.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.1
+
+`run` exits with status 1 when `--compare` finds a regression, so it can gate CI.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.harness import compare_results, load_results, print_comparison, print_results, save_results
+from benchmarks.macro import SYNTHETIC_SIZES, macro_benchmarks
+from benchmarks.micro import micro_benchmarks
+
+
+def _compare(baseline_path: str, current, threshold: float) -> int:
+    comparisons, regressions = compare_results(load_results(baseline_path), current, threshold)
+    print(f"\nCompared with {baseline_path} (threshold {threshold:.0%}):")
+    print_comparison(comparisons, threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): " + ", ".join(c.name for c in regressions))
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Auction engine benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks")
+    run.add_argument("--group", choices=["micro", "macro", "all"], default="all")
+    run.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this")
+    run.add_argument("--sizes", type=int, nargs="*", default=list(SYNTHETIC_SIZES),
+                     help="Synthetic world sizes for the macro benchmarks")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--quick", action="store_true", help="Run 10x fewer iterations (noisier)")
+    run.add_argument("--output", default=None, help="Write the results as JSON")
+    run.add_argument("--compare", default=None, help="Baseline JSON to compare against")
+    run.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown before flagging (default 0.10)")
+
+    compare = commands.add_parser("compare", help="Compare two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return _compare(args.baseline, load_results(args.current), args.threshold)
+
+    benchmarks = []
+    if args.group in ("micro", "all"):
+        benchmarks += micro_benchmarks()
+    if args.group in ("macro", "all"):
+        benchmarks += macro_benchmarks(sizes=args.sizes, seed=args.seed)
+    if args.filter:
+        benchmarks = [b for b in benchmarks if args.filter in b.name]
+
+    results = []
+    for benchmark in benchmarks:
+        result = benchmark.run(scale=0.1 if args.quick else 1.0)
+        print_results([result])
+        results.append(result)
+
+    if args.output:
+        save_results(args.output, results)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        return _compare(args.compare, {r.name: {"median": r.median} for r in results}, args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
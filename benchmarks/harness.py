@@ -0,0 +1,140 @@
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark, in seconds per operation."""
+    name: str
+    group: str
+    number: int
+    repeat: int
+    median: float
+    minimum: float
+    maximum: float
+    timings: List[float] = field(default_factory=list)
+
+    @property
+    def ops_per_sec(self) -> float:
+        return 1.0 / self.median if self.median > 0 else float("inf")
+
+
+@dataclass
+class Benchmark:
+    """
+    A named benchmark.
+
+    `setup()` runs before every repeat (untimed) and returns the argument
+    passed to `func`; `func(arg)` is then timed `number` times in a row.
+    Setups must be seeded so every run does the same work.
+    """
+    name: str
+    group: str
+    func: Callable[[Any], Any]
+    setup: Callable[[], Any] = lambda: None
+    number: int = 1000
+    repeat: int = 5
+
+    def run(self, scale: float = 1.0) -> BenchmarkResult:
+        number = max(1, int(self.number * scale))
+        timings = []
+        for _ in range(self.repeat):
+            arg = self.setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                self.func(arg)
+            timings.append((time.perf_counter() - start) / number)
+        return BenchmarkResult(
+            name=self.name,
+            group=self.group,
+            number=number,
+            repeat=self.repeat,
+            median=statistics.median(timings),
+            minimum=min(timings),
+            maximum=max(timings),
+            timings=timings
+        )
+
+
+def environment() -> Dict[str, str]:
+    """Where the results were measured, stored next to them."""
+    return {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": str(os.cpu_count()),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def save_results(path: str, results: List[BenchmarkResult]) -> None:
+    payload = {
+        "environment": environment(),
+        "results": {result.name: asdict(result) for result in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline > 0 else float("inf")
+
+
+def compare_results(
+    baseline: Dict[str, Dict],
+    current: Dict[str, Dict],
+    threshold: float = 0.10
+) -> Tuple[List[Comparison], List[Comparison]]:
+    """
+    Compare median times of the benchmarks present in both result sets.
+    Returns (all comparisons, regressions), a regression being a benchmark
+    more than `threshold` (10% by default) slower than the baseline.
+    """
+    comparisons = [
+        Comparison(name, baseline[name]["median"], current[name]["median"])
+        for name in current if name in baseline
+    ]
+    regressions = [c for c in comparisons if c.ratio > 1.0 + threshold]
+    return comparisons, regressions
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, factor in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def print_results(results: List[BenchmarkResult], file=None) -> None:
+    for result in results:
+        print(f"  {result.name:<48} {format_seconds(result.median)}/op "
+              f"(min {format_seconds(result.minimum).strip()}, {result.number} x {result.repeat})", file=file)
+
+
+def print_comparison(comparisons: List[Comparison], threshold: float, file=None) -> None:
+    for c in comparisons:
+        flag = "REGRESSION" if c.ratio > 1.0 + threshold else ("faster" if c.ratio < 1.0 - threshold else "")
+        print(f"  {c.name:<48} {format_seconds(c.baseline)} -> {format_seconds(c.current)}  "
+              f"x{c.ratio:5.2f}  {flag}", file=file)
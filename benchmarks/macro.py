@@ -0,0 +1,59 @@
+import random
+from typing import Callable, List, Sequence
+
+from auction.auction_manager import pick_random_auction, run_auction_and_capture_data
+from models.market_index import SurplusIndex
+from models.world import World
+
+from .harness import Benchmark
+from .synthetic import synthetic_world
+
+
+SYNTHETIC_SIZES = (1_000, 10_000, 100_000)
+
+
+class _AuctionRun:
+    """A world plus the seeded RNG and index the live loop would use with it."""
+
+    def __init__(self, world: World, seed: int):
+        self.world = world
+        self.rng = random.Random(seed)
+        self.countries = world.all_countries()
+        self.surplus_index = SurplusIndex.from_countries(self.countries)
+        self.auction_id = 0
+
+    def next_auction(self) -> None:
+        """Run one auction exactly like `random_auction_loop_with_logging` does."""
+        picked = None
+        while picked is None:
+            picked = pick_random_auction(self.countries, self.rng, surplus_index=self.surplus_index)
+        seller, resource_name, quantity = picked
+        self.auction_id += 1
+        run_auction_and_capture_data(
+            self.world, self.auction_id, seller, resource_name, quantity, 0.5,
+            rng=self.rng, surplus_index=self.surplus_index
+        )
+
+
+def _auction_setup(make_world: Callable[[], World], seed: int) -> Callable[[], _AuctionRun]:
+    return lambda: _AuctionRun(make_world(), seed)
+
+
+def macro_benchmarks(sizes: Sequence[int] = SYNTHETIC_SIZES, seed: int = 42) -> List[Benchmark]:
+    """
+    End-to-end `run_auction_and_capture_data` on the stock world and on
+    synthetic worlds. Every repeat starts from a freshly built world and
+    runs the same seeded sequence of auctions.
+    """
+    benchmarks = [
+        Benchmark("auction.stock_world", "macro", _AuctionRun.next_auction,
+                  setup=_auction_setup(World.from_country_data, seed), number=200, repeat=5),
+    ]
+    for size in sizes:
+        make_world = (lambda size=size: synthetic_world(size, seed=seed))
+        benchmarks.append(Benchmark(
+            f"auction.synthetic_{size}", "macro", _AuctionRun.next_auction,
+            setup=_auction_setup(make_world, seed),
+            number=max(1, 20_000 // size), repeat=3
+        ))
+    return benchmarks
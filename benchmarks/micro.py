@@ -0,0 +1,73 @@
+import random
+from typing import List
+
+import numpy as np
+
+from auction.auction_manager import AuctionManager
+from models.cluster import plan_batch_fractions
+from models.world import World
+
+from .harness import Benchmark
+
+
+def _laplace_inputs(seed: int = 0, size: int = 1000):
+    rng = random.Random(seed)
+    return [
+        (rng.uniform(0.1, 50.0), rng.uniform(0.1, 50.0), rng.uniform(0.1, 10.0))
+        for _ in range(size)
+    ]
+
+
+def _bench_laplace(inputs) -> None:
+    for supply, demand, quantity in inputs:
+        AuctionManager.laplace(0.5, supply, demand, quantity)
+
+
+def _laplace_batch_inputs(seed: int = 0, size: int = 1000):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.1, 50.0, size), rng.uniform(0.1, 50.0, size), 5.0
+
+
+def _bench_laplace_batch(inputs) -> None:
+    supply, demand, quantity = inputs
+    AuctionManager.laplace_batch(0.5, supply, demand, quantity)
+
+
+def _stock_world() -> World:
+    return World.from_country_data()
+
+
+def _bench_assign_auction_quantity(world: World) -> None:
+    seller = world.get_country("Russia")
+    for cluster_info in world.clusters:
+        cluster_info.assign_auction_quantity(50.0, world.total_country_count, seller=seller)
+
+
+def _bench_plan_batches_uncached(world: World) -> None:
+    plan_batch_fractions.cache_clear()
+    seller = world.get_country("Russia")
+    for cluster_info in world.clusters:
+        cluster_info.plan_batches(50.0, world.total_country_count, seller=seller)
+
+
+def _bench_supply_demand_analysis(world: World) -> None:
+    for country in world.countries.values():
+        country.get_all_supply_demand_analysis()
+
+
+def micro_benchmarks() -> List[Benchmark]:
+    """Hot helpers of the engine and the models, each on fixed inputs."""
+    return [
+        Benchmark("laplace.scalar_x1000", "micro", _bench_laplace,
+                  setup=_laplace_inputs, number=20),
+        Benchmark("laplace.batch_1000", "micro", _bench_laplace_batch,
+                  setup=_laplace_batch_inputs, number=2000),
+        # ClusterInfo._calculate_and_store_batches was replaced by the cached
+        # planner; these time the planner through both entry points.
+        Benchmark("cluster.assign_auction_quantity_all_clusters", "micro", _bench_assign_auction_quantity,
+                  setup=_stock_world, number=2000),
+        Benchmark("cluster.plan_batches_uncached_all_clusters", "micro", _bench_plan_batches_uncached,
+                  setup=_stock_world, number=2000),
+        Benchmark("country.get_all_supply_demand_analysis_stock_world", "micro", _bench_supply_demand_analysis,
+                  setup=_stock_world, number=200),
+    ]
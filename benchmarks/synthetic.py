@@ -0,0 +1,54 @@
+import random
+from typing import List
+
+from models.cluster import ClusterInfo
+from models.country import Country
+from models.resourcess import Resource
+from models.world import World
+
+
+def synthetic_world(
+    num_countries: int,
+    num_resources: int = 20,
+    countries_per_cluster: int = 50,
+    resources_per_country: int = 4,
+    seed: int = 0
+) -> World:
+    """
+    Build a reproducible random world of `num_countries` countries.
+
+    Countries are sorted by PPP and cut into clusters of
+    `countries_per_cluster` (like the PPP-based k-means clusters of the
+    stock world). Each country supplies and demands `resources_per_country`
+    random resources out of `num_resources`, so demand is sparse.
+    """
+    rng = random.Random(seed)
+    resource_names = [f"RESOURCE_{j:03d}" for j in range(num_resources)]
+    per_country = min(resources_per_country, num_resources)
+
+    countries: List[Country] = []
+    for i in range(num_countries):
+        country = Country(f"Country {i:06d}", rng.randint(1000, 90000))
+        country.resources = {
+            name: Resource(round(rng.lognormvariate(2.0, 1.0), 4), "units")
+            for name in rng.sample(resource_names, per_country)
+        }
+        country.demand = {
+            name: Resource(round(rng.lognormvariate(1.5, 1.0), 4), "units")
+            for name in rng.sample(resource_names, per_country)
+        }
+        countries.append(country)
+
+    countries.sort(key=lambda c: (c.ppp, c.name))
+
+    clusters = []
+    for start in range(0, len(countries), countries_per_cluster):
+        members = countries[start:start + countries_per_cluster]
+        clusters.append(ClusterInfo(
+            name=f"Synthetic cluster {start // countries_per_cluster + 1}",
+            countries=members,
+            min_ppp=members[0].ppp,
+            max_ppp=members[-1].ppp,
+            budget=50.0 * len(members)
+        ))
+    return World(clusters)
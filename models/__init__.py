@@ -1,13 +1,24 @@
 from .country import Country
-from .cluster import ClusterInfo
+from .cluster import ClusterInfo, BatchSchedule
 from .cluster_enums import CountryClusters, get_cluster_country_budgets 
 from .resourcess import Resource, GlobalResources
+from .world_state import WorldState, CountryView
+from .market_index import SurplusIndex
+from .world import World
+from .world_fork import WorldFork, CountryFork
 
 __all__ = [
     'Country',
     'ClusterInfo',
+    'BatchSchedule',
     'CountryClusters',
     'get_cluster_country_budgets', 
     'Resource',
     'GlobalResources',
+    'WorldState',
+    'CountryView',
+    'SurplusIndex',
+    'World',
+    'WorldFork',
+    'CountryFork',
 ]
@@ -1,8 +1,60 @@
+import math
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, Iterator
 from .country import Country
 
 
+@lru_cache(maxsize=None)
+def plan_batch_fractions(country_count: int, total_countries_in_world: int, seller_in_cluster: bool) -> Tuple[float, Tuple[float, ...]]:
+    """
+    Pure, cached batch plan of a cluster as (quantity share, batch fractions).
+
+    The share is the cluster's fraction of all countries in the world. The
+    cluster's quantity is split into n-1 batches (n = potential bidders, i.e.
+    without the seller): every batch is half of what is left and the last one
+    takes the rest, so batch k is 2^-k of the total and the last batch
+    repeats the one before it.
+    """
+    if total_countries_in_world == 0:
+        return 0.0, ()
+
+    share = float(country_count) / float(total_countries_in_world)
+
+    n = country_count - 1 if seller_in_cluster else country_count
+    if n <= 1:
+        return share, (1.0,)
+
+    num_batches = n - 1
+    fractions = tuple(math.ldexp(1.0, -batch_num) for batch_num in range(1, num_batches))
+    return share, fractions + (math.ldexp(1.0, -(num_batches - 1)),)
+
+
+@dataclass(frozen=True)
+class BatchSchedule:
+    """Immutable batch plan of one cluster for one auction."""
+    cluster_name: str
+    auction_quantity: float
+    batches: Tuple[float, ...] = ()
+
+    @property
+    def num_batches(self) -> int:
+        return len(self.batches)
+
+    def get_batch_quantity(self, batch_num: int) -> Optional[float]:
+        """Quantity of a batch (1-indexed), or None if it doesn't exist."""
+        if 1 <= batch_num <= len(self.batches):
+            return self.batches[batch_num - 1]
+        return None
+
+    def items(self) -> Iterator[Tuple[int, float]]:
+        """(batch_num, quantity) pairs in batch order."""
+        return enumerate(self.batches, start=1)
+
+    def as_dict(self) -> Dict[int, float]:
+        return dict(self.items())
+
+
 @dataclass
 class ClusterInfo:
     """Represents a K-means cluster with metadata."""
@@ -13,6 +65,7 @@ class ClusterInfo:
     budget: float = 0.0
     auction_quantity: Optional[float] = None
     auction_batches: Dict[int, float] = field(default_factory=dict)  
+    _bidder_index: Dict[str, List[Country]] = field(default_factory=dict, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """After initialization, calculate and assign budgets to all countries."""
@@ -45,6 +98,46 @@ class ClusterInfo:
         for country in self.countries:
             country.budget = (country.ppp / cluster_total_ppp) * self.budget
     
+    def get_bidders(self, resource_name: str) -> List[Country]:
+        """
+        Countries of this cluster with a positive demand for `resource_name`,
+        in cluster order. Built on first use and cached per resource; call
+        `update_bidder` after changing a country's demand and
+        `invalidate_bidders` after replacing `countries`.
+        """
+        bidders = self._bidder_index.get(resource_name)
+        if bidders is None:
+            bidders = []
+            for country in self.countries:
+                demand = country.get_demand(resource_name)
+                if demand and demand.amount > 0:
+                    bidders.append(country)
+            self._bidder_index[resource_name] = bidders
+        return bidders
+
+    def update_bidder(self, country: Country, resource_name: str) -> None:
+        """Keep the cached bidders of `resource_name` in sync after `country`'s demand changed."""
+        bidders = self._bidder_index.get(resource_name)
+        if bidders is None:
+            return
+
+        demand = country.get_demand(resource_name)
+        eligible = bool(demand and demand.amount > 0)
+        position = next((i for i, bidder in enumerate(bidders) if bidder is country), None)
+
+        if not eligible and position is not None:
+            del bidders[position]
+        elif eligible and position is None:
+            # Rare: rebuild on next use so cluster order is kept
+            del self._bidder_index[resource_name]
+
+    def invalidate_bidders(self, resource_name: Optional[str] = None) -> None:
+        """Drop the cached bidders of one resource, or of all resources."""
+        if resource_name is None:
+            self._bidder_index.clear()
+        else:
+            self._bidder_index.pop(resource_name, None)
+
     def calculate_country_budgets(self) -> Dict[str, float]:
         """
         Calculate budget allocation for each country in this cluster.
@@ -60,54 +153,41 @@ class ClusterInfo:
         
         return country_budgets
     
+    def plan_batches(self, total_auction_quantity: float, total_countries_in_world: int, seller: Country = None) -> BatchSchedule:
+        """
+        Plan this cluster's share of an auction without touching the cluster.
+
+        The cluster gets quantity in proportion to its share of the world's
+        countries, divided into n-1 halving batches where n = number of
+        *potential bidders* (see `plan_batch_fractions`).
+        
+        Args:
+            total_auction_quantity: Total resource quantity to distribute (e.g., 50.0)
+            total_countries_in_world: The sum of countries in all clusters (e.g., 30)
+            seller (Optional): The country selling. This is used to calculate n-1 batches.
+        """
+        seller_in_cluster = bool(seller) and seller in self.countries
+        share, fractions = plan_batch_fractions(self.country_count, total_countries_in_world, seller_in_cluster)
+        auction_quantity = total_auction_quantity * share
+
+        if auction_quantity == 0:
+            return BatchSchedule(self.name, auction_quantity)
+        return BatchSchedule(self.name, auction_quantity, tuple(auction_quantity * f for f in fractions))
+
     def assign_auction_quantity(self, total_auction_quantity: float, total_countries_in_world: int, seller: Country = None) -> None:
         """
         Calculate and assign the auction quantity for this cluster based on its
         proportional share of the total world countries.
+        Stores the result of `plan_batches` in `auction_quantity` / `auction_batches`.
         
         Args:
             total_auction_quantity: Total resource quantity to distribute (e.g., 50.0)
             total_countries_in_world: The sum of countries in all clusters (e.g., 30)
             seller (Optional): The country selling. This is used to calculate n-1 batches.
         """
-        if total_countries_in_world == 0:
-            self.auction_quantity = 0.0
-        else:
-            proportional_share = float(self.country_count) / float(total_countries_in_world)
-            self.auction_quantity = total_auction_quantity * proportional_share
-        
-        self._calculate_and_store_batches(seller)
-    
-    def _calculate_and_store_batches(self, seller: Country = None) -> None:
-        """
-        Internal method to calculate and store batch quantities.
-        Divides auction_quantity into n-1 batches where n = number of *potential bidders*.
-        """
-        if self.auction_quantity is None or self.auction_quantity == 0:
-            self.auction_batches = {}
-            return
-        
-        n = self.country_count
-        if seller and seller in self.countries:
-            n -= 1 
-            
-        num_batches = max(1, n - 1)
-        
-        if n <= 1:
-            self.auction_batches = {1: self.auction_quantity}
-            return
-        
-        self.auction_batches = {}
-        remaining_quantity = self.auction_quantity
-        
-        for batch_num in range(1, num_batches + 1):
-            if batch_num == num_batches:
-                self.auction_batches[batch_num] = remaining_quantity
-                remaining_quantity = 0.0
-            else:
-                batch_quantity = remaining_quantity / 2.0
-                self.auction_batches[batch_num] = batch_quantity
-                remaining_quantity -= batch_quantity
+        schedule = self.plan_batches(total_auction_quantity, total_countries_in_world, seller)
+        self.auction_quantity = schedule.auction_quantity
+        self.auction_batches = schedule.as_dict()
     
     def get_batch_quantity(self, batch_num: int) -> Optional[float]:
         """
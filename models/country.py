@@ -19,12 +19,13 @@ class Country:
     def __post_init__(self):
         """After initialization, load resources for this country from country_data."""
                 
-        # Get resources for this country and assign them
+        # Get resources for this country and assign them (own Resource
+        # objects, so countries never share amounts with each other or country_data)
         if self.name in country_resources:
-            self.resources = country_resources[self.name].copy()
+            self.resources = {name: Resource(r.amount, r.unit) for name, r in country_resources[self.name].items()}
 
         if self.name in country_demands:
-            self.demand = country_demands[self.name].copy()
+            self.demand = {name: Resource(r.amount, r.unit) for name, r in country_demands[self.name].items()}
     
     def get_resource(self, resource_name: str) -> Optional[Resource]:
         """Get a specific resource by name."""
@@ -0,0 +1,79 @@
+from typing import Dict, Iterable, List, Set
+
+from .country import Country
+
+
+class SurplusIndex:
+    """
+    World-level index of who can export and who needs to import each resource.
+
+    Keeps resource -> surplus countries, resource -> deficit countries and
+    country -> surplus resources, using the same SURPLUS / DEFICIT rule as
+    `Country.get_supply_demand_gap`. After a trade only the (country, resource)
+    pairs that changed need `update()`, which is O(1), instead of rebuilding
+    `get_all_supply_demand_analysis()` for the whole country.
+    """
+
+    def __init__(self):
+        self.countries: Dict[str, Country] = {}
+        self.exporters: Dict[str, Set[str]] = {}
+        self.importers: Dict[str, Set[str]] = {}
+        self.exports_of: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_countries(cls, countries: Iterable[Country]) -> "SurplusIndex":
+        index = cls()
+        for country in countries:
+            index.add_country(country)
+        return index
+
+    @classmethod
+    def from_clusters(cls, clusters) -> "SurplusIndex":
+        """Build from an iterable of `ClusterInfo` objects or `CountryClusters` members."""
+        countries = []
+        for cluster in clusters:
+            countries.extend(getattr(cluster, "value", cluster).countries)
+        return cls.from_countries(countries)
+
+    def add_country(self, country: Country) -> None:
+        self.countries[country.name] = country
+        self.exports_of.setdefault(country.name, set())
+        for resource_name in set(country.resources.keys()) | set(country.demand.keys()):
+            self.update(country, resource_name)
+
+    def update(self, country: Country, resource_name: str) -> None:
+        """Re-classify one (country, resource) pair after its supply or demand changed."""
+        supply = country.resources.get(resource_name)
+        demand = country.demand.get(resource_name)
+        gap = (supply.amount if supply else 0.0) - (demand.amount if demand else 0.0)
+
+        exporters = self.exporters.setdefault(resource_name, set())
+        importers = self.importers.setdefault(resource_name, set())
+        exports = self.exports_of.setdefault(country.name, set())
+
+        if gap > 0:
+            exporters.add(country.name)
+            exports.add(resource_name)
+        else:
+            exporters.discard(country.name)
+            exports.discard(resource_name)
+
+        if gap < 0:
+            importers.add(country.name)
+        else:
+            importers.discard(country.name)
+
+    def get_exporters(self, resource_name: str) -> List[str]:
+        """Countries with a surplus of `resource_name`, sorted by name."""
+        return sorted(self.exporters.get(resource_name, ()))
+
+    def get_importers(self, resource_name: str) -> List[str]:
+        """Countries with a deficit of `resource_name`, sorted by name."""
+        return sorted(self.importers.get(resource_name, ()))
+
+    def get_export_resources(self, country_name: str) -> List[str]:
+        """Same resources as `Country.get_export_resources`, sorted by name."""
+        return sorted(self.exports_of.get(country_name, ()))
+
+    def __repr__(self) -> str:
+        return f"SurplusIndex(countries={len(self.countries)}, resources={len(self.exporters)})"
@@ -0,0 +1,132 @@
+import copy
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .country import Country
+from .cluster import ClusterInfo
+from .cluster_enums import CountryClusters
+from .country_data import country_resources, country_demands
+from .resourcess import Resource
+
+
+class World:
+    """
+    One self-contained simulation world: its clusters, their countries and
+    every country's resources and demands.
+
+    Nothing is shared with other worlds or with the module-level
+    `CountryClusters` / `country_data` objects, so any number of worlds can be
+    simulated side by side in one process, and resetting a world just means
+    building a new one.
+
+    Example:
+        world = World.from_country_data()
+        russia = world.get_country("Russia")
+        run_simulation(world, russia, "PETROLEUM", 10.0, 0.5)
+    """
+
+    def __init__(self, clusters: List[ClusterInfo]):
+        self.clusters = clusters
+        self.countries: Dict[str, Country] = {}
+        for cluster_info in clusters:
+            for country in cluster_info.countries:
+                if country.name in self.countries:
+                    raise ValueError(f"Country '{country.name}' appears in more than one cluster")
+                self.countries[country.name] = country
+
+    @classmethod
+    def from_country_data(
+        cls,
+        clusters: Optional[Iterable] = None,
+        resources: Optional[Dict[str, Dict[str, Resource]]] = None,
+        demands: Optional[Dict[str, Dict[str, Resource]]] = None
+    ) -> "World":
+        """
+        Build a fresh world.
+
+        Args:
+            clusters: Cluster layout to copy names, PPPs and budgets from
+                (`ClusterInfo` objects or `CountryClusters` members; default: `CountryClusters`)
+            resources: Supply per country (default: `country_data.country_resources`)
+            demands: Demand per country (default: `country_data.country_demands`)
+        """
+        if clusters is None:
+            clusters = CountryClusters
+        if resources is None:
+            resources = country_resources
+        if demands is None:
+            demands = country_demands
+
+        world_clusters = []
+        for cluster in clusters:
+            template = getattr(cluster, "value", cluster)
+            countries = []
+            for template_country in template.countries:
+                country = Country(template_country.name, template_country.ppp)
+                country.resources = copy.deepcopy(resources.get(country.name, {}))
+                country.demand = copy.deepcopy(demands.get(country.name, {}))
+                countries.append(country)
+
+            world_clusters.append(ClusterInfo(
+                name=template.name,
+                countries=countries,
+                min_ppp=template.min_ppp,
+                max_ppp=template.max_ppp,
+                budget=template.budget
+            ))
+        return cls(world_clusters)
+
+    @classmethod
+    def from_file(cls, path: str, cache_dir: Optional[str] = "") -> "World":
+        """
+        Build a world from a JSON file or a CSV directory (see `world_loader.py`).
+        Parsed files are cached in `cache_dir` (default: `.world_cache` next to them).
+        """
+        from .world_loader import load_world
+        return load_world(path, cache_dir)
+
+    @classmethod
+    def from_clusters(cls, clusters: Iterable) -> "World":
+        """Build a world from deep copies of existing clusters, keeping their current state."""
+        return cls(copy.deepcopy([getattr(cluster, "value", cluster) for cluster in clusters]))
+
+    def copy(self) -> "World":
+        """Independent deep copy of this world in its current state."""
+        return World.from_clusters(self.clusters)
+
+    def fork(self) -> "WorldFork":
+        """Copy-on-write child world for what-if simulations (see `WorldFork`)."""
+        from .world_fork import WorldFork
+        return WorldFork(self)
+
+    def get_country(self, name: str) -> Country:
+        """Get a country by name. Raises KeyError if it is not in this world."""
+        return self.countries[name]
+
+    def get_cluster(self, country: Country) -> Optional[ClusterInfo]:
+        """The cluster `country` (or a country with its name) belongs to."""
+        for cluster_info in self.clusters:
+            if any(member.name == country.name for member in cluster_info.countries):
+                return cluster_info
+        return None
+
+    def all_countries(self) -> List[Country]:
+        """Every country, in cluster order."""
+        return list(self.countries.values())
+
+    @property
+    def total_country_count(self) -> int:
+        return len(self.countries)
+
+    def resource_names(self) -> List[str]:
+        """Every resource supplied or demanded by some country, sorted by name."""
+        names = set()
+        for country in self.countries.values():
+            names.update(country.resources.keys())
+            names.update(country.demand.keys())
+        return sorted(names)
+
+    def __iter__(self) -> Iterator[ClusterInfo]:
+        return iter(self.clusters)
+
+    def __repr__(self) -> str:
+        return f"World(clusters={len(self.clusters)}, countries={len(self.countries)})"
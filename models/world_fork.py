@@ -0,0 +1,248 @@
+import copy
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .country import Country
+from .resourcess import Resource
+from .world import World
+
+
+class ResourceOverlay:
+    """
+    A `Resource` look-alike layered over a parent resource.
+
+    Reads fall through to the parent until `amount` is first assigned; from
+    then on the fork holds its own value and the parent is left untouched,
+    so `country.get_resource(name).amount -= q` works unchanged on a fork.
+    """
+    __slots__ = ("base", "_amount")
+
+    def __init__(self, base: Resource):
+        self.base = base
+        self._amount: Optional[float] = None
+
+    @property
+    def amount(self) -> float:
+        return self.base.amount if self._amount is None else self._amount
+
+    @amount.setter
+    def amount(self, value: float) -> None:
+        self._amount = value
+
+    @property
+    def unit(self) -> str:
+        return self.base.unit
+
+    @property
+    def dirty(self) -> bool:
+        return self._amount is not None
+
+    def __repr__(self) -> str:
+        return f"{self.amount} {self.unit}"
+
+
+class ResourceOverlayMap:
+    """
+    Dict-like, copy-on-write layer over a parent's `Dict[str, Resource]`
+    (ChainMap style: local entries first, then the parent).
+    Resources added with `map[name] = Resource(...)` live only in the layer.
+    """
+
+    def __init__(self, base):
+        self._base = base
+        self._overlays: Dict[str, ResourceOverlay] = {}
+        self._added: Dict[str, Resource] = {}
+
+    def get(self, resource_name: str, default=None):
+        resource = self._added.get(resource_name)
+        if resource is not None:
+            return resource
+
+        overlay = self._overlays.get(resource_name)
+        if overlay is None:
+            base = self._base.get(resource_name)
+            if base is None:
+                return default
+            overlay = self._overlays[resource_name] = ResourceOverlay(base)
+        return overlay
+
+    def __getitem__(self, resource_name: str):
+        resource = self.get(resource_name)
+        if resource is None:
+            raise KeyError(resource_name)
+        return resource
+
+    def __setitem__(self, resource_name: str, resource: Resource) -> None:
+        self._overlays.pop(resource_name, None)
+        self._added[resource_name] = resource
+
+    def __contains__(self, resource_name: str) -> bool:
+        return resource_name in self._added or resource_name in self._base
+
+    def keys(self) -> List[str]:
+        return list(self._base.keys()) + [name for name in self._added if name not in self._base]
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def values(self):
+        return [self[name] for name in self.keys()]
+
+    def copy(self) -> Dict[str, Resource]:
+        return {name: Resource(resource.amount, resource.unit) for name, resource in self.items()}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def changed(self) -> List[str]:
+        """Names of the resources written in this layer."""
+        return [name for name, overlay in self._overlays.items() if overlay.dirty] + list(self._added)
+
+    def commit(self) -> List[str]:
+        """Write this layer's changes into the parent mapping and clear it. Returns the changed names."""
+        changed = self.changed()
+        for name, overlay in self._overlays.items():
+            if overlay.dirty:
+                overlay.base.amount = overlay.amount
+        for name, resource in self._added.items():
+            self._base[name] = Resource(resource.amount, resource.unit)
+        self.discard()
+        return changed
+
+    def discard(self) -> None:
+        self._overlays.clear()
+        self._added.clear()
+
+
+class CountryFork(Country):
+    """
+    Copy-on-write child of a `Country`.
+
+    Inherits every query helper from `Country`; `budget`, `resources` and
+    `demand` read through to the parent until written. `commit()` writes the
+    changes back into the parent, `discard()` drops them.
+    """
+
+    def __init__(self, parent: Country):
+        self.parent = parent
+        self._budget: Optional[float] = None
+        self._resources = ResourceOverlayMap(parent.resources)
+        self._demand = ResourceOverlayMap(parent.demand)
+
+    @property
+    def name(self) -> str:
+        return self.parent.name
+
+    @property
+    def ppp(self) -> int:
+        return self.parent.ppp
+
+    @property
+    def budget(self) -> float:
+        return self.parent.budget if self._budget is None else self._budget
+
+    @budget.setter
+    def budget(self, value: float) -> None:
+        self._budget = value
+
+    @property
+    def resources(self) -> ResourceOverlayMap:
+        return self._resources
+
+    @property
+    def demand(self) -> ResourceOverlayMap:
+        return self._demand
+
+    @property
+    def dirty(self) -> bool:
+        return self._budget is not None or bool(self._resources.changed()) or bool(self._demand.changed())
+
+    def commit(self) -> Tuple[List[str], List[str]]:
+        """Write changes into the parent. Returns the changed (resource names, demand names)."""
+        if self._budget is not None:
+            self.parent.budget = self._budget
+            self._budget = None
+        return self._resources.commit(), self._demand.commit()
+
+    def discard(self) -> None:
+        self._budget = None
+        self._resources.discard()
+        self._demand.discard()
+
+    def __eq__(self, other) -> bool:
+        return self is other
+
+    def __hash__(self) -> int:
+        return id(self)
+
+
+class WorldFork(World):
+    """
+    Cheap what-if child of a `World`, e.g. to quote a candidate auction or
+    try a bidding strategy without cloning the world.
+
+    Creating a fork only wraps every country in a `CountryFork`; nothing is
+    copied until it is written, and then only the touched values. A fork is
+    a `World` itself, so it can be passed to any simulation function (or
+    forked again). Afterwards either `commit()` its changes into the parent
+    or `discard()` them. The parent should not be changed while a fork of it
+    is in use.
+
+    Example:
+        with world.fork() as what_if:
+            sold = simulate_auction(what_if, what_if.get_country("Russia"), "PETROLEUM", 10.0, 0.5)
+        # leaving the block discards the fork; call what_if.commit() inside it to keep the result
+    """
+
+    def __init__(self, parent: World):
+        self.parent = parent
+        clusters = []
+        for cluster_info in parent.clusters:
+            fork_cluster = copy.copy(cluster_info)
+            fork_cluster.countries = [CountryFork(country) for country in cluster_info.countries]
+            fork_cluster.auction_batches = {}
+            fork_cluster._bidder_index = {}
+            clusters.append(fork_cluster)
+        super().__init__(clusters)
+
+    def dirty_countries(self) -> List[CountryFork]:
+        """Countries with uncommitted changes."""
+        return [country for country in self.countries.values() if country.dirty]
+
+    def commit(self) -> List[Tuple[Country, str]]:
+        """
+        Write every change into the parent world and start clean again.
+
+        Returns the (parent country, resource name) pairs whose supply or
+        demand changed, e.g. to update a `SurplusIndex` of the parent.
+        """
+        changed = []
+        for parent_cluster, fork_cluster in zip(self.parent.clusters, self.clusters):
+            for country in fork_cluster.countries:
+                if not country.dirty:
+                    continue
+                resource_names, demand_names = country.commit()
+                for resource_name in demand_names:
+                    parent_cluster.update_bidder(country.parent, resource_name)
+                for resource_name in dict.fromkeys(resource_names + demand_names):
+                    changed.append((country.parent, resource_name))
+            fork_cluster.invalidate_bidders()
+        return changed
+
+    def discard(self) -> None:
+        """Drop every uncommitted change."""
+        for fork_cluster in self.clusters:
+            for country in fork_cluster.countries:
+                country.discard()
+            fork_cluster.invalidate_bidders()
+
+    def __enter__(self) -> "WorldFork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.discard()
+
+    def __repr__(self) -> str:
+        return f"WorldFork(countries={len(self.countries)}, dirty={len(self.dirty_countries())})"
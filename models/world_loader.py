@@ -0,0 +1,422 @@
+"""
+Load worlds from data files instead of the Python literals in
+`cluster_enums.py` / `country_data.py` (which stay the default dataset).
+
+Two formats are read:
+
+JSON - one file:
+    {
+      "clusters": [
+        {"name": "Developing Nations", "budget": 20.0,
+         "countries": [{"name": "Pakistan", "ppp": 6287}, ...]},     # min_ppp / max_ppp optional
+        ...
+      ],
+      "units": {"PETROLEUM": "billion barrels", ...},                # optional
+      "resources": {"Russia": {"PETROLEUM": 200.0, ...}, ...},        # supply
+      "demands": {"Japan": {"PETROLEUM": {"amount": 3.4, "unit": "billion barrels"}}, ...}
+    }
+    An amount is a number (unit from "units") or {"amount", "unit"}.
+
+CSV - a directory holding:
+    clusters.csv   name,budget[,min_ppp,max_ppp]
+    countries.csv  name,ppp,cluster
+    resources.csv  country,resource,kind,amount,unit     (kind: supply or demand)
+
+Parsed files are cached as an npz file named after the hash of their
+contents, so a warm start only hashes the sources and loads a few arrays.
+
+Example:
+    world = World.from_file("data/world.json")
+"""
+import csv
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .cluster import ClusterInfo
+from .country import Country
+from .world import World
+from .world_state import WorldState
+
+
+# Bump when the parsed format changes, so old cache files are ignored
+LOADER_CACHE_VERSION = 1
+
+CSV_FILES = ("clusters.csv", "countries.csv", "resources.csv")
+SUPPLY = "supply"
+DEMAND = "demand"
+
+_STATE_ARRAYS = ["supply", "demand", "has_supply", "has_demand", "ppp"]
+
+
+@dataclass
+class WorldDefinition:
+    """
+    A parsed world: countries, resources and amounts in a `WorldState`, plus
+    the cluster layout (`country_cluster` holds each country's cluster index).
+    """
+    state: WorldState
+    cluster_names: List[str]
+    cluster_budgets: np.ndarray
+    cluster_min_ppp: np.ndarray
+    cluster_max_ppp: np.ndarray
+    country_cluster: np.ndarray
+
+    def build(self) -> World:
+        """A fresh `World`; budgets are assigned by the clusters as usual."""
+        state = self.state
+        members: List[List[Country]] = [[] for _ in self.cluster_names]
+        countries = []
+        for i, name in enumerate(state.country_names):
+            country = Country(name, int(state.ppp[i]))
+            # Drop what `Country` copies from the default dataset
+            country.resources = {}
+            country.demand = {}
+            members[self.country_cluster[i]].append(country)
+            countries.append(country)
+        state.write_back(countries)
+
+        return World([
+            ClusterInfo(
+                name=name,
+                countries=members[c],
+                min_ppp=int(self.cluster_min_ppp[c]),
+                max_ppp=int(self.cluster_max_ppp[c]),
+                budget=float(self.cluster_budgets[c])
+            )
+            for c, name in enumerate(self.cluster_names)
+        ])
+
+
+def _number(value, where: str) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}: expected a number, got {value!r}") from None
+    if not np.isfinite(number):
+        raise ValueError(f"{where}: expected a finite number, got {value!r}")
+    return number
+
+
+def _build_definition(clusters: List[Dict], entries: Iterable[Tuple[str, str, str, float, Optional[str], str]],
+                      units: Optional[Dict[str, str]] = None) -> WorldDefinition:
+    """
+    Args:
+        clusters: [{"name", "budget", "min_ppp", "max_ppp", "countries": [(name, ppp, where)]}];
+            min / max PPP may be None
+        entries: (country, resource, kind, amount, unit or None, where) per supply or demand
+        units: Default unit per resource
+    """
+    units = dict(units or {})
+    cluster_names = []
+    country_names = []
+    ppps = []
+    country_cluster = []
+    seen: Dict[str, str] = {}
+    for c, cluster in enumerate(clusters):
+        if cluster["name"] in cluster_names:
+            raise ValueError(f"Cluster '{cluster['name']}' is defined twice")
+        cluster_names.append(cluster["name"])
+        for name, ppp, where in cluster["countries"]:
+            if name in seen:
+                raise ValueError(f"{where}: country '{name}' is already defined ({seen[name]})")
+            seen[name] = where
+            country_names.append(name)
+            ppps.append(int(round(_number(ppp, where))))
+            country_cluster.append(c)
+
+    entries = list(entries)
+    resource_names = []
+    for country, resource_name, kind, amount, unit, where in entries:
+        if country not in seen:
+            raise ValueError(f"{where}: unknown country '{country}'")
+        if kind not in (SUPPLY, DEMAND):
+            raise ValueError(f"{where}: kind must be '{SUPPLY}' or '{DEMAND}', got {kind!r}")
+        if resource_name not in units:
+            if unit is None:
+                raise ValueError(f"{where}: no unit given for {resource_name}")
+            units[resource_name] = unit
+        elif unit is not None and unit != units[resource_name]:
+            raise ValueError(f"{where}: {resource_name} is in '{units[resource_name]}', not '{unit}'")
+        if resource_name not in resource_names:
+            resource_names.append(resource_name)
+
+    state = WorldState(country_names, resource_names, [units[name] for name in resource_names])
+    state.ppp[:] = ppps
+    for country, resource_name, kind, amount, unit, where in entries:
+        i, j = state.country_index[country], state.resource_index[resource_name]
+        if kind == SUPPLY:
+            state.supply[i, j], state.has_supply[i, j] = amount, True
+        else:
+            state.demand[i, j], state.has_demand[i, j] = amount, True
+
+    country_cluster = np.array(country_cluster, dtype=np.int64)
+    ppp = state.ppp
+    min_ppp, max_ppp = [], []
+    for c, cluster in enumerate(clusters):
+        member_ppp = ppp[country_cluster == c]
+        min_ppp.append(cluster.get("min_ppp") if cluster.get("min_ppp") is not None
+                       else (int(member_ppp.min()) if member_ppp.size else 0))
+        max_ppp.append(cluster.get("max_ppp") if cluster.get("max_ppp") is not None
+                       else (int(member_ppp.max()) if member_ppp.size else 0))
+
+    return WorldDefinition(
+        state=state,
+        cluster_names=cluster_names,
+        cluster_budgets=np.array([cluster["budget"] for cluster in clusters], dtype=np.float64),
+        cluster_min_ppp=np.array(min_ppp, dtype=np.int64),
+        cluster_max_ppp=np.array(max_ppp, dtype=np.int64),
+        country_cluster=country_cluster
+    )
+
+
+def parse_json(path: str) -> WorldDefinition:
+    """Parse a world from a JSON file (see the module docstring)."""
+    with open(path) as f:
+        data = json.load(f)
+
+    clusters = []
+    for c, cluster in enumerate(data.get("clusters", [])):
+        where = f"{path}: clusters[{c}]"
+        clusters.append({
+            "name": cluster["name"],
+            "budget": _number(cluster.get("budget", 0.0), where),
+            "min_ppp": cluster.get("min_ppp"),
+            "max_ppp": cluster.get("max_ppp"),
+            "countries": [(country["name"], country["ppp"], f"{where}.countries[{i}]")
+                          for i, country in enumerate(cluster.get("countries", []))],
+        })
+
+    entries = []
+    for section, kind in (("resources", SUPPLY), ("demands", DEMAND)):
+        for country, amounts in data.get(section, {}).items():
+            for resource_name, value in amounts.items():
+                where = f"{path}: {section}.{country}.{resource_name}"
+                if isinstance(value, dict):
+                    entries.append((country, resource_name, kind, _number(value.get("amount"), where),
+                                    value.get("unit"), where))
+                else:
+                    entries.append((country, resource_name, kind, _number(value, where), None, where))
+
+    return _build_definition(clusters, entries, data.get("units"))
+
+
+def parse_csv(directory: str) -> WorldDefinition:
+    """Parse a world from `clusters.csv`, `countries.csv` and `resources.csv` in `directory`."""
+    def rows(file_name: str):
+        path = os.path.join(directory, file_name)
+        with open(path, newline="") as f:
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                yield f"{path}:{line}", row
+
+    clusters = []
+    cluster_index: Dict[str, int] = {}
+    for where, row in rows("clusters.csv"):
+        cluster_index[row["name"]] = len(clusters)
+        clusters.append({
+            "name": row["name"],
+            "budget": _number(row["budget"], where),
+            "min_ppp": int(_number(row["min_ppp"], where)) if row.get("min_ppp") else None,
+            "max_ppp": int(_number(row["max_ppp"], where)) if row.get("max_ppp") else None,
+            "countries": [],
+        })
+
+    for where, row in rows("countries.csv"):
+        c = cluster_index.get(row["cluster"])
+        if c is None:
+            raise ValueError(f"{where}: unknown cluster '{row['cluster']}'")
+        clusters[c]["countries"].append((row["name"], row["ppp"], where))
+
+    entries = [
+        (row["country"], row["resource"], row["kind"].strip().lower(), _number(row["amount"], where),
+         row.get("unit") or None, where)
+        for where, row in rows("resources.csv")
+    ]
+    return _build_definition(clusters, entries)
+
+
+def _source_files(path: str) -> List[str]:
+    if os.path.isdir(path):
+        return [os.path.join(path, file_name) for file_name in CSV_FILES]
+    return [path]
+
+
+def source_hash(path: str) -> str:
+    """Hash of the contents of a world file (or CSV directory) and of the loader version."""
+    digest = hashlib.sha256(f"world-loader-{LOADER_CACHE_VERSION}".encode())
+    for file_path in _source_files(path):
+        digest.update(os.path.basename(file_path).encode())
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:24]
+
+
+def save_definition(path: str, definition: WorldDefinition) -> None:
+    """Atomically write a parsed world as an uncompressed npz file."""
+    state = definition.state
+    arrays = {name: getattr(state, name) for name in _STATE_ARRAYS}
+    arrays["country_names"] = np.array(state.country_names, dtype=str)
+    arrays["resource_names"] = np.array(state.resource_names, dtype=str)
+    arrays["units"] = np.array(state.units, dtype=str)
+    arrays["cluster_names"] = np.array(definition.cluster_names, dtype=str)
+    arrays["cluster_budgets"] = definition.cluster_budgets
+    arrays["cluster_min_ppp"] = definition.cluster_min_ppp
+    arrays["cluster_max_ppp"] = definition.cluster_max_ppp
+    arrays["country_cluster"] = definition.country_cluster
+    arrays["version"] = np.int64(LOADER_CACHE_VERSION)
+
+    # A private temp file per writer: processes may fill the same cache entry at once
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_definition(path: str) -> WorldDefinition:
+    """Read a parsed world written by `save_definition`."""
+    with np.load(path) as data:
+        version = int(data["version"])
+        if version != LOADER_CACHE_VERSION:
+            raise ValueError(f"Unsupported world cache version {version} in {path}")
+
+        state = WorldState(data["country_names"].tolist(), data["resource_names"].tolist(), data["units"].tolist())
+        for name in _STATE_ARRAYS:
+            setattr(state, name, data[name].copy())
+
+        return WorldDefinition(
+            state=state,
+            cluster_names=data["cluster_names"].tolist(),
+            cluster_budgets=data["cluster_budgets"].copy(),
+            cluster_min_ppp=data["cluster_min_ppp"].copy(),
+            cluster_max_ppp=data["cluster_max_ppp"].copy(),
+            country_cluster=data["country_cluster"].copy()
+        )
+
+
+def default_cache_dir(path: str) -> str:
+    """`.world_cache` next to the world file (or inside the CSV directory)."""
+    base = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+    return os.path.join(base, ".world_cache")
+
+
+def load_world_definition(path: str, cache_dir: Optional[str] = "") -> WorldDefinition:
+    """
+    Parse a JSON file or CSV directory, or load it from the cache.
+
+    Args:
+        path: A `.json` file or a directory with the CSV files.
+        cache_dir: Where parsed worlds are cached ("" = `default_cache_dir(path)`,
+            None = no caching).
+    """
+    parse = parse_csv if os.path.isdir(path) else parse_json
+    if cache_dir is None:
+        return parse(path)
+
+    cache_dir = cache_dir or default_cache_dir(path)
+    cache_path = os.path.join(cache_dir, f"world_{source_hash(path)}.npz")
+    if os.path.exists(cache_path):
+        try:
+            return load_definition(cache_path)
+        except Exception:
+            pass  # Truncated, corrupt or stale cache file (np.load can raise almost anything): parse again
+
+    definition = parse(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        save_definition(cache_path, definition)
+    except OSError:
+        pass  # Read-only location: work without the cache
+    return definition
+
+
+def load_world(path: str, cache_dir: Optional[str] = "") -> World:
+    """Build a fresh `World` from a JSON file or CSV directory (see `load_world_definition`)."""
+    return load_world_definition(path, cache_dir).build()
+
+
+def export_json(path: str, world: Optional[World] = None) -> None:
+    """Write `world` (default: the stock dataset) in the JSON format."""
+    world = world or World.from_country_data()
+    units: Dict[str, str] = {}
+    sections: Dict[str, Dict[str, Dict[str, float]]] = {"resources": {}, "demands": {}}
+    for country in world.all_countries():
+        for section, amounts in (("resources", country.resources), ("demands", country.demand)):
+            if amounts:
+                sections[section][country.name] = {}
+            for resource_name, resource in amounts.items():
+                units.setdefault(resource_name, resource.unit)
+                sections[section][country.name][resource_name] = resource.amount
+
+    data = {
+        "clusters": [
+            {
+                "name": cluster_info.name,
+                "budget": cluster_info.budget,
+                "min_ppp": cluster_info.min_ppp,
+                "max_ppp": cluster_info.max_ppp,
+                "countries": [{"name": country.name, "ppp": country.ppp} for country in cluster_info.countries],
+            }
+            for cluster_info in world.clusters
+        ],
+        "units": units,
+        **sections,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def export_csv(directory: str, world: Optional[World] = None) -> None:
+    """Write `world` (default: the stock dataset) as the three CSV files."""
+    world = world or World.from_country_data()
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "clusters.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "budget", "min_ppp", "max_ppp"])
+        for cluster_info in world.clusters:
+            writer.writerow([cluster_info.name, cluster_info.budget, cluster_info.min_ppp, cluster_info.max_ppp])
+
+    with open(os.path.join(directory, "countries.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "ppp", "cluster"])
+        for cluster_info in world.clusters:
+            for country in cluster_info.countries:
+                writer.writerow([country.name, country.ppp, cluster_info.name])
+
+    with open(os.path.join(directory, "resources.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["country", "resource", "kind", "amount", "unit"])
+        for country in world.all_countries():
+            for kind, amounts in ((SUPPLY, country.resources), (DEMAND, country.demand)):
+                for resource_name, resource in amounts.items():
+                    writer.writerow([country.name, resource_name, kind, repr(resource.amount), resource.unit])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export the stock world as data files, or check a world file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Write the stock dataset as JSON (or CSV with --csv)")
+    export.add_argument("path")
+    export.add_argument("--csv", action="store_true", help="Write a CSV directory instead of a JSON file")
+    check = commands.add_parser("check", help="Load a world file and print a summary")
+    check.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        (export_csv if args.csv else export_json)(args.path)
+        print(f"Wrote {args.path}")
+    else:
+        world = load_world(args.path)
+        print(f"{world.total_country_count} countries in {len(world.clusters)} clusters, "
+              f"{len(world.resource_names())} resources")
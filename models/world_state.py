@@ -0,0 +1,294 @@
+import copy
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .cluster import ClusterInfo
+from .country import Country
+from .resourcess import Resource
+
+
+class ResourceView:
+    """
+    A `Resource` look-alike backed by one cell of a `WorldState` array.
+    Reading or writing `amount` goes straight to the dense array, so
+    `country.get_resource(name).amount -= q` keeps working unchanged.
+    The array is looked up on every access, as `add_resource` replaces it.
+    """
+    __slots__ = ("_state", "_kind", "_row", "_col", "unit")
+
+    def __init__(self, state: "WorldState", kind: str, row: int, col: int, unit: str):
+        self._state = state
+        self._kind = kind
+        self._row = row
+        self._col = col
+        self.unit = unit
+
+    @property
+    def amount(self) -> float:
+        return float(getattr(self._state, self._kind)[self._row, self._col])
+
+    @amount.setter
+    def amount(self, value: float) -> None:
+        getattr(self._state, self._kind)[self._row, self._col] = value
+
+    def __repr__(self) -> str:
+        return f"{self.amount} {self.unit}"
+
+
+class ResourceMapView:
+    """
+    Dict-like view over one country's row of the supply or demand matrix.
+    Only cells flagged in the matching presence mask are visible as keys,
+    mirroring the key set of the original `Dict[str, Resource]`.
+    """
+
+    def __init__(self, state: "WorldState", kind: str, row: int):
+        self._state = state
+        self._kind = kind
+        self._row = row
+
+    @property
+    def _values(self) -> np.ndarray:
+        return getattr(self._state, self._kind)
+
+    @property
+    def _present(self) -> np.ndarray:
+        return getattr(self._state, "has_" + self._kind)
+
+    def get(self, resource_name: str, default=None) -> Optional[ResourceView]:
+        col = self._state.resource_index.get(resource_name)
+        if col is None or not self._present[self._row, col]:
+            return default
+        return ResourceView(self._state, self._kind, self._row, col, self._state.units[col])
+
+    def __getitem__(self, resource_name: str) -> ResourceView:
+        view = self.get(resource_name)
+        if view is None:
+            raise KeyError(resource_name)
+        return view
+
+    def __setitem__(self, resource_name: str, resource: Resource) -> None:
+        col = self._state.add_resource(resource_name, resource.unit)
+        self._values[self._row, col] = resource.amount
+        self._present[self._row, col] = True
+
+    def __contains__(self, resource_name: str) -> bool:
+        return self.get(resource_name) is not None
+
+    def keys(self) -> List[str]:
+        names = self._state.resource_names
+        return [names[col] for col in np.flatnonzero(self._present[self._row])]
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def values(self):
+        return [self[name] for name in self.keys()]
+
+    def copy(self) -> Dict[str, Resource]:
+        return {name: Resource(view.amount, view.unit) for name, view in self.items()}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return int(self._present[self._row].sum())
+
+
+class CountryView(Country):
+    """
+    Thin `Country` facade over a row of a `WorldState`.
+
+    Inherits every query helper from `Country` (`get_resource`, `get_demand`,
+    `get_supply_demand_gap`, `get_export_resources`, ...); only the storage
+    of `budget`, `resources` and `demand` is redirected to the arrays.
+    """
+
+    def __init__(self, state: "WorldState", row: int):
+        self._state = state
+        self._row = row
+
+    @property
+    def name(self) -> str:
+        return self._state.country_names[self._row]
+
+    @property
+    def ppp(self) -> int:
+        return int(self._state.ppp[self._row])
+
+    @property
+    def budget(self) -> float:
+        return float(self._state.budget[self._row])
+
+    @budget.setter
+    def budget(self, value: float) -> None:
+        self._state.budget[self._row] = value
+
+    @property
+    def resources(self) -> ResourceMapView:
+        return ResourceMapView(self._state, "supply", self._row)
+
+    @property
+    def demand(self) -> ResourceMapView:
+        return ResourceMapView(self._state, "demand", self._row)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CountryView):
+            return self._state is other._state and self._row == other._row
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._state), self._row))
+
+
+class WorldState:
+    """
+    Struct-of-arrays storage for a whole world.
+
+    Countries x resources are stored as dense float64 `supply` and `demand`
+    matrices (with boolean `has_supply` / `has_demand` masks recording which
+    entries exist), next to per-country `budget` and `ppp` vectors.
+    `country_index` / `resource_index` map names to rows / columns.
+
+    Whole-world analyses are plain array operations on these matrices;
+    `view()` hands out `CountryView` objects for code written against `Country`.
+    """
+
+    def __init__(self, country_names: List[str], resource_names: List[str], units: Optional[List[str]] = None):
+        self.country_names = list(country_names)
+        self.resource_names = list(resource_names)
+        self.units = list(units) if units is not None else ["unknown"] * len(self.resource_names)
+        self.country_index = {name: i for i, name in enumerate(self.country_names)}
+        self.resource_index = {name: j for j, name in enumerate(self.resource_names)}
+
+        shape = (len(self.country_names), len(self.resource_names))
+        self.supply = np.zeros(shape, dtype=np.float64)
+        self.demand = np.zeros(shape, dtype=np.float64)
+        self.has_supply = np.zeros(shape, dtype=bool)
+        self.has_demand = np.zeros(shape, dtype=bool)
+        self.budget = np.zeros(len(self.country_names), dtype=np.float64)
+        self.ppp = np.zeros(len(self.country_names), dtype=np.int64)
+
+    @classmethod
+    def from_countries(cls, countries: Iterable[Country]) -> "WorldState":
+        """Build a state holding a copy of the given countries' budgets, supplies and demands."""
+        countries = list(countries)
+        resource_names: List[str] = []
+        units: Dict[str, str] = {}
+        for country in countries:
+            for resource_name, resource in list(country.resources.items()) + list(country.demand.items()):
+                if resource_name not in units:
+                    resource_names.append(resource_name)
+                    units[resource_name] = resource.unit
+
+        state = cls([c.name for c in countries], resource_names, [units[r] for r in resource_names])
+        for i, country in enumerate(countries):
+            state.budget[i] = country.budget
+            state.ppp[i] = country.ppp
+            for resource_name, resource in country.resources.items():
+                j = state.resource_index[resource_name]
+                state.supply[i, j] = resource.amount
+                state.has_supply[i, j] = True
+            for resource_name, resource in country.demand.items():
+                j = state.resource_index[resource_name]
+                state.demand[i, j] = resource.amount
+                state.has_demand[i, j] = True
+        return state
+
+    @classmethod
+    def from_clusters(cls, clusters) -> "WorldState":
+        """Build a state from an iterable of `ClusterInfo` objects or `CountryClusters` members."""
+        countries = []
+        for cluster in clusters:
+            cluster_info = getattr(cluster, "value", cluster)
+            countries.extend(cluster_info.countries)
+        return cls.from_countries(countries)
+
+    def add_resource(self, resource_name: str, unit: str) -> int:
+        """Return the column for `resource_name`, growing the matrices if it is new."""
+        col = self.resource_index.get(resource_name)
+        if col is not None:
+            return col
+
+        col = len(self.resource_names)
+        self.resource_names.append(resource_name)
+        self.units.append(unit)
+        self.resource_index[resource_name] = col
+
+        pad = ((0, 0), (0, 1))
+        self.supply = np.pad(self.supply, pad)
+        self.demand = np.pad(self.demand, pad)
+        self.has_supply = np.pad(self.has_supply, pad)
+        self.has_demand = np.pad(self.has_demand, pad)
+        return col
+
+    def view(self, country_name: str) -> CountryView:
+        """Get a `Country`-compatible view of one country."""
+        return CountryView(self, self.country_index[country_name])
+
+    def views(self) -> List[CountryView]:
+        """Get views of every country, in row order."""
+        return [CountryView(self, i) for i in range(len(self.country_names))]
+
+    def cluster_views(self, clusters) -> List[ClusterInfo]:
+        """
+        Return copies of the given clusters whose `countries` are views into
+        this state, so the simulation loops can run on the array backend.
+        Budgets are not reassigned; they come from the state.
+        """
+        views = []
+        for cluster in clusters:
+            cluster_info = copy.copy(getattr(cluster, "value", cluster))
+            cluster_info.countries = [self.view(c.name) for c in cluster_info.countries]
+            cluster_info.auction_batches = {}
+            cluster_info._bidder_index = {}
+            views.append(cluster_info)
+        return views
+
+    def write_back(self, countries: Iterable[Country]) -> None:
+        """Copy budgets, supplies and demands from the arrays back into plain `Country` objects."""
+        for country in countries:
+            i = self.country_index[country.name]
+            country.budget = float(self.budget[i])
+            for j in np.flatnonzero(self.has_supply[i]):
+                country.resources[self.resource_names[j]] = Resource(float(self.supply[i, j]), self.units[j])
+            for j in np.flatnonzero(self.has_demand[i]):
+                country.demand[self.resource_names[j]] = Resource(float(self.demand[i, j]), self.units[j])
+
+    def supply_demand_gap(self) -> np.ndarray:
+        """Countries x resources matrix of supply - demand (missing entries count as 0)."""
+        return self.supply - self.demand
+
+    def surplus_mask(self) -> np.ndarray:
+        """Boolean matrix of entries `Country.get_export_resources` would report."""
+        return self.supply_demand_gap() > 0
+
+    def deficit_mask(self) -> np.ndarray:
+        """Boolean matrix of entries `Country.get_import_needs` would report."""
+        return self.supply_demand_gap() < 0
+
+    def exporters(self, resource_name: str) -> List[str]:
+        """Names of countries with a surplus of `resource_name`."""
+        j = self.resource_index.get(resource_name)
+        if j is None:
+            return []
+        return [self.country_names[i] for i in np.flatnonzero(self.supply[:, j] - self.demand[:, j] > 0)]
+
+    def importers(self, resource_name: str) -> List[str]:
+        """Names of countries with a deficit of `resource_name`."""
+        j = self.resource_index.get(resource_name)
+        if j is None:
+            return []
+        return [self.country_names[i] for i in np.flatnonzero(self.supply[:, j] - self.demand[:, j] < 0)]
+
+    def total_supply(self) -> Dict[str, float]:
+        """World supply per resource."""
+        return dict(zip(self.resource_names, self.supply.sum(axis=0).tolist()))
+
+    def total_demand(self) -> Dict[str, float]:
+        """World demand per resource."""
+        return dict(zip(self.resource_names, self.demand.sum(axis=0).tolist()))
+
+    def __repr__(self) -> str:
+        return f"WorldState(countries={len(self.country_names)}, resources={len(self.resource_names)})"